@@ -0,0 +1 @@
+"""Suite de performances de pycfd (python -m benchmarks)."""
@@ -0,0 +1,64 @@
+"""
+Suite de performances en ligne de commande.
+
+    python -m benchmarks --sizes 64 128 --output results.json
+    python -m benchmarks --sizes 64 128 --baseline benchmarks/baseline.json
+
+Sans option, tous les cas sont mesurés (voir suite.py). Avec --baseline,
+le code de retour est 1 si un cas est plus lent que la référence de plus de
+--threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any
+from benchmarks.suite import DEFAULT_THRESHOLD, PROBLEMS, RECONSTRUCTIONS, SIZES, TIME_STEPPINGS, cases, compare
+from benchmarks.suite import run_suite
+
+
+def print_result(r: dict[str, Any]) -> None:
+    print(f"{r['name']:<42} {r['first_step']:>10.4f} {r['time_per_step']:>10.4f} {r['mcups']:>10.3f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="pycfd performance suite")
+    parser.add_argument("--problems", nargs="+", default=list(PROBLEMS), choices=list(PROBLEMS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="N for N x N grids")
+    parser.add_argument("--reconstructions", nargs="+", default=list(RECONSTRUCTIONS))
+    parser.add_argument("--time-steppings", nargs="+", default=list(TIME_STEPPINGS))
+    parser.add_argument("--steps", type=int, default=10, help="timed steps after the first one")
+    parser.add_argument("--backend", default="numpy", help="compute backend (see src/backends.py)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="relative slowdown to flag")
+    args = parser.parse_args(argv)
+
+    suite = cases(args.problems, args.sizes, args.reconstructions, args.time_steppings)
+    print(f"{len(suite)} cases, {args.steps} timed steps each, backend {args.backend}")
+    print(f"{'case':<42} {'1st step':>10} {'s/step':>10} {'Mcell/s':>10}")
+    results = run_suite(suite, args.steps, progress=print_result, backend=args.backend)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\nComparison with {args.baseline} (commit {baseline['machine'].get('commit')}):")
+    if baseline["machine"].get("platform") != results["machine"]["platform"]:
+        print(" - Warning: the baseline was measured on another platform")
+    comparison = compare(results, baseline, args.threshold)
+    for c in comparison:
+        flag = "REGRESSION" if c["regression"] else ""
+        print(f"{c['name']:<42} {c['baseline']:>10.4f} {c['time_per_step']:>10.4f} {c['ratio']:>8.2f}x {flag}")
+    regressions = [c for c in comparison if c["regression"]]
+    print(f"{len(comparison)} cases compared, {len(regressions)} regressions (threshold {100 * args.threshold:.0f} %)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Cas de la suite de performances et comparaison à une référence.
+
+Chaque cas est un problème de src/problems.py sur une grille N x N, avec un
+solveur de Riemann, une reconstruction et un schéma en temps. On mesure le
+premier pas de temps (qui comprend les premiers accès aux tampons du
+Workspace), puis le temps médian des nsteps pas suivants, avec un pas de temps
+fixé par compute_dt sur l'état initial, comme strong_scaling dans
+parallel.py.
+
+Le solveur de Riemann est lié au problème : hll ne traite que
+l'hydrodynamique (Sod) et fivewaves que la MHD (Orszag-Tang).
+"""
+
+import os
+import platform
+import subprocess
+import time
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+import numpy as np
+from src.boundaries import fillBoundaries
+from src.params import Params
+from src.problems import init_problem
+from src.pycfd_types import Array, real_t
+from src.states import primToCons
+from src.timestep import compute_dt
+from src.update import cons_to_prim, update
+from src.workspace import Workspace
+
+# Paramètres de chaque problème, hors grille et schéma numérique
+PROBLEMS: dict[str, Params] = {
+    "orszag-tang": Params(problem_name="orszag-tang", riemann_solver="fivewaves"),
+    "sod_x": Params(
+        problem_name="sod_x",
+        MHD=False,
+        gamma=1.4,
+        riemann_solver="hll",
+        boundary_xmin="BC_ABSORBING",
+        boundary_xmax="BC_ABSORBING",
+    ),
+}
+SIZES: tuple[int, ...] = (64, 128, 256, 512, 1024)
+RECONSTRUCTIONS: tuple[str, ...] = ("PCM", "PLM")
+TIME_STEPPINGS: tuple[str, ...] = ("euler", "RK2", "RK3")
+# Écart relatif du temps par pas au-delà duquel un cas est une régression
+DEFAULT_THRESHOLD: float = 0.10
+
+
+@dataclass(frozen=True)
+class Case:
+    """Un cas de la suite : problème, taille de grille et schéma numérique."""
+
+    problem: str
+    size: int
+    reconstruction: str
+    time_stepping: str
+
+    @property
+    def name(self) -> str:
+        """Identifiant du cas, clé de la comparaison à la référence."""
+        riemann_solver = PROBLEMS[self.problem].riemann_solver
+        return f"{self.problem}/{self.size}x{self.size}/{riemann_solver}/{self.reconstruction}/{self.time_stepping}"
+
+    def params(self, **changes: Any) -> Params:
+        """Paramètres du cas ; changes remplace d'autres paramètres (backend, nthreads...)."""
+        return replace(
+            PROBLEMS[self.problem],
+            Nx=self.size,
+            Ny=self.size,
+            reconstruction=self.reconstruction,
+            time_stepping=self.time_stepping,
+            **changes,
+        )
+
+
+def cases(
+    problems: Iterable[str] = tuple(PROBLEMS),
+    sizes: Iterable[int] = SIZES,
+    reconstructions: Iterable[str] = RECONSTRUCTIONS,
+    time_steppings: Iterable[str] = TIME_STEPPINGS,
+) -> list[Case]:
+    """Produit cartésien des problèmes, tailles, reconstructions et schémas en temps."""
+    for problem in problems:
+        if problem not in PROBLEMS:
+            raise ValueError(f"Unknown benchmark problem: {problem} (available: {', '.join(PROBLEMS)})")
+    return [Case(*c) for c in product(problems, sizes, reconstructions, time_steppings)]
+
+
+def initial_state(params: Params) -> tuple[Array, Array]:
+    """Variables primitives et conservatives initiales du problème de params."""
+    Q = np.zeros((params.Ntx, params.Nty, params.Nfields), dtype=real_t)
+    U = np.zeros_like(Q)
+    init_problem(Q, params)
+    fillBoundaries(Q, params)
+    primToCons(Q, U, params)
+    return Q, U
+
+
+def run_case(case: Case, nsteps: int, **changes: Any) -> dict[str, Any]:
+    """
+    Mesure un cas.
+
+    Parameters:
+    case (Case): Le cas à mesurer.
+    nsteps (int): Nombre de pas de temps mesurés après le premier.
+    changes: Autres paramètres de la simulation (voir Case.params).
+
+    Returns:
+    dict: Le cas, le temps du premier pas, les temps médian (time_per_step) et
+        moyen par pas, et le débit en millions de mises à jour de cellules par
+        seconde (Mcell/s) au temps médian.
+    """
+    params = case.params(**changes)
+    Q, U = _initial_states(params)
+    Q, U = Q.copy(), U.copy()
+    dt = compute_dt(Q, 0.0, False, params)
+    times = np.empty(nsteps)
+    # Le Workspace arrête ses threads (params.nthreads) en fin de mesure
+    with Workspace(params) as ws:
+
+        def step() -> None:
+            update(Q, U, dt, params, ws)
+            cons_to_prim(U, Q, params, ws)
+
+        t0 = time.perf_counter()
+        step()
+        first_step = time.perf_counter() - t0
+        for k in range(nsteps):
+            t0 = time.perf_counter()
+            step()
+            times[k] = time.perf_counter() - t0
+    # La médiane est peu sensible aux pas perturbés par le reste de la machine
+    time_per_step = float(np.median(times))
+    return {
+        "name": case.name,
+        **asdict(case),
+        "riemann_solver": params.riemann_solver,
+        "nsteps": nsteps,
+        "first_step": first_step,
+        "time_per_step": time_per_step,
+        "mean_step": float(times.mean()),
+        "mcups": params.Nx * params.Ny / time_per_step / 1e6,
+    }
+
+
+# États initiaux, calculés une fois par problème et par grille (init_problem est une boucle Python)
+_states: dict[tuple[str, int, int], tuple[Array, Array]] = {}
+
+
+def _initial_states(params: Params) -> tuple[Array, Array]:
+    key = (params.problem_name, params.Nx, params.Ny)
+    if key not in _states:
+        _states.clear()
+        _states[key] = initial_state(params)
+    return _states[key]
+
+
+def run_suite(
+    suite: list[Case],
+    nsteps: int,
+    progress: Optional[Callable[[dict[str, Any]], None]] = None,
+    **changes: Any,
+) -> dict[str, Any]:
+    """
+    Mesure tous les cas de suite.
+
+    Parameters:
+    suite (list[Case]): Les cas à mesurer (voir cases).
+    nsteps (int): Nombre de pas de temps mesurés après le premier.
+    progress (Optional[Callable]): Appelé avec le résultat de chaque cas.
+    changes: Autres paramètres de la simulation, communs à tous les cas.
+
+    Returns:
+    dict: Informations sur la machine, configuration et résultats, prêts à écrire en JSON.
+    """
+    results = []
+    for case in suite:
+        result = run_case(case, nsteps, **changes)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {"machine": machine_info(), "config": {"nsteps": nsteps, **changes}, "results": results}
+
+
+def machine_info() -> dict[str, Any]:
+    """Machine, versions et commit mesurés, pour interpréter une comparaison."""
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "commit": _git_commit(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """
+    Compare le temps par pas des cas mesurés à ceux de la référence.
+
+    Parameters:
+    results (dict): Résultats de run_suite.
+    baseline (dict): Résultats de référence, au même format.
+    threshold (float): Ralentissement relatif au-delà duquel un cas est une régression.
+
+    Returns:
+    list[dict]: Pour chaque cas présent dans les deux : son nom, les deux temps
+        par pas, leur rapport et s'il s'agit d'une régression.
+    """
+    reference = {r["name"]: r for r in baseline["results"]}
+    comparison = []
+    for r in results["results"]:
+        if r["name"] not in reference:
+            continue
+        ratio = r["time_per_step"] / reference[r["name"]]["time_per_step"]
+        comparison.append(
+            {
+                "name": r["name"],
+                "baseline": reference[r["name"]]["time_per_step"],
+                "time_per_step": r["time_per_step"],
+                "ratio": ratio,
+                "regression": ratio > 1.0 + threshold,
+            }
+        )
+    return comparison
@@ -1,11 +1,16 @@
+import sys
+from typing import Optional
 import numpy as np
-from src import params
+from src.params import Params, readInifile
 from src.pycfd_types import Array, real_t
 from src.problems import init_problem
-from src.states import primToCons, consToPrim
+from src.states import primToCons
 from src.timestep import compute_dt
-from src.update import update
-from src.iomanager import IOManager
+from src.update import cons_to_prim, update
+from src.workspace import Workspace
+from src.streams import OutputStreams
+from src.parallel import ParallelSolver
+from src.diagnostics import Diagnostics
 from src.boundaries import fillBoundaries
 
 
@@ -21,64 +26,113 @@ def main() -> int:
     print("█   █████████████   ███████         ███   █   █")
     print("███████████████████████████████████████████████")
 
-    # Reading parameters from .ini file
-    # auto params = readInifile(argv[1]);
-    # auto device_params = params.device_params;
+    # Reading parameters from .ini/.toml file (default parameters otherwise)
+    params: Params = readInifile(sys.argv[1]) if len(sys.argv) > 1 else Params()
 
     U: Array = np.zeros((params.Ntx, params.Nty, params.Nfields), dtype=real_t)
     Q: Array = np.zeros((params.Ntx, params.Nty, params.Nfields), dtype=real_t)
+    # Tableaux temporaires du solveur, réutilisés à chaque itération
+    ws = Workspace(params)
+    print(f" - Workspace: {ws.nbytes / 2**20:.1f} MiB")
+    if ws.tiles is not None:
+        print(f" - Tiled update: {len(ws.tiles.tiles)} tiles on {params.nthreads} threads")
+    # Décomposition en tuiles sur params.nprocs processus
+    solver: Optional[ParallelSolver] = None
+    if params.nprocs > 1:
+        solver = ParallelSolver(params)
+        print(f" - Parallel run: {solver.px} x {solver.py} tiles")
 
     # // Misc vars for iteration
     t: real_t = 0.0
-    ite: int = 0
-    next_save: real_t = 0.0
-    io_manager = IOManager(outname="run", dirname="data")
+    step: int = 0
+    # Pas de temps estimé par le solveur de Riemann (params.dt_from_riemann)
+    dt_next: Optional[real_t] = None
+    # Flux de sortie, chacun à sa propre cadence (params.output_streams)
+    outputs = OutputStreams(params, dirname="data", outname="run")
     # // Initializing primitive variables
     # InitFunctor init(params);
     # UpdateFunctor update(params);
     # ComputeDtFunctor computeDt(params);
     # IOManager ioManager(params);
 
-    # if (params.restart_file != "") {
-    #   auto restart_info = ioManager.loadSnapshot(Q);
-    #   t = restart_info.time;
-    #   ite = restart_info.iteration;
-    #   std::cout << "Restart at iteration " << ite << " and time " << t << std::endl;
-    #   next_save = t + params.save_freq;
-    #   ite++;
-    # }
-    # else
-
-    init_problem(Q, params.problem_name)
-
-    fillBoundaries(Q)
-    primToCons(Q, U)
+    if params.restart_file != "":
+        # Q et U sont relus tels quels : la suite du calcul est identique au bit près
+        restart_info = outputs.checkpoints.load_checkpoint(params.restart_file, Q, U)
+        t = restart_info.time
+        step = restart_info.step
+        dt_next = restart_info.dt_next
+        outputs.restore(restart_info)
+        print(f"Restart at step {step} and time {t}")
+    else:
+        init_problem(Q, params)
+
+        fillBoundaries(Q, params)
+        primToCons(Q, U, params)
+    if solver is not None:
+        solver.load(Q, U)
+
+    # Diagnostics scalaires, à leur propre cadence (params.diagnostics_frequency)
+    diagnostics = Diagnostics(params, dirname="data", start_step=step)
+    if diagnostics.due(step):
+        diagnostics.write(Q, U, t, step)
+
+    # Chronomètres par phase (params.timers), sur les itérations de ce calcul
+    timers = ws.timers
+    timers.reset()
+    start_step: int = step
+    cells: int = params.Nx * params.Ny
 
     dt: real_t = 0.0
     next_log: int = 0
     while t + params.epsilon < params.tend:
-        save_needed: bool = t + params.epsilon > next_save
-        dt = compute_dt(Q, t, next_log == 0)
+        if next_log == 0 and params.timers and step > start_step:
+            print(f" - {timers.interval(step - start_step, cells).rates()}")
+        with timers("dt"):
+            if solver is not None:
+                dt = solver.compute_dt(t, next_log == 0)
+            elif dt_next is None:
+                dt = compute_dt(Q, t, next_log == 0, params)
+            else:
+                dt = dt_next
+                if next_log == 0:
+                    print(f"Using Riemann dt at ({t=:.2f}): dt_hyp={dt}")
         if next_log == 0:
             next_log = params.log_frequency
         else:
             next_log -= 1
 
-        if save_needed:
-            print(f" - Saving at time {t:.3f}")
-            ite += 1
-            io_manager.save_solution(Q, ite, t)
-            next_save += params.save_freq
+        with timers("io"):
+            for name in outputs.save_due(Q, t):
+                print(f" - Saving {name or 'solution'} at time {t:.3f}")
 
-        update(Q, U, dt)
-        consToPrim(U, Q)
+        if solver is not None:
+            with timers("parallel update"):
+                solver.update(Q, U, dt)
+        else:
+            dt_next = update(Q, U, dt, params, ws)
+            cons_to_prim(U, Q, params, ws)
         # checkNegatives(Q, params)
 
         t += dt
+        step += 1
+        if diagnostics.due(step):
+            with timers("diagnostics"):
+                diagnostics.write(Q, U, t, step)
+        if params.checkpoint_frequency > 0 and step % params.checkpoint_frequency == 0:
+            with timers("io"):
+                outputs.save_checkpoint(Q, U, t, step, dt_next)
 
     print(f"Time at end is {t:.3f}")
-    ite += 1
-    io_manager.save_solution(Q, ite, t)
+    with timers("io"):
+        outputs.save_all(Q, t)
+        # Attend la fin des écritures asynchrones (params.async_output)
+        outputs.close()
+    if solver is not None:
+        solver.close()
+    ws.close()
+    diagnostics.close()
+    if params.timers:
+        print(timers.report(step - start_step, cells))
 
     print("    █     ▀██  ▀██         ▀██                              ▄█▄ ")
     print("   ███     ██   ██       ▄▄ ██    ▄▄▄   ▄▄ ▄▄▄     ▄▄▄▄     ███ ")
@@ -0,0 +1,200 @@
+"""
+Noyaux de calcul interchangeables, choisis par params.backend.
+
+Un backend fournit les noyaux appelés à chaque pas de temps : conversions
+primitives <-> conservatives sur le domaine, pas de temps CFL, solveur de
+Riemann sur un tableau d'interfaces et remplissage des cellules fantômes.
+
+- "python" : les fonctions par cellule portées du code Kokkos d'origine
+  (cell_primToCons, riemann, cell_timestep, fillPeriodic...), appelées
+  cellule par cellule. Très lent : c'est la référence.
+- "numpy" : les versions tableau (array_*), par défaut.
+- "numba" : les mêmes fonctions par cellule, compilées par numba.njit avec
+  prange sur les cellules du domaine (numba_kernels.py). Numba est une
+  dépendance optionnelle.
+
+Les reconstructions et la mise à jour de U (update.py) restent des
+opérations NumPy pour tous les backends.
+"""
+
+from abc import ABC, abstractmethod
+from functools import cache
+from typing import Optional
+import numpy as np
+from src.boundaries import fillAbsorbing, fillBoundaries, fillPeriodic, fillReflecting
+from src.params import Params
+from src.pycfd_types import Array, IDir, real_t
+from src.riemann import array_riemann, riemann
+from src.states import State, cell_consToPrim, cell_primToCons, consToPrim, primToCons
+from src.states import get_state_from_array, set_state_into_array
+from src.timestep import array_timestep, cell_timestep
+
+
+class Backend(ABC):
+    """Noyaux de calcul d'un backend ; les tableaux Q et U sont de forme (Ntx, Nty, Nfields)."""
+
+    name: str = ""
+
+    @abstractmethod
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None:
+        """U <- variables conservatives de Q, sur le domaine."""
+
+    @abstractmethod
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None:
+        """Q <- variables primitives de U, sur le domaine."""
+
+    @abstractmethod
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t:
+        """Maximum sur le domaine de l'inverse du pas de temps CFL des cellules."""
+
+    @abstractmethod
+    def riemann(
+        self, qL: Array, qR: Array, params: Params, out: Array, smax: Optional[Array] = None
+    ) -> Array:
+        """Flux aux interfaces (..., Nfields), dans out ; vitesse maximale des ondes dans smax s'il est fourni."""
+
+    @abstractmethod
+    def fill_boundaries(self, Q: Array, params: Params) -> None:
+        """Remplit les cellules fantômes de Q (voir boundaries.fillBoundaries)."""
+
+
+class NumpyBackend(Backend):
+    name = "numpy"
+
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None:
+        primToCons(Q, U, params)
+
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None:
+        consToPrim(U, Q, params)
+
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t:
+        return float(np.max(array_timestep(Q[params.slice_dom], params)))
+
+    def riemann(
+        self, qL: Array, qR: Array, params: Params, out: Array, smax: Optional[Array] = None
+    ) -> Array:
+        return array_riemann(qL, qR, params, out, smax)
+
+    def fill_boundaries(self, Q: Array, params: Params) -> None:
+        fillBoundaries(Q, params)
+
+
+class PythonBackend(Backend):
+    """Fonctions par cellule du code d'origine : la référence, à n'utiliser que sur de petites grilles."""
+
+    name = "python"
+
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None:
+        for i, j in params.range_dom:
+            set_state_into_array(U, i, j, cell_primToCons(get_state_from_array(Q, i, j), params))
+
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None:
+        for i, j in params.range_dom:
+            set_state_into_array(Q, i, j, cell_consToPrim(get_state_from_array(U, i, j), params))
+
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t:
+        return float(max(cell_timestep(get_state_from_array(Q, i, j), params) for i, j in params.range_dom))
+
+    def riemann(
+        self, qL: Array, qR: Array, params: Params, out: Array, smax: Optional[Array] = None
+    ) -> Array:
+        if smax is not None:
+            raise NotImplementedError("The python backend does not estimate wave speeds (dt_from_riemann).")
+        # Comme array_fivewaves : beta et le nombre d'Alfvén peuvent être inf ou nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i, j in np.ndindex(qL.shape[:-1]):
+                flux = riemann(get_state_from_array(qL, i, j), get_state_from_array(qR, i, j), params)
+                set_state_into_array(out, i, j, flux)
+        return out
+
+    def fill_boundaries(self, Q: Array, params: Params) -> None:
+        # Même ordre que fillBoundaries : les lignes du domaine selon x, puis
+        # toutes les colonnes selon y (coins compris)
+        for i, j in params.range_xbound:
+            for ig, iref, bc in (
+                (i, params.ibeg, params.boundary_xmin),
+                (params.iend + i, params.iend - 1, params.boundary_xmax),
+            ):
+                set_state_into_array(Q, ig, j, _ghost_state(Q, ig, j, iref, j, bc, IDir.IX, params))
+        for i, j in params.range_ybound:
+            for jg, jref, bc in (
+                (j, params.jbeg, params.boundary_ymin),
+                (params.jend + j, params.jend - 1, params.boundary_ymax),
+            ):
+                set_state_into_array(Q, i, jg, _ghost_state(Q, i, jg, i, jref, bc, IDir.IY, params))
+
+
+def _ghost_state(Q: Array, i: int, j: int, iref: int, jref: int, bc: str, idir: IDir, params: Params) -> State:
+    """État de la cellule fantôme (i, j), dont la cellule de bord du domaine est (iref, jref)."""
+    match (bc):
+        case "BC_ABSORBING":
+            return fillAbsorbing(Q, iref, jref, idir)
+        case "BC_REFLECTING":
+            return fillReflecting(Q, i, j, iref, jref, idir, params)
+        case _:  # BC_PERIODIC
+            return fillPeriodic(Q, i, j, idir, params)
+
+
+class NumbaBackend(Backend):
+    """
+    Fonctions par cellule compilées par Numba (numba_kernels.py).
+
+    Les cellules fantômes sont remplies par fillBoundaries : ce ne sont que
+    des copies de blocs, déjà rapides en NumPy.
+    """
+
+    name = "numba"
+
+    def __init__(self) -> None:
+        try:
+            from src import numba_kernels
+        except ImportError as exc:
+            raise ImportError("The numba backend requires numba (pip install numba).") from exc
+        self.kernels = numba_kernels
+
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None:
+        self.kernels.primToCons(Q, U, params.ibeg, params.iend, params.jbeg, params.jend, params.gamma, params.MHD)
+
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None:
+        self.kernels.consToPrim(U, Q, params.ibeg, params.iend, params.jbeg, params.jend, params.gamma, params.MHD)
+
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t:
+        return float(
+            self.kernels.max_inv_dt(
+                Q, params.ibeg, params.iend, params.jbeg, params.jend, params.gamma, params.dx, params.dy, params.MHD
+            )
+        )
+
+    def riemann(
+        self, qL: Array, qR: Array, params: Params, out: Array, smax: Optional[Array] = None
+    ) -> Array:
+        match (params.riemann_solver.upper()):
+            case "HLL":
+                assert params.MHD is False, "HLL is not suitable for solving MHD problem."
+                solver = self.kernels.HLL
+            case "FIVEWAVES":
+                solver = self.kernels.FIVEWAVES
+            case _:
+                raise ValueError("The selected Riemann solver is not available.")
+        if smax is None:
+            smax = np.empty(qL.shape[:-1])
+        self.kernels.riemann(qL, qR, out, smax, solver, params.gamma, params.epsilon, params.MHD)
+        return out
+
+    def fill_boundaries(self, Q: Array, params: Params) -> None:
+        fillBoundaries(Q, params)
+
+
+backends: dict[str, type[Backend]] = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+@cache
+def get_backend(name: str) -> Backend:
+    """Backend de nom name (params.backend), créé au premier appel."""
+    if name not in backends:
+        raise ValueError(f"Unknown backend: {name} (available: {', '.join(backends)})")
+    return backends[name]()
@@ -1,6 +1,7 @@
+import numpy as np
 from src.pycfd_types import Array, IDir
-from src.states import State, get_state_from_array, set_state_into_array
-import src.params as params
+from src.states import State, get_state_from_array
+from src.params import Params
 from src.varindexes import IU, IV, IBX, IBY
 
 
@@ -9,7 +10,7 @@ def fillAbsorbing(Q: Array, iref: int, jref: int, idir: IDir) -> State:
     return q
 
 
-def fillReflecting(Q: Array, i: int, j: int, iref: int, jref: int, idir: IDir) -> State:
+def fillReflecting(Q: Array, i: int, j: int, iref: int, jref: int, idir: IDir, params: Params) -> State:
     if idir == IDir.IX:
         ipiv: int = params.ibeg if i < iref else params.iend
         isym = 2 * ipiv - i - 1
@@ -31,7 +32,7 @@ def fillReflecting(Q: Array, i: int, j: int, iref: int, jref: int, idir: IDir) -
     return q
 
 
-def fillPeriodic(Q: Array, i: int, j: int, idir: IDir) -> State:
+def fillPeriodic(Q: Array, i: int, j: int, idir: IDir, params: Params) -> State:
     if idir == IDir.IX:
         if i < params.ibeg:
             i += params.Nx
@@ -46,46 +47,53 @@ def fillPeriodic(Q: Array, i: int, j: int, idir: IDir) -> State:
     return get_state_from_array(Q, i, j)
 
 
-def fillBoundaries(Q: Array) -> None:
-    bc_x = params.boundary_x
-    bc_y = params.boundary_y
-
-    for i, j in params.range_xbound:
-        ileft = i
-        iright = params.iend + i
-        iref_left = params.ibeg
-        iref_right = params.iend - 1
-
-        def fillX(i: int, iref: int) -> State:
-            match (bc_x):
-                case "BC_ABSORBING":
-                    return fillAbsorbing(Q, iref, j, IDir.IX)
-                case "BC_REFLECTING":
-                    return fillReflecting(Q, i, j, iref, j, IDir.IX)
-                case "BC_PERIODIC":
-                    return fillPeriodic(Q, i, j, IDir.IX)
-                case _:
-                    return fillPeriodic(Q, i, j, IDir.IX)
-
-        set_state_into_array(Q, ileft, j, fillX(ileft, iref_left))
-        set_state_into_array(Q, iright, j, fillX(iright, iref_right))
-
-    for i, j in params.range_ybound:
-        jtop: int = j
-        jbot: int = params.jend + j
-        jref_top: int = params.jbeg
-        jref_bot: int = params.jend - 1
-
-        def fillY(j: int, jref: int) -> State:
-            match (bc_y):
-                case "BC_ABSORBING":
-                    return fillAbsorbing(Q, i, jref, IDir.IY)
-                case "BC_REFLECTING":
-                    return fillReflecting(Q, i, j, i, jref, IDir.IY)
-                case "BC_PERIODIC":
-                    return fillPeriodic(Q, i, j, IDir.IY)
-                case _:
-                    return fillPeriodic(Q, i, j, IDir.IY)
-
-        set_state_into_array(Q, i, jtop, fillY(jtop, jref_top))
-        set_state_into_array(Q, i, jbot, fillY(jbot, jref_bot))
+def reflect_signs(idir: IDir, params: Params) -> Array:
+    """Signes appliqués aux variables lors d'une réflexion normale à idir."""
+    sign: Array = np.ones(params.Nfields)
+    if idir == IDir.IX:
+        sign[IU] = -1.0
+        if params.MHD:
+            sign[IBX] = -1.0
+    else:
+        sign[IV] = -1.0
+        if params.MHD:
+            sign[IBY] = -1.0
+    return sign
+
+
+def fill_ghost_layer(
+    V: Array, beg: int, end: int, lower: bool, bc: str, idir: IDir, params: Params
+) -> None:
+    """
+    Remplit les Nghosts cellules fantômes d'un côté du domaine.
+
+    Parameters:
+    V (Array): Vue de Q dont le premier axe est la direction idir.
+    beg, end (int): Bornes du domaine selon ce premier axe.
+    lower (bool): Côté à remplir (True pour xmin/ymin, False pour xmax/ymax).
+    bc (str): Type de condition aux limites de ce côté.
+    idir (IDir): Direction normale au bord.
+    params (Params): Paramètres de la simulation.
+    """
+    ng: int = params.Nghosts
+    ghosts: Array = V[beg - ng : beg] if lower else V[end : end + ng]
+    match (bc):
+        case "BC_ABSORBING":
+            ghosts[...] = V[beg : beg + 1] if lower else V[end - 1 : end]
+        case "BC_REFLECTING":
+            mirror: Array = V[beg : beg + ng] if lower else V[end - ng : end]
+            np.multiply(mirror[::-1], reflect_signs(idir, params), out=ghosts)
+        case _:  # BC_PERIODIC
+            ghosts[...] = V[end - ng : end] if lower else V[beg : beg + ng]
+
+
+def fillBoundaries(Q: Array, params: Params) -> None:
+    # Selon x, seules les lignes du domaine sont remplies ; selon y, on remplit
+    # toutes les colonnes, ce qui complète les coins à partir des fantômes en x.
+    rows: Array = Q[:, params.jbeg : params.jend]
+    fill_ghost_layer(rows, params.ibeg, params.iend, True, params.boundary_xmin, IDir.IX, params)
+    fill_ghost_layer(rows, params.ibeg, params.iend, False, params.boundary_xmax, IDir.IX, params)
+
+    columns: Array = Q.swapaxes(0, 1)
+    fill_ghost_layer(columns, params.jbeg, params.jend, True, params.boundary_ymin, IDir.IY, params)
+    fill_ghost_layer(columns, params.jbeg, params.jend, False, params.boundary_ymax, IDir.IY, params)
@@ -0,0 +1,217 @@
+"""
+Diagnostics calculés pendant la simulation (in situ).
+
+Chaque diagnostic est une réduction vectorisée sur le domaine (sans les
+cellules fantômes) des variables primitives Q et conservatives U, qui renvoie
+un scalaire. Tous les params.diagnostics_frequency pas de temps, les
+diagnostics choisis sont ajoutés à une série temporelle compacte, en CSV
+(<outname>.csv, une ligne par pas) ou en HDF5 (<outname>.h5, un dataset
+extensible par diagnostic), ce qui permet d'espacer les sorties complètes.
+
+Les intégrales (mass, energy...) sont multipliées par le volume des
+cellules dx * dy.
+"""
+
+import csv
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, TextIO
+import numpy as np
+from src.params import Params
+from src.pycfd_types import Array
+from src.varindexes import IR, IE, IP, IVEL, IMAG, IBX, IBY
+
+if TYPE_CHECKING:
+    import h5py
+
+Reduction = Callable[[Array, Array, Params], float]
+
+
+def total_mass(Q: Array, U: Array, params: Params) -> float:
+    return float(U[params.slice_dom][..., IR].sum() * params.dx * params.dy)
+
+
+def total_energy(Q: Array, U: Array, params: Params) -> float:
+    return float(U[params.slice_dom][..., IE].sum() * params.dx * params.dy)
+
+
+def kinetic_energy(Q: Array, U: Array, params: Params) -> float:
+    q = Q[params.slice_dom]
+    return float(0.5 * np.sum(q[..., IR] * np.sum(q[..., IVEL] ** 2, axis=-1)) * params.dx * params.dy)
+
+
+def magnetic_energy(Q: Array, U: Array, params: Params) -> float:
+    return float(0.5 * np.sum(Q[params.slice_dom][..., IMAG] ** 2) * params.dx * params.dy)
+
+
+def max_divB(Q: Array, U: Array, params: Params) -> float:
+    """
+    Maximum de |div B| par différences centrées.
+
+    Seules les cellules dont les voisines sont dans le domaine sont prises en
+    compte : les cellules fantômes de Q ne sont pas forcément à jour.
+    """
+    q = Q[params.slice_dom]
+    dbx = (q[2:, 1:-1, IBX] - q[:-2, 1:-1, IBX]) / (2 * params.dx)
+    dby = (q[1:-1, 2:, IBY] - q[1:-1, :-2, IBY]) / (2 * params.dy)
+    if dbx.size == 0:
+        return 0.0
+    return float(np.max(np.abs(dbx + dby)))
+
+
+def min_density(Q: Array, U: Array, params: Params) -> float:
+    return float(Q[params.slice_dom][..., IR].min())
+
+
+def min_pressure(Q: Array, U: Array, params: Params) -> float:
+    return float(Q[params.slice_dom][..., IP].min())
+
+
+reductions: dict[str, Reduction] = {
+    "mass": total_mass,
+    "energy": total_energy,
+    "kinetic_energy": kinetic_energy,
+    "magnetic_energy": magnetic_energy,
+    "max_divB": max_divB,
+    "min_rho": min_density,
+    "min_prs": min_pressure,
+}
+
+# Diagnostics qui n'ont de sens qu'en MHD
+mhd_reductions = {"magnetic_energy", "max_divB"}
+
+
+class Diagnostics:
+    """
+    Série temporelle des diagnostics d'une simulation.
+
+    Parameters:
+    params (Params): Paramètres de la simulation (diagnostics, diagnostics_frequency, diagnostics_format).
+    dirname (str | Path): Dossier de sortie.
+    outname (str): Nom du fichier, sans extension.
+    start_step (int): Pas de temps de départ ; à la reprise d'un calcul, les lignes
+        déjà écrites à partir de ce pas sont supprimées.
+    """
+
+    def __init__(
+        self, params: Params, dirname: str | Path = "data", outname: str = "diagnostics", start_step: int = 0
+    ) -> None:
+        self.params = params
+        self.frequency = params.diagnostics_frequency
+
+        available = [name for name in reductions if params.MHD or name not in mhd_reductions]
+        if params.diagnostics.strip():
+            names = [name.strip() for name in params.diagnostics.split(",") if name.strip()]
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                raise ValueError(f"Unknown diagnostics: {', '.join(unknown)} (available: {', '.join(available)})")
+        else:
+            names = available
+        self.names: list[str] = names
+
+        if params.diagnostics_format not in ("csv", "hdf5"):
+            raise ValueError(f"Unknown diagnostics format: {params.diagnostics_format}")
+        self.format = params.diagnostics_format
+        suffix = ".csv" if self.format == "csv" else ".h5"
+        self.filename = Path(dirname) / f"{outname}{suffix}"
+        self.start_step = start_step
+        self._csv: Optional[TextIO] = None
+        self._h5: Optional["h5py.File"] = None
+
+    def due(self, step: int) -> bool:
+        """Vrai si les diagnostics doivent être calculés au pas de temps step."""
+        return self.frequency > 0 and step % self.frequency == 0
+
+    def compute(self, Q: Array, U: Array) -> dict[str, float]:
+        """Calcule tous les diagnostics choisis."""
+        return {name: reductions[name](Q, U, self.params) for name in self.names}
+
+    def write(self, Q: Array, U: Array, t: float, step: int) -> dict[str, float]:
+        """
+        Calcule les diagnostics et les ajoute à la série temporelle.
+
+        Returns:
+        dict[str, float]: Les valeurs écrites.
+        """
+        values = self.compute(Q, U)
+        if self.format == "csv":
+            self._write_csv(values, t, step)
+        else:
+            self._write_hdf5(values, t, step)
+        return values
+
+    def _write_csv(self, values: dict[str, float], t: float, step: int) -> None:
+        if self._csv is None:
+            self._csv = self._open_csv()
+        row = [repr(float(t)), str(step)] + [repr(values[name]) for name in self.names]
+        self._csv.write(",".join(row) + "\n")
+        # Lisible pendant le calcul
+        self._csv.flush()
+
+    def _open_csv(self) -> TextIO:
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        header = ["time", "step"] + self.names
+        rows: list[list[str]] = []
+        if self.start_step > 0 and self.filename.exists():
+            with open(self.filename, newline="") as f:
+                reader = csv.reader(f)
+                if next(reader, None) == header:
+                    rows = [row for row in reader if int(row[1]) < self.start_step]
+        f = open(self.filename, "w")
+        f.write(",".join(header) + "\n")
+        for row in rows:
+            f.write(",".join(row) + "\n")
+        return f
+
+    def _write_hdf5(self, values: dict[str, float], t: float, step: int) -> None:
+        if self._h5 is None:
+            self._h5 = self._open_hdf5()
+        f = self._h5
+        n = f["time"].shape[0]
+        for name, value in [("time", t), ("step", step)] + list(values.items()):
+            f[name].resize((n + 1,))
+            f[name][n] = value
+        f.flush()
+
+    def _open_hdf5(self) -> "h5py.File":
+        import h5py
+
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        if self.start_step > 0 and self.filename.exists():
+            f = h5py.File(self.filename, "a")
+            if set(f) == {"time", "step", *self.names}:
+                n = int(np.count_nonzero(f["step"][...] < self.start_step))
+                for name in f:
+                    f[name].resize((n,))
+                return f
+            f.close()
+        f = h5py.File(self.filename, "w")
+        for name in ["time", "step"] + self.names:
+            f.create_dataset(name, shape=(0,), maxshape=(None,), dtype="i8" if name == "step" else "f8", chunks=(256,))
+        return f
+
+    def close(self) -> None:
+        if self._csv is not None:
+            self._csv.close()
+            self._csv = None
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
+
+    def __enter__(self) -> "Diagnostics":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_diagnostics(filename: str | Path) -> dict[str, Array]:
+    """Relit une série de diagnostics (CSV ou HDF5) sous forme {nom: tableau}."""
+    path = Path(filename)
+    if path.suffix == ".csv":
+        data = np.genfromtxt(path, delimiter=",", names=True, ndmin=1)
+        assert data.dtype.names is not None
+        return {name: np.asarray(data[name]) for name in data.dtype.names}
+    import h5py
+
+    with h5py.File(path, "r") as f:
+        return {name: f[name][...] for name in f}
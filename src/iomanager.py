@@ -1,19 +1,83 @@
+import json
+import math
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 import numpy as np
-import h5py
-import src.params as params 
+from src import npyio
+from src.params import OutputStream, Params
+from src.pycfd_types import Array
 from src.varindexes import IR, IU, IV, IW, IP, IBX, IBY, IBZ, IPSI
 
+# h5py n'est importé que si le format HDF5 est utilisé (params.output_backend)
+if TYPE_CHECKING:
+    import h5py
+
+# Nom des datasets HDF5 et indice de la variable correspondante dans Q
+fields: dict[str, int] = {
+    "rho": IR,
+    "u": IU,
+    "v": IV,
+    "prs": IP,
+    "w": IW,
+    "bx": IBX,
+    "by": IBY,
+    "bz": IBZ,
+    "psi": IPSI,
+}
+
+
+@dataclass(frozen=True)
+class StreamState:
+    """État d'un flux de sortie : dernière sortie écrite et date de la suivante."""
+
+    iteration: int  # numéro de la dernière sortie
+    next_save: float
+
+
+@dataclass(frozen=True)
+class RestartInfo:
+    """État de la boucle en temps enregistré avec un point de reprise."""
+
+    time: float
+    step: int  # nombre de pas de temps effectués
+    dt_next: Optional[float]  # pas de temps estimé par le solveur de Riemann, s'il y en a un
+    streams: dict[str, StreamState]  # état de chaque flux de sortie, par nom
+
+
+def _cell_range(lo: float, hi: float, origin: float, delta: float, beg: int, first: int, last: int) -> tuple[int, int]:
+    """
+    Indices [i0, iN[ des cellules touchées par l'intervalle [lo, hi], dans [first, last[.
+
+    L'intervalle contient au moins une cellule (coupe 1D si lo == hi).
+    """
+    i0 = beg + math.floor((lo - origin) / delta) if math.isfinite(lo) else first
+    iN = beg + math.ceil((hi - origin) / delta) if math.isfinite(hi) else last
+    i0 = min(max(i0, first), last - 1)
+    return i0, min(max(iN, i0 + 1), last)
+
 
 class IOManager:
-    def __init__(self, outname: str = "run", dirname: str = "data"):
+    """
+    Écriture des sorties d'une simulation (HDF5 + XDMF ou npy) et des points de reprise.
+
+    Sans stream, tout le domaine est écrit (avec les cellules fantômes si
+    params.write_ghost_cells) ; un OutputStream restreint les sorties à une
+    zone, éventuellement moyennée par blocs.
+    """
+
+    def __init__(
+        self, params: Params, outname: str = "run", dirname: str | Path = "data", stream: Optional[OutputStream] = None
+    ):
+        self.params = params
         self.outname = outname
         self.dirname = Path(dirname)
         self.ite_nzeros = 4  # Format des itérations : ite_0000
         self.setup_dirdata()
 
-        # Récupération des paramètres depuis src.params
+        # Récupération des paramètres de la simulation
         self.Nx = params.Nx
         self.Ny = params.Ny
         self.Ntx = params.Ntx
@@ -27,119 +91,217 @@ class IOManager:
         self.xmin = params.xmin
         self.ymin = params.ymin
         self.MHD = params.MHD
-        self.write_ghost_cells = getattr(params, 'write_ghost_cells', False)
+        self.write_ghost_cells = params.write_ghost_cells
+
+        # Détermine les bornes (avec ou sans ghost cells)
+        self.i0, self.iN = self.ibeg, self.iend
+        self.j0, self.jN = self.jbeg, self.jend
+        if self.write_ghost_cells:
+            self.i0, self.iN = 0, self.Ntx
+            self.j0, self.jN = 0, self.Nty
+
+        # Zone d'un flux de sortie, et moyenne par blocs de coarsen x coarsen cellules
+        self.save_freq = params.save_freq
+        self.coarsen = 1
+        if stream is not None:
+            self.save_freq = stream.save_freq
+            self.coarsen = stream.coarsen
+            self.i0, self.iN = _cell_range(stream.xmin, stream.xmax, self.xmin, self.dx, self.ibeg, self.i0, self.iN)
+            self.j0, self.jN = _cell_range(stream.ymin, stream.ymax, self.ymin, self.dy, self.jbeg, self.j0, self.jN)
+
+        # Dimensions pour XDMF (fdim = cellules, gdim = sommets) ; la zone est
+        # réduite à un nombre entier de blocs, sans jamais déborder de la zone
+        # demandée (vers les cellules fantômes ou une autre ligne)
+        c = self.coarsen
+        if c > self.iN - self.i0 or c > self.jN - self.j0:
+            raise ValueError(
+                f"Output region ({self.iN - self.i0}x{self.jN - self.j0} cells) is smaller than one {c}x{c} block"
+            )
+        self.fNy, self.fNx = (self.jN - self.j0) // c, (self.iN - self.i0) // c
+        self.iN, self.jN = self.i0 + c * self.fNx, self.j0 + c * self.fNy
+        self.gNy, self.gNx = self.fNy + 1, self.fNx + 1
+
+        # Coordonnées des sommets, calculées une seule fois, de forme (gNy, gNx)
+        xv = (np.arange(self.i0, self.iN + 1, c) - self.ibeg) * self.dx + self.xmin
+        yv = (np.arange(self.j0, self.jN + 1, c) - self.jbeg) * self.dy + self.ymin
+        self.x_coords, self.y_coords = np.meshgrid(xv, yv)
+
+        # Champs écrits : ceux présents dans Q, ou la sélection params.output_fields
+        self.fields = {name: ivar for name, ivar in fields.items() if ivar < params.Nfields}
+        if params.output_fields:
+            selection = [name.strip() for name in params.output_fields.split(",") if name.strip()]
+            unknown = [name for name in selection if name not in self.fields]
+            if unknown:
+                raise ValueError(f"Unknown output fields: {', '.join(unknown)}")
+            self.fields = {name: ivar for name, ivar in self.fields.items() if name in selection}
+
+        # Format des datasets : précision, découpage en blocs et compression
+        if params.output_precision not in (4, 8):
+            raise ValueError("output_precision must be 4 (float32) or 8 (float64).")
+        self.precision = params.output_precision
+        self.dtype = np.float32 if self.precision == 4 else np.float64
+        self.dataset_options = self._dataset_options(params)
+
+        # Format des fichiers : HDF5 + XDMF, ou .npy + JSON (voir npyio)
+        if params.output_backend not in ("hdf5", "npy"):
+            raise ValueError(f"Unknown output backend: {params.output_backend}")
+        self.backend = params.output_backend
+
+        # Écriture asynchrone (params.async_output) : la boucle en temps copie la
+        # zone écrite de Q dans l'un des deux tampons, puis un thread d'écriture
+        # unique écrit ce tampon pendant que le calcul continue.
+        self.async_output = params.async_output
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._buffers: list[np.ndarray] = []
+        self._pending: list[Optional[Future]] = [None, None]
+        self._ibuf = 0
+        # Fichier unique (params.unique_output), ouvert à la première sauvegarde
+        self.unique_output = params.unique_output
+        self._h5: Optional["h5py.File"] = None
+        self._npy: Optional[npyio.NpySeries] = None
+        # À la reprise d'un calcul, dernière sortie du fichier unique à conserver (voir resume)
+        self.resume_iteration = 0
+        if self.async_output:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="iomanager")
+            region_shape = (self.iN - self.i0, self.jN - self.j0, params.Nfields)
+            self._buffers = [np.zeros(region_shape) for _ in range(2)]
 
     def setup_dirdata(self) -> None:
         """Crée le dossier de sortie s'il n'existe pas."""
         self.dirname.mkdir(parents=True, exist_ok=True)
 
-    def save_solution(self, Q: np.ndarray, iteration: int, t: float, unique_output: bool = False) -> None:
+    def resume(self, iteration: int) -> None:
+        """
+        Reprise d'un calcul dont la dernière sortie écrite est iteration.
+
+        Le fichier unique existant est rouvert à la première sauvegarde : ses
+        sorties jusqu'à iteration sont conservées, les suivantes (écrites
+        après le point de reprise) sont supprimées.
+        """
+        self.resume_iteration = iteration
+
+    def save_solution(self, Q: np.ndarray, iteration: int, t: float, unique_output: Optional[bool] = None) -> None:
         """
         Sauvegarde la solution dans un fichier HDF5 et génère un XMF.
         Args:
-            Q: Tableau 3D (Ny, Nx, Nfields) contenant les variables.
+            Q: Variables primitives, de forme (Ntx, Nty, Nfields) et indexées (i, j).
             iteration: Numéro de l'itération.
             t: Temps de simulation.
-            unique_output: Si True, utilise un seul fichier HDF5 pour toutes les itérations.
+            unique_output: Si True, utilise un seul fichier HDF5 pour toutes les itérations
+                (par défaut params.unique_output). Ce fichier reste ouvert jusqu'à close().
+
+        Seule la zone Q[i0:iN, j0:jN] est écrite (moyennée par blocs si coarsen > 1) :
+        chaque champ de fields est un dataset 2D (fNy, fNx), tiré des vues
+        transposées de region_views.
+
+        En mode asynchrone, la zone écrite de Q est copiée dans un tampon et
+        l'appel rend la main sans attendre l'écriture ; il ne bloque que si ce
+        tampon est encore en cours d'écriture (sauvegarde d'avant la précédente).
         """
-        if unique_output:
-            self._save_solution_unique(Q, iteration, t)
-        else:
-            self._save_solution_multiple(Q, iteration, t)
+        if unique_output is None:
+            unique_output = self.unique_output
+        block: Array = Q[self.i0 : self.iN, self.j0 : self.jN]
+        if self._executor is None:
+            self._write_solution(block, iteration, t, unique_output)
+            return
+
+        ibuf = self._ibuf
+        self._wait(ibuf)
+        buffer = self._buffers[ibuf]
+        np.copyto(buffer, block)
+        self._pending[ibuf] = self._executor.submit(self._write_solution, buffer, iteration, t, unique_output)
+        self._ibuf = 1 - ibuf
+
+    def _wait(self, ibuf: int) -> None:
+        """Attend la fin de l'écriture du tampon ibuf (et propage ses erreurs)."""
+        pending = self._pending[ibuf]
+        if pending is not None:
+            self._pending[ibuf] = None
+            pending.result()
+
+    def flush(self) -> None:
+        """Attend la fin de toutes les écritures en cours."""
+        for ibuf in (self._ibuf, 1 - self._ibuf):  # dans l'ordre de soumission
+            self._wait(ibuf)
+
+    def close(self) -> None:
+        """
+        Termine les écritures en cours et arrête le thread d'écriture.
 
-    def _save_solution_multiple(self, Q: np.ndarray, iteration: int, t: float) -> None:
+        En sortie unique, ferme le fichier HDF5 et écrit le XMF de la série.
+        """
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._close_unique()
+        if self._npy is not None:
+            self._npy.close()
+            self._npy = None
+
+    def __enter__(self) -> "IOManager":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write_solution(self, block: Array, iteration: int, t: float, unique_output: bool) -> None:
+        """Écrit la zone block de Q (Q[i0:iN, j0:jN]) dans le format choisi."""
+        match (self.backend, unique_output):
+            case ("npy", True):
+                self._save_npy_unique(block, iteration, t)
+            case ("npy", False):
+                self._save_npy_multiple(block, iteration, t)
+            case (_, True):
+                self._save_solution_unique(block, iteration, t)
+            case _:
+                self._save_solution_multiple(block, iteration, t)
+
+    def _save_solution_multiple(self, block: Array, iteration: int, t: float) -> None:
         """Sauvegarde une solution par fichier (comme dans ton code C++)."""
         iteration_str = f"ite_{iteration:0{self.ite_nzeros}d}"
         h5_filename = self.dirname / f"{iteration_str}.h5"
         xmf_filename = self.dirname / f"{iteration_str}.xmf"
 
-        # Détermine les bornes (avec ou sans ghost cells)
-        j0, jN = self.jbeg, self.jend
-        i0, iN = self.ibeg, self.iend
-        if self.write_ghost_cells:
-            j0, jN = 0, self.Nty
-            i0, iN = 0, self.Ntx
-
-        # Dimensions pour XDMF (fdim = cellules, gdim = sommets)
-        fNy, fNx = jN - j0, iN - i0  # Nombre de cellules
-        gNy, gNx = fNy + 1, fNx + 1  # Nombre de sommets
-
-        # Coordonnées (sommets)
-        x_coords = np.zeros(gNx * gNy)
-        y_coords = np.zeros(gNx * gNy)
-        idx = 0
-        for j in range(j0, jN + 1):
-            for i in range(i0, iN + 1):
-                x_coords[idx] = (i - self.ibeg) * self.dx + self.xmin
-                y_coords[idx] = (j - self.jbeg) * self.dy + self.ymin
-                idx += 1
-
         # Sauvegarde HDF5
+        import h5py
+
         with h5py.File(h5_filename, "w") as f:
-            # Attributs globaux
             f.attrs["time"] = t
             f.attrs["iteration"] = iteration
-            f.attrs["Nx"] = self.Nx
-            f.attrs["Ny"] = self.Ny
-            f.attrs["Ntx"] = self.Ntx
-            f.attrs["Nty"] = self.Nty
-            f.attrs["ibeg"] = self.ibeg
-            f.attrs["iend"] = self.iend
-            f.attrs["jbeg"] = self.jbeg
-            f.attrs["jend"] = self.jend
-            f.attrs["problem"] = params.problem_name
-            f.attrs["dx"] = self.dx
-            f.attrs["dy"] = self.dy
-            f.attrs["xmin"] = self.xmin
-            f.attrs["ymin"] = self.ymin
-
-            # Coordonnées
-            f.create_dataset("x", data=x_coords)
-            f.create_dataset("y", data=y_coords)
-
-            # Extraction des champs (cellules)
-            trho = np.zeros(fNy * fNx)
-            tu = np.zeros(fNy * fNx)
-            tv = np.zeros(fNy * fNx)
-            tprs = np.zeros(fNy * fNx)
-            idx = 0
-            for j in range(j0, jN):
-                for i in range(i0, iN):
-                    trho[idx] = Q[i, j, IR]
-                    tu[idx] = Q[i, j, IU]
-                    tv[idx] = Q[i, j, IV]
-                    tprs[idx] = Q[i, j, IP]
-                    idx += 1
-
-            f.create_dataset("rho", data=trho)
-            f.create_dataset("u", data=tu)
-            f.create_dataset("v", data=tv)
-            f.create_dataset("prs", data=tprs)
-
-            # Champs MHD (si activé)
-            # if self.MHD:
-            tw = np.zeros(fNy * fNx)
-            tbx = np.zeros(fNy * fNx)
-            tby = np.zeros(fNy * fNx)
-            tbz = np.zeros(fNy * fNx)
-            tpsi = np.zeros(fNy * fNx)
-            idx = 0
-            for j in range(j0, jN):
-                for i in range(i0, iN):
-                    tw[idx] = Q[i, j, IW]
-                    tbx[idx] = Q[i, j, IBX]
-                    tby[idx] = Q[i, j, IBY]
-                    tbz[idx] = Q[i, j, IBZ]
-                    tpsi[idx] = Q[i, j, IPSI]
-                    idx += 1
-            f.create_dataset("w", data=tw)
-            f.create_dataset("bx", data=tbx)
-            f.create_dataset("by", data=tby)
-            f.create_dataset("bz", data=tbz)
-            f.create_dataset("psi", data=tpsi)
+            self._write_grid(f)
+
+            # Champs aux centres des cellules, de forme (fNy, fNx)
+            self._write_fields(f, block)
 
         # Génération du fichier XMF avec le bon nom de fichier HDF5
-        self._generate_xmf(h5_filename, xmf_filename, t, fNy, fNx, gNy, gNx, iteration_str)
+        self._generate_xmf(h5_filename, xmf_filename, t, self.fNy, self.fNx, self.gNy, self.gNx, iteration_str)
+
+    def grid_attrs(self) -> dict[str, Any]:
+        """Attributs globaux de la grille, communs à toutes les sorties."""
+        return {
+            "Nx": self.Nx,
+            "Ny": self.Ny,
+            "Ntx": self.Ntx,
+            "Nty": self.Nty,
+            "ibeg": self.ibeg,
+            "iend": self.iend,
+            "jbeg": self.jbeg,
+            "jend": self.jend,
+            "problem": self.params.problem_name,
+            "dx": self.dx,
+            "dy": self.dy,
+            "xmin": self.xmin,
+            "ymin": self.ymin,
+        }
+
+    def _write_grid(self, f: "h5py.File") -> None:
+        """Écrit les attributs de la grille et les coordonnées des sommets."""
+        f.attrs.update(self.grid_attrs())
+
+        # Coordonnées
+        f.create_dataset("x", data=self.x_coords)
+        f.create_dataset("y", data=self.y_coords)
 
     def _generate_xmf(self, h5_filename: Path, xmf_filename: Path, t: float,
                       fNy: int, fNx: int, gNy: int, gNx: int, iteration_str: str) -> None:
@@ -168,44 +330,8 @@ class IOManager:
                     &GridEntity;
                 ''')
 
-            # Champs scalaires
-            for field in ["rho", "prs"]:
-                xdmf_fd.write(f'''
-                    <Attribute Name="{field}" AttributeType="Scalar" Center="Cell">
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{field}</DataItem>
-                    </Attribute>
-                ''')
-
-            # Champs vectoriels
-            if not self.MHD:
-                xdmf_fd.write('''
-                    <Attribute Name="velocity" AttributeType="Vector" Center="Cell">
-                        <DataItem Dimensions="&fdim; 2" ItemType="Function" Function="JOIN($0, $1)">
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/u</DataItem>
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/v</DataItem>
-                        </DataItem>
-                    </Attribute>
-                ''')
-            else:
-                xdmf_fd.write('''
-                    <Attribute Name="velocity" AttributeType="Vector" Center="Cell">
-                        <DataItem Dimensions="&fdim; 3" ItemType="Function" Function="JOIN($0, $1, $2)">
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/u</DataItem>
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/v</DataItem>
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/w</DataItem>
-                        </DataItem>
-                    </Attribute>
-                    <Attribute Name="magnetic" AttributeType="Vector" Center="Cell">
-                        <DataItem Dimensions="&fdim; 3" ItemType="Function" Function="JOIN($0, $1, $2)">
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/bx</DataItem>
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/by</DataItem>
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/bz</DataItem>
-                        </DataItem>
-                    </Attribute>
-                    <Attribute Name="psi" AttributeType="Scalar" Center="Cell">
-                        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/psi</DataItem>
-                    </Attribute>
-                ''')
+            # Champs écrits (scalaires et vecteurs)
+            xdmf_fd.write(self._xmf_attributes(""))
 
             xdmf_fd.write('''
                 </Grid>
@@ -214,53 +340,84 @@ class IOManager:
             </Xdmf>
             ''')
 
-    def _save_solution_unique(self, Q: np.ndarray, iteration: int, t: float) -> None:
-        """Sauvegarde dans un seul fichier HDF5 (groupes par itération)."""
+    def _open_unique(self) -> "h5py.File":
+        """
+        Ouvre le fichier unique de la simulation et crée ses datasets.
+
+        Chaque champ est un dataset (nt, fNy, fNx) dont l'axe du temps est
+        illimité, accompagné des datasets time et iteration de forme (nt,).
+        À la reprise d'un calcul (resume), le fichier existant est rouvert et
+        tronqué après la sortie resume_iteration.
+        """
+        import h5py
+
+        filename = self.dirname / f"{self.outname}.h5"
+        if self.resume_iteration > 0 and filename.exists():
+            f = h5py.File(filename, "a")
+            if {"time", "iteration", *self.fields} <= set(f) and all(
+                f[name].shape[1:] == (self.fNy, self.fNx) for name in self.fields
+            ):
+                n = int(np.count_nonzero(f["iteration"][...] <= self.resume_iteration))
+                for name in ["time", "iteration", *self.fields]:
+                    f[name].resize(n, axis=0)
+                return f
+            f.close()
+
+        f = h5py.File(filename, "w")
+        self._write_grid(f)
+
+        options = dict(self.dataset_options)
+        chunks = options.pop("chunks", (self.fNy, self.fNx))
+        for name in self.fields:
+            f.create_dataset(
+                name,
+                shape=(0, self.fNy, self.fNx),
+                maxshape=(None, self.fNy, self.fNx),
+                chunks=(1,) + chunks,
+                dtype=self.dtype,
+                **options,
+            )
+        f.create_dataset("time", shape=(0,), maxshape=(None,), dtype=np.float64)
+        f.create_dataset("iteration", shape=(0,), maxshape=(None,), dtype=np.int64)
+        return f
+
+    def _save_solution_unique(self, block: Array, iteration: int, t: float) -> None:
+        """Ajoute la solution comme un nouveau pas de temps du fichier unique, laissé ouvert."""
+        if self._h5 is None:
+            self._h5 = self._open_unique()
+        f = self._h5
+
+        n: int = f["time"].shape[0]
+        for name, view in self.region_views(block).items():
+            f[name].resize(n + 1, axis=0)
+            f[name][n] = view
+        for name, value in (("time", t), ("iteration", iteration)):
+            f[name].resize(n + 1, axis=0)
+            f[name][n] = value
+        f.flush()
+
+    def _close_unique(self) -> None:
+        """Ferme le fichier unique et écrit le XMF décrivant tous ses pas de temps."""
+        if self._h5 is None:
+            return
+        times = self._h5["time"][...]
+        iterations = self._h5["iteration"][...]
+        self._h5.close()
+        self._h5 = None
+        self._generate_unique_xmf(times, iterations)
+
+    def _generate_unique_xmf(self, times: Array, iterations: Array) -> None:
+        """Génère le XMF du fichier unique : une grille par pas de temps, lue par hyperslab."""
         h5_filename = self.dirname / f"{self.outname}.h5"
         xmf_filename = self.dirname / f"{self.outname}.xmf"
-        iteration_str = f"ite_{iteration:0{self.ite_nzeros}d}"
 
-        # Détermine les bornes (avec ou sans ghost cells)
-        j0, jN = self.jbeg, self.jend
-        i0, iN = self.ibeg, self.iend
-        if self.write_ghost_cells:
-            j0, jN = 0, self.Nty
-            i0, iN = 0, self.Ntx
-
-        # Dimensions pour XDMF
-        fNy, fNx = jN - j0, iN - i0
-        gNy, gNx = fNy + 1, fNx + 1
-
-        # Coordonnées (sommets)
-        x_coords = np.zeros(gNx * gNy)
-        y_coords = np.zeros(gNx * gNy)
-        idx = 0
-        for j in range(j0, jN + 1):
-            for i in range(i0, iN + 1):
-                x_coords[idx] = (i - self.ibeg) * self.dx + self.xmin
-                y_coords[idx] = (j - self.jbeg) * self.dy + self.ymin
-                idx += 1
-
-        # Ouverture du fichier HDF5
-        mode = "w" if iteration == 0 else "r+"
-        with h5py.File(h5_filename, mode) as f:
-            if iteration == 0:
-                # Attributs globaux (première itération)
-                f.attrs["Nx"] = self.Nx
-                f.attrs["Ny"] = self.Ny
-                f.attrs["Ntx"] = self.Ntx
-                f.attrs["Nty"] = self.Nty
-                f.attrs["problem"] = getattr(params, 'problem_name', 'unknown')
-                f.create_dataset("x", data=x_coords)
-                f.create_dataset("y", data=y_coords)
-
-                # Header XMF
-                with open(xmf_filename, "w") as xdmf_fd:
-                    xdmf_fd.write(f'''<?xml version="1.0" ?>
+        with open(xmf_filename, "w") as xdmf_fd:
+            xdmf_fd.write(f'''<?xml version="1.0" ?>
 <!DOCTYPE Xdmf SYSTEM "Xdmf.dtd" [
 <!ENTITY file "{h5_filename.name}:">
-<!ENTITY fdim "{fNy} {fNx}">
-<!ENTITY gdim "{gNy} {gNx}">
+<!ENTITY fdim "{self.fNy} {self.fNx}">
+<!ENTITY gdim "{self.gNy} {self.gNx}">
+<!ENTITY tdim "{len(times)} {self.fNy} {self.fNx}">
 <!ENTITY GridEntity '
 <Topology TopologyType="2DSMesh" Dimensions="&gdim;"/>
 <Geometry GeometryType="X_Y">
@@ -272,141 +429,218 @@ class IOManager:
 <Domain>
   <Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">
 ''')
-
-            # Groupe pour cette itération
-            ite_group = f.create_group(iteration_str)
-            ite_group.attrs["time"] = t
-            ite_group.attrs["iteration"] = iteration
-
-            # Extraction des champs
-            trho = np.zeros(fNy * fNx)
-            tu = np.zeros(fNy * fNx)
-            tv = np.zeros(fNy * fNx)
-            tprs = np.zeros(fNy * fNx)
-            idx = 0
-            for j in range(j0, jN):
-                for i in range(i0, iN):
-                    trho[idx] = Q[i, j, IR]
-                    tu[idx] = Q[i, j, IU]
-                    tv[idx] = Q[i, j, IV]
-                    tprs[idx] = Q[i, j, IP]
-                    idx += 1
-
-            ite_group.create_dataset("rho", data=trho)
-            ite_group.create_dataset("u", data=tu)
-            ite_group.create_dataset("v", data=tv)
-            ite_group.create_dataset("prs", data=tprs)
-
-            # Champs MHD
-            # if self.MHD:
-            tw = np.zeros(fNy * fNx)
-            tbx = np.zeros(fNy * fNx)
-            tby = np.zeros(fNy * fNx)
-            tbz = np.zeros(fNy * fNx)
-            tpsi = np.zeros(fNy * fNx)
-            idx = 0
-            for j in range(j0, jN):
-                for i in range(i0, iN):
-                    tw[idx] = Q[i, j, IW]
-                    tbx[idx] = Q[i, j, IBX]
-                    tby[idx] = Q[i, j, IBY]
-                    tbz[idx] = Q[i, j, IBZ]
-                    tpsi[idx] = Q[i, j, IPSI]
-                    idx += 1
-            ite_group.create_dataset("w", data=tw)
-            ite_group.create_dataset("bx", data=tbx)
-            ite_group.create_dataset("by", data=tby)
-            ite_group.create_dataset("bz", data=tbz)
-            ite_group.create_dataset("psi", data=tpsi)
-
-            # Mise à jour du XMF
-            with open(xmf_filename, "a") as xdmf_fd:
+            for n, (t, iteration) in enumerate(zip(times, iterations)):
                 xdmf_fd.write(f'''
-    <Grid Name="{iteration_str}" GridType="Uniform">
+    <Grid Name="ite_{iteration:0{self.ite_nzeros}d}" GridType="Uniform">
       <Time Value="{t}" />
       &GridEntity;
 ''')
-
-                # Champs scalaires
-                for field in ["rho", "prs"]:
-                    xdmf_fd.write(f'''
-      <Attribute Name="{field}" AttributeType="Scalar" Center="Cell">
-        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/{field}</DataItem>
-      </Attribute>
-''')
-
-                # Champs vectoriels
-                if not self.MHD:
-                    xdmf_fd.write(f'''
-      <Attribute Name="velocity" AttributeType="Vector" Center="Cell">
-        <DataItem Dimensions="&fdim; 2" ItemType="Function" Function="JOIN($0, $1)">
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/u</DataItem>
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/v</DataItem>
-        </DataItem>
-      </Attribute>
-''')
-                else:
-                    xdmf_fd.write(f'''
-      <Attribute Name="velocity" AttributeType="Vector" Center="Cell">
-        <DataItem Dimensions="&fdim; 3" ItemType="Function" Function="JOIN($0, $1, $2)">
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/u</DataItem>
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/v</DataItem>
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/w</DataItem>
-        </DataItem>
-      </Attribute>
-      <Attribute Name="magnetic" AttributeType="Vector" Center="Cell">
-        <DataItem Dimensions="&fdim; 3" ItemType="Function" Function="JOIN($0, $1, $2)">
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/bx</DataItem>
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/by</DataItem>
-          <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/bz</DataItem>
-        </DataItem>
-      </Attribute>
-      <Attribute Name="psi" AttributeType="Scalar" Center="Cell">
-        <DataItem Dimensions="&fdim;" NumberType="Float" Precision="8" Format="HDF">&file;/{iteration_str}/psi</DataItem>
-      </Attribute>
-''')
-
+                xdmf_fd.write(self._xmf_attributes("", step=n))
                 xdmf_fd.write('''
-      </Grid>
+    </Grid>
 ''')
 
-            # Footer XMF (à ajouter à la fin de la simulation)
-            if iteration == 0:
-                xdmf_fd.write('''
+            xdmf_fd.write('''
   </Grid>
 </Domain>
 </Xdmf>
 ''')
 
+    def _npy_meta(self) -> dict[str, Any]:
+        """Métadonnées JSON des sorties .npy : grille, champs et disposition des tableaux."""
+        return dict(
+            self.grid_attrs(),
+            fields=list(self.fields),
+            fNy=self.fNy,
+            fNx=self.fNx,
+            dtype=np.dtype(self.dtype).name,
+            i0=self.i0,
+            j0=self.j0,
+            coarsen=self.coarsen,
+        )
+
+    def _save_npy_multiple(self, block: Array, iteration: int, t: float) -> None:
+        """Sauvegarde la solution dans ite_XXXX.npy, de forme (nfields, fNy, fNx), et ite_XXXX.json."""
+        iteration_str = f"ite_{iteration:0{self.ite_nzeros}d}"
+        shape = (len(self.fields), self.fNy, self.fNx)
+        views = self.region_views(block).values()
+        npyio.write_snapshot(self.dirname / f"{iteration_str}.npy", views, shape, self.dtype)
+        npyio.write_json(self.dirname / f"{iteration_str}.json", dict(self._npy_meta(), time=t, iteration=iteration))
+
+    def _save_npy_unique(self, block: Array, iteration: int, t: float) -> None:
+        """Ajoute la solution au fichier <outname>.npy, préalloué pour toutes les sorties prévues."""
+        if self._npy is None:
+            # Sorties régulières entre 0 et tend, plus la sortie finale
+            capacity = math.ceil(self.params.tend / self.save_freq) + 2 if self.save_freq > 0 else 2
+            self._npy = npyio.NpySeries(
+                self.dirname / f"{self.outname}.npy", self._npy_meta(), capacity, self.dtype, self.resume_iteration
+            )
+        self._npy.append(self.region_views(block).values(), t, iteration)
+
+    def _dataset_options(self, params: Params) -> dict:
+        """Options de create_dataset pour les champs (chunks, filtres HDF5)."""
+        options: dict = {}
+        if params.output_chunks > 0:
+            options["chunks"] = (min(params.output_chunks, self.fNy), min(params.output_chunks, self.fNx))
+        match (params.output_compression.lower()):
+            case "none" | "":
+                return options
+            case "gzip":
+                options["compression"] = "gzip"
+                options["compression_opts"] = params.output_compression_level
+            case "lzf":
+                options["compression"] = "lzf"
+            case _:
+                raise ValueError(f"Unknown output compression: {params.output_compression}")
+        # Le filtre shuffle regroupe les octets de même poids et améliore la compression
+        options["shuffle"] = params.output_shuffle
+        return options
+
+    def _xmf_attributes(self, path: str, step: Optional[int] = None) -> str:
+        """
+        Attributs XMF des champs écrits, avec la précision des datasets.
+
+        path est le chemin HDF5 du groupe contenant les champs ("" pour la racine).
+        Si step est donné, les champs sont des séries temporelles (nt, fNy, fNx)
+        dont on lit le pas step par un hyperslab.
+        Les composantes de vitesse et de champ magnétique sont regroupées en un
+        vecteur lorsqu'elles sont toutes écrites, les autres champs sont scalaires.
+        """
+        def item(name: str) -> str:
+            if step is None:
+                return (f'<DataItem Dimensions="&fdim;" NumberType="Float" Precision="{self.precision}" '
+                        f'Format="HDF">&file;{path}/{name}</DataItem>')
+            return (f'<DataItem ItemType="HyperSlab" Dimensions="&fdim;">'
+                    f'<DataItem Dimensions="3 3" Format="XML">{step} 0 0 1 1 1 1 {self.fNy} {self.fNx}</DataItem>'
+                    f'<DataItem Dimensions="&tdim;" NumberType="Float" Precision="{self.precision}" '
+                    f'Format="HDF">&file;{path}/{name}</DataItem></DataItem>')
+
+        vectors = {"velocity": ["u", "v"]}
+        if self.MHD:
+            vectors = {"velocity": ["u", "v", "w"], "magnetic": ["bx", "by", "bz"]}
+        vectors = {name: comps for name, comps in vectors.items() if all(c in self.fields for c in comps)}
+        in_vectors = {c for comps in vectors.values() for c in comps}
+
+        xml = ""
+        for name in self.fields:
+            if name not in in_vectors:
+                xml += f'''
+      <Attribute Name="{name}" AttributeType="Scalar" Center="Cell">
+        {item(name)}
+      </Attribute>
+'''
+        for name, comps in vectors.items():
+            join = ", ".join(f"${n}" for n in range(len(comps)))
+            xml += f'''
+      <Attribute Name="{name}" AttributeType="Vector" Center="Cell">
+        <DataItem Dimensions="&fdim; {len(comps)}" ItemType="Function" Function="JOIN({join})">
+'''
+            xml += "".join(f"          {item(c)}\n" for c in comps)
+            xml += '''        </DataItem>
+      </Attribute>
+'''
+        return xml
+
+    def field_views(self, Q: Array) -> dict[str, Array]:
+        """
+        Vues transposées des champs de Q à écrire, sans copie (sauf moyenne par blocs).
+
+        Q est indexé (i, j) ; les vues sont de forme (fNy, fNx), l'ordre des
+        dimensions attendu par le fichier XMF (fdim).
+        """
+        return self.region_views(Q[self.i0 : self.iN, self.j0 : self.jN])
+
+    def region_views(self, block: Array) -> dict[str, Array]:
+        """Comme field_views, à partir de la zone écrite block = Q[i0:iN, j0:jN]."""
+        c = self.coarsen
+        if c == 1:
+            return {name: block[..., ivar].T for name, ivar in self.fields.items()}
+        blocks = (self.fNx, c, self.fNy, c)
+        return {name: block[..., ivar].reshape(blocks).mean(axis=(1, 3)).T for name, ivar in self.fields.items()}
+
+    def _write_fields(self, group: "h5py.Group", block: Array) -> None:
+        """Écrit chaque champ de la zone block de Q comme un dataset 2D du groupe HDF5."""
+        for name, view in self.region_views(block).items():
+            group.create_dataset(name, data=view, dtype=self.dtype, **self.dataset_options)
+
+    def save_checkpoint(
+        self,
+        Q: Array,
+        U: Array,
+        t: float,
+        step: int,
+        streams: dict[str, StreamState],
+        dt_next: Optional[float] = None,
+    ) -> Path:
+        """
+        Écrit un point de reprise : Q et U complets (cellules fantômes comprises)
+        en double précision, et l'état de la boucle en temps et des flux de sortie.
+
+        Le fichier est écrit sous un nom temporaire puis renommé, de sorte qu'un
+        arrêt pendant l'écriture ne laisse jamais de point de reprise incomplet.
+
+        Returns:
+        Path: Le fichier checkpoint_<step>.h5 écrit dans le dossier de sortie.
+        """
+        filename = self.dirname / f"checkpoint_{step:0{self.ite_nzeros}d}.h5"
+        tmp_filename = filename.with_name(filename.name + ".tmp")
+        import h5py
+
+        with h5py.File(tmp_filename, "w") as f:
+            f.attrs["time"] = t
+            f.attrs["step"] = step
+            # {nom: [iteration, next_save]} ; json relit les flottants à l'identique
+            f.attrs["streams"] = json.dumps({name: [s.iteration, s.next_save] for name, s in streams.items()})
+            f.attrs["dt_next"] = np.nan if dt_next is None else dt_next
+            f.attrs["problem"] = self.params.problem_name
+            # Datasets contigus, relus d'un bloc dans les tableaux du calcul
+            f.create_dataset("Q", data=Q, dtype=np.float64)
+            f.create_dataset("U", data=U, dtype=np.float64)
+        os.replace(tmp_filename, filename)
+        return filename
+
+    def load_checkpoint(self, filename: str | Path, Q: Array, U: Array) -> RestartInfo:
+        """
+        Relit un point de reprise directement dans les tableaux Q et U préalloués.
+
+        Returns:
+        RestartInfo: Le temps, le nombre de pas effectués, le pas de temps de
+            Riemann à utiliser ensuite et l'état des flux de sortie.
+        """
+        filename = Path(filename)
+        if not filename.exists():
+            raise FileNotFoundError(f"Fichier {filename} introuvable.")
+
+        import h5py
+
+        with h5py.File(filename, "r") as f:
+            for name, A in (("Q", Q), ("U", U)):
+                if f[name].shape != A.shape:
+                    raise ValueError(f"Checkpoint {name} has shape {f[name].shape}, expected {A.shape}")
+                f[name].read_direct(A)
+            dt_next = float(f.attrs["dt_next"])
+            streams = json.loads(f.attrs["streams"])
+            return RestartInfo(
+                time=float(f.attrs["time"]),
+                step=int(f.attrs["step"]),
+                dt_next=None if np.isnan(dt_next) else dt_next,
+                streams={name: StreamState(int(ite), float(nxt)) for name, (ite, nxt) in streams.items()},
+            )
+
     def load_solution(self, iteration: int) -> Dict[str, np.ndarray]:
-        """Charge une solution sauvegardée."""
-        if getattr(params, 'multiple_outputs', False):
-            h5_filename = self.dirname / f"ite_{iteration:0{self.ite_nzeros}d}.h5"
-        else:
-            h5_filename = self.dirname / f"{self.outname}.h5"
-
-        if not h5_filename.exists():
-            raise FileNotFoundError(f"Fichier {h5_filename} introuvable.")
-
-        data = {}
-        with h5py.File(h5_filename, "r") as f:
-            if getattr(params, 'multiple_outputs', False):
-                group = "/"
-            else:
-                group = f"ite_{iteration:0{self.ite_nzeros}d}/"
-
-            # Chargement des champs
-            for field in ["rho", "u", "v", "prs"]:
-                data[field] = f[f"{group}{field}"][:]
-
-            if self.MHD:
-                for field in ["w", "bx", "by", "bz", "psi"]:
-                    data[field] = f[f"{group}{field}"][:]
-
-            # Chargement des attributs
-            if getattr(params, 'multiple_outputs', False):
-                data["time"] = f.attrs["time"]
-            else:
-                data["time"] = f[f"{group}"].attrs["time"]
+        """
+        Charge entièrement une solution sauvegardée, quel que soit son format.
 
+        Pour parcourir ou découper de nombreuses sorties sans tout charger,
+        voir reader.SnapshotReader.
+        """
+        from src.reader import SnapshotReader
+
+        with SnapshotReader(self.dirname, self.outname) as run:
+            steps = np.flatnonzero(run.iterations == iteration)
+            if steps.size == 0:
+                raise KeyError(f"Itération {iteration} absente de {self.dirname}.")
+            snapshot = run[int(steps[0])]
+            data: Dict[str, Any] = {field: np.array(snapshot[field]) for field in self.fields}
+            data["time"] = snapshot.time
         return data
@@ -0,0 +1,52 @@
+"""Module containing all slope limiters.
+
+Chaque limiteur prend les différences à gauche dL et à droite dR (tableaux de
+même forme) et renvoie la pente limitée, nulle aux extrema locaux.
+"""
+
+from typing import Callable
+import numpy as np
+from src.pycfd_types import Array
+
+Limiter = Callable[[Array, Array], Array]
+
+
+def minmod(dL: Array, dR: Array) -> Array:
+    return np.where(dL * dR > 0.0, np.where(np.abs(dL) < np.abs(dR), dL, dR), 0.0)
+
+
+def monotonized_central(dL: Array, dR: Array) -> Array:
+    slope = np.minimum(np.minimum(2.0 * np.abs(dL), 2.0 * np.abs(dR)), 0.5 * np.abs(dL + dR))
+    return np.where(dL * dR > 0.0, np.sign(dL) * slope, 0.0)
+
+
+def van_leer(dL: Array, dR: Array) -> Array:
+    prod: Array = dL * dR
+    return np.divide(2.0 * prod, dL + dR, out=np.zeros_like(prod), where=prod > 0.0)
+
+
+def superbee(dL: Array, dR: Array) -> Array:
+    aL: Array = np.abs(dL)
+    aR: Array = np.abs(dR)
+    slope = np.maximum(np.minimum(2.0 * aL, aR), np.minimum(aL, 2.0 * aR))
+    return np.where(dL * dR > 0.0, np.sign(dL) * slope, 0.0)
+
+
+limiters: dict[str, Limiter] = {
+    "MINMOD": minmod,
+    "MC": monotonized_central,
+    "VANLEER": van_leer,
+    "SUPERBEE": superbee,
+}
+
+
+def get_limiter(reconstruction: str) -> Limiter:
+    """
+    Limiteur associé à un schéma de reconstruction.
+
+    "PLM" utilise minmod, "PLM_<NOM>" le limiteur <NOM> (MINMOD, MC, VANLEER
+    ou SUPERBEE).
+    """
+    name = reconstruction.upper().removeprefix("PLM").removeprefix("_") or "MINMOD"
+    assert name in limiters, f"The slope limiter {name} is not available."
+    return limiters[name]
@@ -0,0 +1,108 @@
+"""
+Format de sortie brut : fichiers .npy et métadonnées JSON.
+
+Sans h5py ni XDMF, chaque sortie est un tableau (nfields, fNy, fNx) écrit
+avec np.lib.format, relisible par np.load(..., mmap_mode="r"), accompagné
+d'un fichier JSON (temps, itération, champs, grille). En sortie unique, un
+seul fichier <outname>.npy de forme (capacité, nfields, fNy, fNx) est
+préalloué et rempli par memmap ; son JSON indique le nombre de sorties
+valides (nsnap).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+import numpy as np
+from src.pycfd_types import Array
+
+
+def write_json(filename: Path, meta: dict[str, Any]) -> None:
+    """Écrit les métadonnées sous un nom temporaire puis renomme le fichier."""
+    tmp_filename = filename.with_name(filename.name + ".tmp")
+    with open(tmp_filename, "w") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp_filename, filename)
+
+
+def read_json(filename: Path) -> dict[str, Any]:
+    with open(filename) as f:
+        return json.load(f)
+
+
+def write_snapshot(filename: Path, views: Iterable[Array], shape: tuple[int, ...], dtype: type) -> None:
+    """Écrit les champs (vues 2D) dans un fichier .npy de forme shape, sans tableau intermédiaire."""
+    out = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=shape)
+    for k, view in enumerate(views):
+        out[k] = view
+    out.flush()
+    del out
+
+
+class NpySeries:
+    """
+    Fichier .npy unique d'une simulation, de forme (capacité, nfields, fNy, fNx).
+
+    Le fichier est préalloué pour capacity sorties et ouvert en memmap ; s'il
+    est plein, sa capacité est doublée (copie dans un nouveau fichier).
+
+    Si resume > 0 (reprise d'un calcul) et que le fichier existe avec la même
+    disposition, il est rouvert et ses sorties jusqu'à l'itération resume sont
+    conservées ; les suivantes sont oubliées (nsnap et JSON).
+    """
+
+    def __init__(self, filename: Path, meta: dict[str, Any], capacity: int, dtype: type, resume: int = 0) -> None:
+        self.filename = filename
+        self.json_filename = filename.with_suffix(".json")
+        self.meta = dict(meta, nsnap=0, time=[], iteration=[])
+        self.dtype = dtype
+        self.frame: tuple[int, int, int] = (len(meta["fields"]), meta["fNy"], meta["fNx"])
+        if resume > 0 and self._reopen(resume):
+            return
+        self.data: np.memmap = np.lib.format.open_memmap(
+            filename, mode="w+", dtype=dtype, shape=(max(capacity, 1),) + self.frame
+        )
+
+    def _reopen(self, resume: int) -> bool:
+        """Rouvre le fichier existant, tronqué après l'itération resume ; False s'il ne convient pas."""
+        if not (self.filename.exists() and self.json_filename.exists()):
+            return False
+        old = read_json(self.json_filename)
+        data = np.load(self.filename, mmap_mode="r+")
+        if data.shape[1:] != self.frame or data.dtype != self.dtype or old.get("fields") != self.meta["fields"]:
+            del data
+            return False
+        n = sum(1 for iteration in old["iteration"][: old["nsnap"]] if iteration <= resume)
+        self.meta.update(nsnap=n, time=old["time"][:n], iteration=old["iteration"][:n])
+        self.data = data
+        write_json(self.json_filename, self.meta)
+        return True
+
+    def append(self, views: Iterable[Array], t: float, iteration: int) -> None:
+        n: int = self.meta["nsnap"]
+        if n == self.data.shape[0]:
+            self._grow()
+        for k, view in enumerate(views):
+            self.data[n, k] = view
+        self.data.flush()
+
+        self.meta["nsnap"] = n + 1
+        self.meta["time"].append(float(t))
+        self.meta["iteration"].append(int(iteration))
+        write_json(self.json_filename, self.meta)
+
+    def _grow(self) -> None:
+        old = self.data
+        tmp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        shape = (2 * old.shape[0],) + self.frame
+        new = np.lib.format.open_memmap(tmp_filename, mode="w+", dtype=self.dtype, shape=shape)
+        new[: old.shape[0]] = old
+        new.flush()
+        del old, new
+        self.data = None  # type: ignore[assignment]  # libère le memmap avant de remplacer le fichier
+        os.replace(tmp_filename, self.filename)
+        self.data = np.load(self.filename, mmap_mode="r+")
+
+    def close(self) -> None:
+        self.data.flush()
+        self.data = None  # type: ignore[assignment]
@@ -0,0 +1,234 @@
+"""
+Noyaux compilés par Numba (backend "numba", voir backends.py).
+
+Ce sont les fonctions par cellule du code d'origine (cell_primToCons,
+cell_consToPrim, cell_timestep, hll, fivewaves), écrites sur des scalaires
+et compilées par numba.njit. Les boucles sur les cellules (ou les interfaces)
+sont parallélisées par prange sur le premier axe. Les formules et l'ordre des
+opérations sont ceux des versions tableau : les résultats sont égaux à
+l'arrondi près.
+
+Ce module importe numba : il n'est importé que si ce backend est choisi.
+"""
+
+import numpy as np
+from numba import njit, prange
+from src.varindexes import IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI
+
+# Solveurs de Riemann, pour riemann()
+HLL, FIVEWAVES = 0, 1
+
+# Division par zéro et racines de nombres négatifs : inf et nan, comme NumPy
+jit = njit(cache=True, error_model="numpy")
+jit_parallel = njit(cache=True, error_model="numpy", parallel=True)
+
+
+@jit
+def cell_primToCons(q, u, gamma, mhd):
+    rho = q[IR]
+    u[IR] = rho
+    u[IU] = q[IU] * rho
+    u[IV] = q[IV] * rho
+    u[IW] = q[IW] * rho
+    Ek = rho * 0.5 * (q[IU] ** 2 + q[IV] ** 2 + q[IW] ** 2)
+    Emag = 0.0
+    Epsi = 0.0
+    if mhd:
+        for k in range(IBX, IPSI + 1):
+            u[k] = q[k]
+        Emag = 0.5 * (q[IBX] ** 2 + q[IBY] ** 2 + q[IBZ] ** 2)
+        Epsi = 0.5 * q[IPSI] ** 2
+    u[IE] = q[IP] / (gamma - 1) + Ek + Emag + Epsi
+
+
+@jit
+def cell_consToPrim(u, q, gamma, mhd):
+    rho = u[IR]
+    q[IR] = rho
+    q[IU] = u[IU] / rho
+    q[IV] = u[IV] / rho
+    q[IW] = u[IW] / rho
+    Ek = rho * 0.5 * (q[IU] ** 2 + q[IV] ** 2 + q[IW] ** 2)
+    Emag = 0.0
+    Epsi = 0.0
+    if mhd:
+        for k in range(IBX, IPSI + 1):
+            q[k] = u[k]
+        Emag = 0.5 * (q[IBX] ** 2 + q[IBY] ** 2 + q[IBZ] ** 2)
+        Epsi = 0.5 * q[IPSI] ** 2
+    q[IP] = (u[IE] - Ek - Emag - Epsi) * (gamma - 1)
+
+
+@jit
+def fast_magnetosonic_speed(rho, B2, Bn, cs):
+    c02 = cs * cs
+    ca2 = B2 / rho
+    cap2 = Bn * Bn / rho
+    return np.sqrt(0.5 * (c02 + ca2) + 0.5 * np.sqrt((c02 + ca2) * (c02 + ca2) - 4.0 * c02 * cap2))
+
+
+@jit
+def cell_timestep(q, gamma, dx, dy, mhd):
+    cs = np.sqrt(gamma * q[IP] / q[IR])
+    abs_u = abs(q[IU])
+    abs_v = abs(q[IV])
+    inv_dt = (cs + abs_u) / dx + (cs + abs_v) / dy
+    if mhd:
+        B2 = q[IBX] * q[IBX] + q[IBY] * q[IBY] + q[IBZ] * q[IBZ]
+        cf_x = fast_magnetosonic_speed(q[IR], B2, q[IBX], cs)
+        cf_y = fast_magnetosonic_speed(q[IR], B2, q[IBY], cs)
+        inv_dt = max((cf_x + abs_u) / dx + (cf_y + abs_v) / dy, inv_dt)
+    return inv_dt
+
+
+@jit
+def computeFlux(q, f, gamma):
+    Ek = 0.5 * q[IR] * (q[IU] * q[IU] + q[IV] * q[IV])
+    E = q[IP] / (gamma - 1.0) + Ek
+    f[:] = 0.0
+    f[IR] = q[IR] * q[IU]
+    f[IU] = q[IR] * q[IU] * q[IU] + q[IP]
+    f[IV] = q[IR] * q[IU] * q[IV]
+    f[IE] = (q[IP] + E) * q[IU]
+
+
+@jit
+def hll(qL, qR, flux, FL, FR, uL, uR, gamma, mhd):
+    """Flux HLL d'une interface ; renvoie la vitesse maximale des ondes. FL, FR, uL, uR : tampons."""
+    aL = np.sqrt(gamma * qL[IP] / qL[IR])
+    aR = np.sqrt(gamma * qR[IP] / qR[IR])
+
+    # Davis' estimates for the signal speed
+    SL = min(qL[IU] - aL, qR[IU] - aR)
+    SR = max(qL[IU] + aL, qR[IU] + aR)
+
+    computeFlux(qL, FL, gamma)
+    computeFlux(qR, FR, gamma)
+    if SL >= 0.0:
+        flux[:] = FL
+    elif SR <= 0.0:
+        flux[:] = FR
+    else:
+        cell_primToCons(qL, uL, gamma, mhd)
+        cell_primToCons(qR, uR, gamma, mhd)
+        for k in range(flux.shape[0]):
+            flux[k] = (SR * FL[k] - SL * FR[k] + SL * SR * (uR[k] - uL[k])) / (SR - SL)
+    return max(abs(SL), abs(SR))
+
+
+@jit
+def fivewaves(qL, qR, flux, u, gamma, epsilon):
+    """Flux 5 ondes d'une interface ; renvoie la vitesse maximale des ondes. u : tampon."""
+    B2L = qL[IBX] * qL[IBX] + qL[IBY] * qL[IBY] + qL[IBZ] * qL[IBZ]
+    B2R = qR[IBX] * qR[IBX] + qR[IBY] * qR[IBY] + qR[IBZ] * qR[IBZ]
+    pL0 = -qL[IBX] * qL[IBX] + qL[IP] + B2L / 2
+    pL1 = -qL[IBX] * qL[IBY]
+    pL2 = -qL[IBX] * qL[IBZ]
+    pR0 = -qR[IBX] * qR[IBX] + qR[IP] + B2R / 2
+    pR1 = -qR[IBX] * qR[IBY]
+    pR2 = -qR[IBX] * qR[IBZ]
+
+    # 1. Compute speeds
+    csL = np.sqrt(gamma * qL[IP] / qL[IR])
+    csR = np.sqrt(gamma * qR[IP] / qR[IR])
+    caL = np.sqrt(qL[IR] * (qL[IBX] * qL[IBX] + B2L / 2)) + epsilon
+    caR = np.sqrt(qR[IR] * (qR[IBX] * qR[IBX] + B2R / 2)) + epsilon
+    cbL = np.sqrt(qL[IR] * (qL[IR] * csL * csL + qL[IBY] * qL[IBY] + qL[IBZ] * qL[IBZ] + B2L / 2))
+    cbR = np.sqrt(qR[IR] * (qR[IR] * csR * csR + qR[IBY] * qR[IBY] + qR[IBZ] * qR[IBZ] + B2R / 2))
+
+    # Using 3-wave if hyperbolicity is lost (from Dyablo)
+    if (
+        qL[IBX] * qR[IBX] < -epsilon
+        or qL[IBY] * qR[IBY] < -epsilon
+        or qL[IBZ] * qR[IBZ] < -epsilon
+    ):
+        clocL = qL[IR] * fast_magnetosonic_speed(qL[IR], B2L, qL[IBX], csL)
+        clocR = qR[IR] * fast_magnetosonic_speed(qR[IR], B2R, qR[IBX], csR)
+        c = max(clocL, clocR)
+        caL = c
+        caR = c
+        cbL = c
+        cbR = c
+
+    # 2. Compute star zone
+    uS = (cbL * qL[IU] + cbR * qR[IU] + pL0 - pR0) / (cbL + cbR)
+    vS = (caL * qL[IV] + caR * qR[IV] + pL1 - pR1) / (caL + caR)
+    wS = (caL * qL[IW] + caR * qR[IW] + pL2 - pR2) / (caL + caR)
+    P0 = (cbR * pL0 + cbL * pR0 + cbL * cbR * (qL[IU] - qR[IU])) / (cbL + cbR)
+    P1 = (caR * pL1 + caL * pR1 + caL * caR * (qL[IV] - qR[IV])) / (caL + caR)
+    P2 = (caR * pL2 + caL * pR2 + caL * caR * (qL[IW] - qR[IW])) / (caL + caR)
+
+    # État amont q, sans variable commune à qL et qR (leurs types peuvent différer)
+    if uS > 0.0:
+        rho, un, p, bx, by, bz = qL[IR], qL[IU], qL[IP], qL[IBX], qL[IBY], qL[IBZ]
+        Bstar = qR[IBX]
+        cell_primToCons(qL, u, gamma, True)
+    else:
+        rho, un, p, bx, by, bz = qR[IR], qR[IU], qR[IP], qR[IBX], qR[IBY], qR[IBZ]
+        Bstar = qL[IBX]
+        cell_primToCons(qR, u, gamma, True)
+
+    beta_min = 1.0e-3
+    alfven_max = 10.0
+    B2 = bx * bx + by * by + bz * bz
+    beta = p / (0.5 * B2)
+    alfven_number = np.sqrt(rho * un / B2)
+    Bn = bx if (beta < beta_min or alfven_number > alfven_max) else Bstar
+
+    # 3. Commpute flux
+    flux[IR] = u[IR] * uS
+    flux[IU] = u[IU] * uS + P0
+    flux[IV] = u[IV] * uS + P1
+    flux[IW] = u[IW] * uS + P2
+    flux[IE] = u[IE] * uS + P0 * uS + P1 * vS + P2 * wS
+    flux[IBX] = u[IBX] * uS - Bn * uS
+    flux[IBY] = u[IBY] * uS - Bn * vS
+    flux[IBZ] = u[IBZ] * uS - Bn * wS
+    flux[IPSI] = 0.0
+
+    # Les c sont des impédances (rho * c) : on repasse en vitesses eulériennes
+    sL = abs(qL[IU] - max(cbL, caL) / qL[IR])
+    sR = abs(qR[IU] + max(cbR, caR) / qR[IR])
+    return max(max(sL, sR), abs(uS))
+
+
+@jit_parallel
+def primToCons(Q, U, ibeg, iend, jbeg, jend, gamma, mhd):
+    for i in prange(ibeg, iend):
+        for j in range(jbeg, jend):
+            cell_primToCons(Q[i, j], U[i, j], gamma, mhd)
+
+
+@jit_parallel
+def consToPrim(U, Q, ibeg, iend, jbeg, jend, gamma, mhd):
+    for i in prange(ibeg, iend):
+        for j in range(jbeg, jend):
+            cell_consToPrim(U[i, j], Q[i, j], gamma, mhd)
+
+
+@jit_parallel
+def max_inv_dt(Q, ibeg, iend, jbeg, jend, gamma, dx, dy, mhd):
+    # Maximum par ligne, puis sur les lignes : pas de réduction entre threads
+    rows = np.empty(iend - ibeg)
+    for i in prange(ibeg, iend):
+        m = 0.0
+        for j in range(jbeg, jend):
+            m = max(m, cell_timestep(Q[i, j], gamma, dx, dy, mhd))
+        rows[i - ibeg] = m
+    return rows.max()
+
+
+@jit_parallel
+def riemann(qL, qR, flux, smax, solver, gamma, epsilon, mhd):
+    n1, n2, nfields = qL.shape
+    for i in prange(n1):
+        # Tampons propres à chaque ligne (donc à chaque thread)
+        FL = np.empty(nfields)
+        FR = np.empty(nfields)
+        uL = np.empty(nfields)
+        uR = np.empty(nfields)
+        for j in range(n2):
+            if solver == HLL:
+                smax[i, j] = hll(qL[i, j], qR[i, j], flux[i, j], FL, FR, uL, uR, gamma, mhd)
+            else:
+                smax[i, j] = fivewaves(qL[i, j], qR[i, j], flux[i, j], uL, gamma, epsilon)
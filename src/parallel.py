@@ -0,0 +1,361 @@
+"""
+Décomposition de domaine en mémoire partagée, sur plusieurs processus.
+
+Le domaine (Nx, Ny) est découpé en px x py tuiles, une par processus de
+calcul. Q et U sont alloués dans des blocs multiprocessing.shared_memory
+visibles par tous les processus ; chaque processus travaille sur une copie
+locale de sa tuile, entourée d'un halo de Nghosts cellules.
+
+Avant chaque étape de la mise à jour, chaque processus publie l'intérieur de
+sa tuile dans Q partagé, puis remplit son halo à partir des tuiles voisines
+(avec la périodicité du domaine) ; les bords physiques non périodiques sont
+ensuite remplis comme dans fillBoundaries. Le pas de temps est le minimum
+global des pas de temps des tuiles, renvoyés au processus principal.
+
+Le processus principal pilote le calcul (ParallelSolver.compute_dt,
+ParallelSolver.update) et garde la main sur les sorties : après chaque pas,
+la solution sur tout le domaine est recopiée dans ses tableaux Q et U.
+
+Les performances en strong scaling sont mesurées par :
+
+    python -m src.parallel setups/orszag_tang.ini 1 2 4 8
+"""
+
+import multiprocessing as mp
+import sys
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+import numpy as np
+from src.backends import get_backend
+from src.boundaries import fill_ghost_layer, fillBoundaries
+from src.params import Params, readInifile
+from src.pycfd_types import Array, IDir, real_t
+from src.tiles import Tile, grid_tiles, split, tile_params
+from src.states import primToCons
+from src.update import cons_to_prim, update
+from src.workspace import Workspace
+
+# Commandes envoyées aux processus de calcul
+CMD_STOP, CMD_LOAD, CMD_DT, CMD_STEP = range(4)
+
+
+def process_grid(params: Params, nprocs: int) -> tuple[int, int]:
+    """Découpage (px, py) de nprocs processus minimisant la longueur des halos."""
+    grids = [(px, nprocs // px) for px in range(1, nprocs + 1) if nprocs % px == 0]
+    return min(grids, key=lambda g: params.Ny * g[0] + params.Nx * g[1])
+
+
+def decompose(params: Params, nprocs: int) -> list[Tile]:
+    """
+    Découpe le domaine en nprocs tuiles d'au moins Nghosts cellules de côté.
+
+    Les tuiles sont numérotées selon x puis y.
+    """
+    px, py = process_grid(params, nprocs)
+    nx, ny = split(params.Nx, px), split(params.Ny, py)
+    if min(nx + ny) < params.Nghosts:
+        raise ValueError(f"Tiles of {min(nx + ny)} cells are smaller than the {params.Nghosts} ghost cells")
+    return grid_tiles(params, nx, ny)
+
+
+class HaloExchange:
+    """
+    Remplissage du halo d'une tuile à partir de Q partagé.
+
+    S'utilise comme fillBoundaries (update(..., fill=exchange)). Tous les
+    processus doivent l'appeler ensemble : il contient deux barrières, l'une
+    après la publication des tuiles, l'autre après la lecture des halos.
+    """
+
+    def __init__(self, params: Params, tile: Tile, Qs: Array, barrier: Any) -> None:
+        self.params = params
+        self.tile = tile
+        self.Qs = Qs
+        self.barrier = barrier
+        ng = params.Nghosts
+
+        def wrap(beg: int, end: int, dbeg: int, n: int) -> Array:
+            # Indices périodiques dans [dbeg, dbeg + n[
+            return (np.arange(beg, end) - dbeg) % n + dbeg
+
+        # Halos selon x (lignes de la tuile), puis selon y (sur toute la largeur)
+        rows = wrap(tile.i0 - ng, tile.i1 + ng, params.ibeg, params.Nx)
+        cols = wrap(tile.j0 - ng, tile.j1 + ng, params.jbeg, params.Ny)
+        nx, ny = tile.i1 - tile.i0, tile.j1 - tile.j0
+        self.strips: list[tuple[tuple[slice, slice], tuple[Array, Array]]] = [
+            ((slice(0, ng), slice(ng, ng + ny)), np.ix_(rows[:ng], cols[ng : ng + ny])),
+            ((slice(ng + nx, None), slice(ng, ng + ny)), np.ix_(rows[ng + nx :], cols[ng : ng + ny])),
+            ((slice(None), slice(0, ng)), np.ix_(rows, cols[:ng])),
+            ((slice(None), slice(ng + ny, None)), np.ix_(rows, cols[ng + ny :])),
+        ]
+        # Bords physiques non périodiques de la tuile : (côté, condition, direction)
+        self.edges: list[tuple[bool, str, IDir]] = []
+        for lower, at_edge, bc in (
+            (True, tile.i0 == params.ibeg, params.boundary_xmin),
+            (False, tile.i1 == params.iend, params.boundary_xmax),
+        ):
+            if at_edge and bc != "BC_PERIODIC":
+                self.edges.append((lower, bc, IDir.IX))
+        for lower, at_edge, bc in (
+            (True, tile.j0 == params.jbeg, params.boundary_ymin),
+            (False, tile.j1 == params.jend, params.boundary_ymax),
+        ):
+            if at_edge and bc != "BC_PERIODIC":
+                self.edges.append((lower, bc, IDir.IY))
+
+    def publish(self, Qt: Array, tp: Params) -> None:
+        """Copie l'intérieur de la tuile locale Qt dans Q partagé."""
+        self.Qs[self.tile.region] = Qt[tp.slice_dom]
+
+    def __call__(self, Qt: Array, tp: Params) -> None:
+        self.publish(Qt, tp)
+        self.barrier.wait()
+        for local, shared in self.strips:
+            Qt[local] = self.Qs[shared]
+        self.barrier.wait()
+
+        # Mêmes conditions que fillBoundaries sur les bords du domaine
+        for lower, bc, idir in self.edges:
+            if idir == IDir.IX:
+                fill_ghost_layer(Qt[:, tp.jbeg : tp.jend], tp.ibeg, tp.iend, lower, bc, idir, tp)
+            else:
+                fill_ghost_layer(Qt.swapaxes(0, 1), tp.jbeg, tp.jend, lower, bc, idir, tp)
+
+
+def _attach(name: str) -> SharedMemory:
+    """Ouvre un bloc de mémoire partagée créé par le processus principal, sans le libérer à la sortie."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    shm = SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+def _worker(params: Params, tile: Tile, names: dict[str, str], conn: Connection, halo: Any) -> None:
+    """
+    Boucle d'un processus de calcul : exécute les commandes reçues du processus principal sur sa tuile.
+
+    En cas d'erreur le processus s'arrête ; le processus principal le voit et arrête les autres.
+    """
+    shms = {key: _attach(name) for key, name in names.items()}
+    try:
+        shape = (params.Ntx, params.Nty, params.Nfields)
+        Qs = np.ndarray(shape, dtype=real_t, buffer=shms["Q"].buf)
+        Us = np.ndarray(shape, dtype=real_t, buffer=shms["U"].buf)
+
+        tp = tile_params(params, tile)
+        Qt = np.zeros((tp.Ntx, tp.Nty, tp.Nfields), dtype=real_t)
+        Ut = np.zeros_like(Qt)
+        ws = Workspace(tp)
+        exchange = HaloExchange(params, tile, Qs, halo)
+        dom = tp.slice_dom
+        while True:
+            command, dt = conn.recv()
+            if command == CMD_STOP:
+                break
+            result = None
+            if command == CMD_LOAD:
+                Qt[dom] = Qs[tile.region]
+                Ut[dom] = Us[tile.region]
+            elif command == CMD_DT:
+                result = get_backend(tp.backend).max_inv_dt(Qt, tp)
+            elif command == CMD_STEP:
+                update(Qt, Ut, dt, tp, ws, exchange)
+                cons_to_prim(Ut, Qt, tp, ws)
+                exchange.publish(Qt, tp)
+                Us[tile.region] = Ut[dom]
+            conn.send(result)
+        ws.close()
+    finally:
+        conn.close()
+        for shm in shms.values():
+            shm.close()
+
+
+class ParallelSolver:
+    """
+    Pilote des processus de calcul, un par tuile.
+
+    S'utilise comme update.update sur les tableaux Q et U du processus
+    principal : load(Q, U) distribue la solution initiale (ou relue d'un point
+    de reprise) aux tuiles, puis update(Q, U, dt) avance toutes les tuiles et
+    recopie le domaine dans Q et U (pas leurs cellules fantômes, qui ne sont
+    remplies que dans les tuiles).
+
+    Parameters:
+    params (Params): Paramètres de la simulation.
+    nprocs (int): Nombre de processus de calcul (params.nprocs par défaut).
+    """
+
+    def __init__(self, params: Params, nprocs: Optional[int] = None) -> None:
+        if params.dt_from_riemann:
+            raise ValueError("dt_from_riemann is not supported by the parallel solver")
+        self.params = params
+        self.nprocs = nprocs or params.nprocs
+        self.px, self.py = process_grid(params, self.nprocs)
+        self.tiles = decompose(params, self.nprocs)
+
+        nbytes = params.Ntx * params.Nty * params.Nfields * np.dtype(real_t).itemsize
+        self._shms = {
+            "Q": SharedMemory(create=True, size=nbytes),
+            "U": SharedMemory(create=True, size=nbytes),
+        }
+        shape = (params.Ntx, params.Nty, params.Nfields)
+        self._Q: Array = np.ndarray(shape, dtype=real_t, buffer=self._shms["Q"].buf)
+        self._U: Array = np.ndarray(shape, dtype=real_t, buffer=self._shms["U"].buf)
+
+        # spawn : pas de copie des threads du processus principal (écritures asynchrones)
+        ctx = mp.get_context("spawn")
+        # Gardée ici : les processus fils la retrouvent par son nom
+        self._halo = ctx.Barrier(self.nprocs)
+        names = {key: shm.name for key, shm in self._shms.items()}
+        self._conns: list[Connection] = []
+        self._procs: list[BaseProcess] = []
+        for tile in self.tiles:
+            conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker,
+                args=(params, tile, names, child_conn, self._halo),
+                name=f"pycfd-tile-{tile.rank}",
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._procs.append(proc)
+        self._failed = False
+
+    def _run(self, command: int, dt: float = 0.0) -> list[Any]:
+        """
+        Exécute une commande sur toutes les tuiles et attend qu'elle soit terminée.
+
+        Si un processus de calcul s'arrête, les autres (peut-être bloqués dans
+        l'échange des halos) sont arrêtés et RuntimeError est levée.
+
+        Returns:
+        list: Le résultat de la commande pour chaque tuile.
+        """
+        if self._failed:
+            raise RuntimeError("A compute process failed")
+        for conn in self._conns:
+            try:
+                conn.send((command, dt))
+            except OSError:  # processus arrêté, vu ci-dessous
+                pass
+        results: list[Any] = [None] * self.nprocs
+        pending = dict(zip(self._conns, range(self.nprocs)))
+        sentinels = [proc.sentinel for proc in self._procs]
+        while pending:
+            ready = wait([*pending, *sentinels])
+            if any(sentinel in ready for sentinel in sentinels):
+                self._terminate()
+                raise RuntimeError("A compute process failed")
+            for conn in [conn for conn in pending if conn in ready]:
+                results[pending.pop(conn)] = conn.recv()
+        return results
+
+    def _terminate(self) -> None:
+        self._failed = True
+        for proc in self._procs:
+            if proc.is_alive():
+                proc.terminate()
+            proc.join()
+
+    def load(self, Q: Array, U: Array) -> None:
+        """Distribue Q et U aux tuiles (après l'initialisation ou une reprise)."""
+        dom = self.params.slice_dom
+        self._Q[dom] = Q[dom]
+        self._U[dom] = U[dom]
+        self._run(CMD_LOAD)
+
+    def compute_dt(self, t: real_t, verbose: bool) -> real_t:
+        """Pas de temps CFL : minimum global des pas de temps des tuiles."""
+        all_inv_dt: real_t = max(self._run(CMD_DT))
+        if verbose:
+            print(f"Computing dts at ({t=:.2f}): dt_hyp={self.params.CFL/all_inv_dt}")
+        return self.params.CFL / all_inv_dt
+
+    def update(self, Q: Array, U: Array, dt: real_t) -> None:
+        """Avance toutes les tuiles d'un pas dt et recopie le domaine dans Q et U (primitives et conservatives)."""
+        self._run(CMD_STEP, float(dt))
+        dom = self.params.slice_dom
+        Q[dom] = self._Q[dom]
+        U[dom] = self._U[dom]
+
+    def close(self) -> None:
+        """Arrête les processus de calcul et libère la mémoire partagée."""
+        if not self._procs:
+            return
+        if not self._failed:
+            for conn in self._conns:
+                conn.send((CMD_STOP, 0.0))
+            for proc in self._procs:
+                proc.join()
+        for conn in self._conns:
+            conn.close()
+        self._procs, self._conns = [], []
+        # Plus aucune vue sur les blocs avant de les libérer
+        del self._Q, self._U
+        for shm in self._shms.values():
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "ParallelSolver":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def strong_scaling(params: Params, nprocs_list: list[int], nsteps: int = 20) -> list[dict[str, float]]:
+    """
+    Mesure le temps de nsteps pas de temps pour chaque nombre de processus.
+
+    Le pas de temps est fixé par compute_dt sur l'état initial. Renvoie, pour
+    chaque nombre de processus, le temps par pas, le débit en millions de
+    mises à jour de cellules par seconde et l'accélération par rapport au
+    premier nombre de processus.
+    """
+    from src.problems import init_problem
+
+    results: list[dict[str, float]] = []
+    for nprocs in nprocs_list:
+        Q = np.zeros((params.Ntx, params.Nty, params.Nfields), dtype=real_t)
+        U = np.zeros_like(Q)
+        init_problem(Q, params)
+        fillBoundaries(Q, params)
+        primToCons(Q, U, params)
+        with ParallelSolver(params, nprocs) as solver:
+            solver.load(Q, U)
+            dt = solver.compute_dt(0.0, False)
+            solver.update(Q, U, dt)  # premier pas hors mesure (démarrage)
+            t0 = time.perf_counter()
+            for _ in range(nsteps):
+                solver.update(Q, U, dt)
+            elapsed = (time.perf_counter() - t0) / nsteps
+        results.append({"nprocs": nprocs, "time_per_step": elapsed, "mcups": params.Nx * params.Ny / elapsed / 1e6})
+    for r in results:
+        r["speedup"] = results[0]["time_per_step"] / r["time_per_step"]
+    return results
+
+
+def main() -> int:
+    params = readInifile(sys.argv[1]) if len(sys.argv) > 1 else Params()
+    nprocs_list = [int(n) for n in sys.argv[2:]] or [1, 2, 4]
+    print(f"Strong scaling, {params.Nx}x{params.Ny}, {mp.cpu_count()} cores")
+    print(f"{'nprocs':>6} {'s/step':>10} {'Mcell/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for r in strong_scaling(params, nprocs_list):
+        efficiency = r["speedup"] * nprocs_list[0] / r["nprocs"]
+        print(
+            f"{r['nprocs']:>6} {r['time_per_step']:>10.4f} {r['mcups']:>10.3f} "
+            f"{r['speedup']:>8.2f} {efficiency:>10.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,273 @@
-"""Paramètres de la simulation."""
+"""Paramètres de la simulation.
 
+Les paramètres d'une simulation sont regroupés dans un objet Params immuable,
+construit soit directement (valeurs par défaut ci-dessous), soit à partir d'un
+fichier .ini ou .toml avec readInifile. Cet objet est passé explicitement à
+toutes les fonctions qui en ont besoin, ce qui permet de faire coexister
+plusieurs grilles dans un même processus.
+
+Exemple de fichier .ini (les sections ne servent qu'à organiser le fichier) :
+
+    [physics]
+    problem_name = sod_x
+    MHD = false
+
+    [mesh]
+    Nx = 256
+    Ny = 4
+
+Les sections [stream.<nom>] déclarent des flux de sortie (OutputStream),
+chacun écrit à sa propre cadence dans data/<nom>/ :
+
+    [stream.cut]
+    save_freq = 0.002
+    ymin = 0.5
+    ymax = 0.5
+"""
+
+import configparser
+import math
+import tomllib
+from dataclasses import dataclass, fields
 from itertools import product
-from numpy import ndindex, array
-
-# Physics
-problem_name = "orszag-tang"
-MHD = True
-gamma = 5 / 3
-Nfields = 9 if MHD else 5
-
-# Mesh
-Nx = 128
-Ny = 128
-Nghosts = 2
-Ntx = Nx + 2 * Nghosts
-Nty = Ny + 2 * Nghosts
-ibeg = Nghosts
-iend = Nghosts + Nx
-jbeg = Nghosts
-jend = Nghosts + Ny
-
-ParallelRange = product  # eventually change it for the numpy ndindex
-range_tot = ndindex(Ntx, Nty)
-range_dom = array(list(ParallelRange(range(ibeg, iend), range(jbeg, jend))))
-range_xbound = array(list(ParallelRange(range(0, Nghosts), range(jbeg, jend))))
-range_ybound = array(list(ParallelRange(range(0, Ntx), range(0, Nghosts))))
-range_slopes = array(
-    list(ParallelRange(range(ibeg - 1, ibeg + 1), range(jbeg - 1, jbeg + 1)))
-)
-
-xmax = 1.0
-xmin = 0.0
-ymax = 1.0
-ymin = 0.0
-dx = (xmax - xmin) / Nx
-dy = (ymax - ymin) / Ny
-
-# Boundaries
-boundary_x = "BC_PERIODIC"
-boundary_y = "BC_PERIODIC"
-
-# Run
-tend = 0.6
-# Update - Hydro
-CFL = 0.5
-reconstruction = "PCM"
-time_stepping = "euler"
-riemann_solver = "fivewaves"
-# Values
-epsilon = 1e-6
-smallr = 1e-10
-# Output
-log_frequency = 100
-save_freq = 0.01
+from pathlib import Path
+from typing import Any, Iterator
+
+
+@dataclass(frozen=True)
+class OutputStream:
+    """
+    Flux de sortie : une zone du domaine, écrite à sa propre cadence.
+
+    La zone est donnée en coordonnées physiques et contient toutes les cellules
+    qu'elle touche (le domaine entier par défaut). Des bornes égales donnent une
+    coupe 1D : ymin = ymax = 0.5 écrit la ligne de cellules contenant y = 0.5.
+    Avec coarsen > 1, les champs sont moyennés par blocs de coarsen x coarsen
+    cellules.
+    """
+
+    name: str
+    save_freq: float = 0.01
+    xmin: float = -math.inf
+    xmax: float = math.inf
+    ymin: float = -math.inf
+    ymax: float = math.inf
+    coarsen: int = 1
+
+
+@dataclass(frozen=True)
+class Params:
+    # Physics
+    problem_name: str = "orszag-tang"
+    MHD: bool = True
+    gamma: float = 5 / 3
+
+    # Mesh
+    Nx: int = 128
+    Ny: int = 128
+    Nghosts: int = 2
+    xmin: float = 0.0
+    xmax: float = 1.0
+    ymin: float = 0.0
+    ymax: float = 1.0
+
+    # Boundaries : BC_PERIODIC, BC_REFLECTING ou BC_ABSORBING, pour chaque côté du domaine
+    boundary_xmin: str = "BC_PERIODIC"
+    boundary_xmax: str = "BC_PERIODIC"
+    boundary_ymin: str = "BC_PERIODIC"
+    boundary_ymax: str = "BC_PERIODIC"
+
+    # Run
+    tend: float = 0.6
+    # Update - Hydro
+    CFL: float = 0.5
+    reconstruction: str = "PCM"  # PCM, PLM (minmod), PLM_MC, PLM_VANLEER, PLM_SUPERBEE
+    time_stepping: str = "euler"  # euler, RK2 (SSP-RK2) ou RK3 (SSP-RK3)
+    riemann_solver: str = "fivewaves"
+    # Pas de temps suivant estimé pendant le calcul des flux (en retard d'une itération)
+    dt_from_riemann: bool = False
+    dt_safety: float = 0.8
+    # Nombre de processus de calcul (décomposition en tuiles, voir parallel.py)
+    nprocs: int = 1
+    # Noyaux de calcul : python (référence, par cellule), numpy ou numba (voir backends.py)
+    backend: str = "numpy"
+    # Mise à jour par tuiles de tile_size x tile_size cellules (0 : 64 si nthreads > 1, sinon
+    # pas de tuiles), réparties sur nthreads threads (voir workspace.ThreadTiles)
+    nthreads: int = 1
+    tile_size: int = 0
+    # Values
+    epsilon: float = 1e-6
+    smallr: float = 1e-10
+
+    # Output
+    log_frequency: int = 100
+    # Chronomètres par phase (timers.py), résumés tous les log_frequency pas et en fin de calcul
+    timers: bool = False
+    # Points de reprise : tous les checkpoint_frequency pas de temps (0 : jamais)
+    checkpoint_frequency: int = 0
+    # Point de reprise à partir duquel relancer le calcul ("" : partir de t=0)
+    restart_file: str = ""
+    save_freq: float = 0.01
+    write_ghost_cells: bool = False
+    # Format des sorties : hdf5 (HDF5 + XDMF) ou npy (.npy + JSON, sans h5py)
+    output_backend: str = "hdf5"
+    # Toutes les sorties dans un seul fichier, gardé ouvert pendant le calcul
+    unique_output: bool = False
+    # Écriture des sorties dans un thread séparé, avec deux tampons
+    async_output: bool = False
+    # Champs écrits, séparés par des virgules (rho, u, v, prs, w, bx, by, bz, psi) ; vide = tous
+    output_fields: str = ""
+    output_precision: int = 8  # 8 (float64) ou 4 (float32)
+    output_compression: str = "none"  # none, gzip ou lzf
+    output_compression_level: int = 4  # niveau gzip (0-9)
+    output_shuffle: bool = True  # filtre shuffle, avec compression seulement
+    output_chunks: int = 0  # taille des blocs HDF5 (0 : contigu, ou automatique si compressé)
+    # Flux de sortie ([stream.<nom>]) ; aucun : le domaine entier dans data/, tous les save_freq
+    output_streams: tuple[OutputStream, ...] = ()
+
+    # Diagnostics in situ (diagnostics.py) : tous les diagnostics_frequency pas de temps (0 : jamais)
+    diagnostics_frequency: int = 0
+    # Diagnostics calculés, séparés par des virgules (mass, energy, kinetic_energy,
+    # magnetic_energy, max_divB, min_rho, min_prs) ; vide = tous
+    diagnostics: str = ""
+    diagnostics_format: str = "csv"  # csv ou hdf5
+
+    @property
+    def Nfields(self) -> int:
+        return 9 if self.MHD else 5
+
+    @property
+    def Ntx(self) -> int:
+        return self.Nx + 2 * self.Nghosts
+
+    @property
+    def Nty(self) -> int:
+        return self.Ny + 2 * self.Nghosts
+
+    @property
+    def ibeg(self) -> int:
+        return self.Nghosts
+
+    @property
+    def iend(self) -> int:
+        return self.Nghosts + self.Nx
+
+    @property
+    def jbeg(self) -> int:
+        return self.Nghosts
+
+    @property
+    def jend(self) -> int:
+        return self.Nghosts + self.Ny
+
+    @property
+    def dx(self) -> float:
+        return (self.xmax - self.xmin) / self.Nx
+
+    @property
+    def dy(self) -> float:
+        return (self.ymax - self.ymin) / self.Ny
+
+    @property
+    def slice_dom(self) -> tuple[slice, slice]:
+        """Vue du domaine (sans les cellules fantômes) dans un tableau (Ntx, Nty, ...)."""
+        return (slice(self.ibeg, self.iend), slice(self.jbeg, self.jend))
+
+    # Parcours cellule par cellule, générés à la demande
+    @property
+    def range_dom(self) -> Iterator[tuple[int, int]]:
+        return product(range(self.ibeg, self.iend), range(self.jbeg, self.jend))
+
+    @property
+    def range_xbound(self) -> Iterator[tuple[int, int]]:
+        return product(range(0, self.Nghosts), range(self.jbeg, self.jend))
+
+    @property
+    def range_ybound(self) -> Iterator[tuple[int, int]]:
+        return product(range(0, self.Ntx), range(0, self.Nghosts))
+
+
+def _convert(name: str, value: Any, default: Any) -> Any:
+    """Convertit une valeur lue dans un fichier au type du paramètre correspondant."""
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        states = configparser.ConfigParser.BOOLEAN_STATES
+        if str(value).lower() not in states:
+            raise ValueError(f"Invalid boolean value for {name}: {value!r}")
+        return states[str(value).lower()]
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    return str(value)
+
+
+def stream_from_dict(name: str, values: dict[str, Any]) -> OutputStream:
+    """Construit un OutputStream à partir de sa section [stream.<name>]."""
+    defaults = {f.name: f.default for f in fields(OutputStream) if f.name != "name"}
+    unknown = [key for key in values if key not in defaults]
+    if unknown:
+        raise ValueError(f"Unknown parameter in stream {name}: {', '.join(unknown)}")
+    stream = OutputStream(name, **{key: _convert(key, value, defaults[key]) for key, value in values.items()})
+    if stream.coarsen < 1 or stream.save_freq <= 0:
+        raise ValueError(f"Invalid stream {name}: coarsen must be >= 1 and save_freq > 0")
+    return stream
+
+
+def params_from_dict(values: dict[str, Any]) -> Params:
+    """
+    Construit un Params à partir d'un dictionnaire {nom: valeur}.
+
+    Les sous-dictionnaires (sections) sont aplatis ; les valeurs sont converties
+    au type du paramètre, et un nom inconnu lève une ValueError. Les sections
+    stream.<nom> (ou la table [stream] en TOML) donnent les flux de sortie.
+    """
+    defaults = {f.name: f.default for f in fields(Params)}
+    kwargs: dict[str, Any] = {}
+    streams: list[OutputStream] = []
+
+    def collect(d: dict[str, Any]) -> None:
+        for key, value in d.items():
+            if key == "stream" and isinstance(value, dict):
+                streams.extend(stream_from_dict(name, section) for name, section in value.items())
+            elif key.startswith("stream.") and isinstance(value, dict):
+                streams.append(stream_from_dict(key.removeprefix("stream."), value))
+            elif isinstance(value, dict):
+                collect(value)
+            elif key not in defaults or key == "output_streams":
+                raise ValueError(f"Unknown parameter: {key}")
+            else:
+                kwargs[key] = _convert(key, value, defaults[key])
+
+    collect(values)
+    if streams:
+        names = [stream.name for stream in streams]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate output streams: {', '.join(names)}")
+        kwargs["output_streams"] = tuple(streams)
+    return Params(**kwargs)
+
+
+def readInifile(filename: str | Path) -> Params:
+    """
+    Lit les paramètres d'une simulation depuis un fichier .ini ou .toml.
+
+    Parameters:
+    filename (str | Path): Chemin du fichier ; le format est choisi d'après l'extension.
+
+    Returns:
+    Params: Les paramètres, les valeurs absentes du fichier gardant leur défaut.
+    """
+    path = Path(filename)
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier {path} introuvable.")
+
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            return params_from_dict(tomllib.load(f))
+
+    parser = configparser.ConfigParser()
+    parser.optionxform = str  # type: ignore[assignment, method-assign]  # noms sensibles à la casse (MHD, Nx...)
+    parser.read(path)
+    return params_from_dict({section: dict(parser[section]) for section in parser.sections()})
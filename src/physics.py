@@ -1,19 +1,75 @@
-"""Module for physics-related calculations."""
+"""Module for physics-related calculations.
 
+Les fonctions sur les composantes (sound_speed, fast_magnetosonic_speed)
+acceptent indifféremment des scalaires ou des tableaux : elles sont partagées
+par les versions cellule et tableau du pas de temps et des solveurs de Riemann.
+"""
+
+from typing import overload
 import numpy as np
 from src.states import State
-import src.params as params
+from src.params import Params
+from src.pycfd_types import Array, real_t
 from src.varindexes import IP, IR
 
 
-def speed_of_sound(q: State) -> float:
+@overload
+def sound_speed(rho: real_t, p: real_t, params: Params) -> real_t: ...
+@overload
+def sound_speed(rho: Array, p: Array, params: Params) -> Array: ...
+
+
+def sound_speed(rho: real_t | Array, p: real_t | Array, params: Params) -> real_t | Array:
+    """
+    Calculate the speed of sound from the density and the pressure.
+
+    Parameters:
+    rho (float | Array): The density.
+    p (float | Array): The pressure.
+    params (Params): The simulation parameters (adiabatic index).
+
+    Returns:
+    float | Array: The speed of sound.
+    """
+    return np.sqrt(params.gamma * p / rho)
+
+
+@overload
+def fast_magnetosonic_speed(rho: real_t, B2: real_t, Bn: real_t, cs: real_t) -> real_t: ...
+@overload
+def fast_magnetosonic_speed(rho: Array, B2: Array, Bn: Array, cs: Array) -> Array: ...
+
+
+def fast_magnetosonic_speed(
+    rho: real_t | Array, B2: real_t | Array, Bn: real_t | Array, cs: real_t | Array
+) -> real_t | Array:
+    """
+    Calculate the fast magnetosonic speed along a given direction.
+
+    Parameters:
+    rho (float | Array): The density.
+    B2 (float | Array): The squared norm of the magnetic field.
+    Bn (float | Array): The magnetic field component along the direction.
+    cs (float | Array): The speed of sound.
+
+    Returns:
+    float | Array: The fast magnetosonic speed.
+    """
+    c02 = cs * cs
+    ca2 = B2 / rho
+    cap2 = Bn * Bn / rho
+    return np.sqrt(0.5 * (c02 + ca2) + 0.5 * np.sqrt((c02 + ca2) * (c02 + ca2) - 4.0 * c02 * cap2))
+
+
+def speed_of_sound(q: State, params: Params) -> float:
     """
     Calculate the speed of sound in the medium described by the state q.
 
     Parameters:
     q (State): The state of the system.
+    params (Params): The simulation parameters (adiabatic index).
 
     Returns:
     float: The speed of sound.
     """
-    return np.sqrt(params.gamma * q[IP] / q[IR])
+    return sound_speed(q[IR], q[IP], params)
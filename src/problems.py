@@ -2,20 +2,21 @@
 
 from typing import Callable
 import numpy as np
-import src.params as params
+from src.params import Params
 from src.pycfd_types import Array, real_t, IDir
 
 # from pycfd_types import VarIndex as C
 from src.varindexes import IR, IU, IV, IW, IP, IBX, IBY, IBZ, IPSI
 
 
-def get_pos(i, j) -> tuple[real_t, real_t]:
+def get_pos(i: int, j: int, params: Params) -> tuple[real_t, real_t]:
     """
     Get the physical position corresponding to grid indices.
 
     Parameters:
     i (int): The x index in the grid.
     j (int): The y index in the grid.
+    params (Params): The simulation parameters.
 
     Returns:
     tuple[float, float]: The physical coordinates (x, y).
@@ -25,8 +26,8 @@ def get_pos(i, j) -> tuple[real_t, real_t]:
     return x, y
 
 
-def init_sod_x(Q: Array, i: int, j: int) -> None:
-    if get_pos(i, j)[IDir.IX] <= 0.5:
+def init_sod_x(Q: Array, i: int, j: int, params: Params) -> None:
+    if get_pos(i, j, params)[IDir.IX] <= 0.5:
         Q[i, j, IR] = 1.0
         Q[i, j, IP] = 1.0
         Q[i, j, IU] = 0.0
@@ -37,7 +38,7 @@ def init_sod_x(Q: Array, i: int, j: int) -> None:
         Q[i, j, IU] = 0.0
 
 
-def init_orszag_tang(Q: Array, i: int, j: int) -> None:
+def init_orszag_tang(Q: Array, i: int, j: int, params: Params) -> None:
     """
     Initialize the Orszag-Tang vortex problem.
 
@@ -48,7 +49,7 @@ def init_orszag_tang(Q: Array, i: int, j: int) -> None:
     ndarray(State): The initialized state for the Orszag-Tang problem.
     """
     B0 = 1 / np.sqrt(4 * np.pi)
-    x, y = get_pos(i, j)
+    x, y = get_pos(i, j, params)
     Q[i, j, IR] = params.gamma**2 * B0**2
     Q[i, j, IU] = -np.sin(2 * np.pi * y)
     Q[i, j, IV] = np.sin(2 * np.pi * x)
@@ -60,7 +61,7 @@ def init_orszag_tang(Q: Array, i: int, j: int) -> None:
     Q[i, j, IPSI] = 0.0
 
 
-def init_test(Q: Array, i: int, j: int) -> None:
+def init_test(Q: Array, i: int, j: int, params: Params) -> None:
     Q[i, j, IR] = 1
     Q[i, j, IU] = 0
     Q[i, j, IV] = 0
@@ -73,12 +74,14 @@ problems: dict[str, Callable] = {
 }
 
 
-def init_problem(Q: Array, problem_name: str) -> None:
+def init_problem(Q: Array, params: Params) -> None:
     """Initialise the whole grid given an initial problem setup
 
     Q (np.ndarray) : Array containing all the data of the grid
-    problem_name (str): Key to the function to call to fill each cell.
+    params (Params): Simulation parameters; params.problem_name is the key to
+        the function to call to fill each cell.
     """
-    assert problem_name in problems, "The chosen problem is not referenced."
+    assert params.problem_name in problems, "The chosen problem is not referenced."
+    init_cell = problems[params.problem_name]
     for i, j in params.range_dom:
-        problems[problem_name](Q, i, j)
+        init_cell(Q, i, j, params)
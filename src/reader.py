@@ -0,0 +1,258 @@
+"""
+Lecture paresseuse des sorties d'une simulation, pour le post-traitement.
+
+Un SnapshotReader ouvre un dossier de sorties écrit par IOManager, qu'il
+s'agisse d'un fichier par sortie (ite_XXXX.h5) ou du fichier unique
+(<outname>.h5, séries temporelles). Rien n'est lu à l'ouverture : chaque
+champ est lu à la demande, éventuellement restreint à une région, par un
+hyperslab HDF5 ou par np.memmap lorsque le dataset est contigu et non
+compressé. Les sorties au format npy (ite_XXXX.npy ou <outname>.npy, avec
+leurs métadonnées JSON) sont toujours lues par np.memmap, sans h5py.
+
+    with SnapshotReader("data") as run:
+        for snap in run:
+            print(snap.time, snap["rho", 10:20, :].mean())
+        rho_t = run.series("rho", region=(slice(64, 65), slice(None)))
+"""
+
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+import numpy as np
+from src import npyio
+from src.pycfd_types import Array
+
+if TYPE_CHECKING:
+    import h5py
+
+# Région (lignes y, colonnes x) dans les tableaux (fNy, fNx) des sorties
+Region = tuple[slice, slice]
+ALL: Region = (slice(None), slice(None))
+
+# Datasets des sorties qui ne sont pas des champs
+_not_fields = {"x", "y", "time", "iteration"}
+
+
+def _memmap_layout(dset: "h5py.Dataset") -> Optional[tuple[int, np.dtype, tuple[int, ...]]]:
+    """(offset, dtype, shape) d'un dataset contigu non compressé, None sinon."""
+    if dset.chunks is not None:  # découpé en blocs (et peut-être compressé)
+        return None
+    offset = dset.id.get_offset()
+    if offset is None:  # jamais écrit
+        return None
+    return offset, dset.dtype, dset.shape
+
+
+class Snapshot:
+    """
+    Une sortie de la simulation, dont les champs sont lus à la demande.
+
+    snap["rho"] renvoie le champ entier, snap["rho", sy, sx] la région (sy, sx).
+    """
+
+    def __init__(self, reader: "SnapshotReader", step: int) -> None:
+        self.reader = reader
+        self.step = step
+        self.time = float(reader.times[step])
+        self.iteration = int(reader.iterations[step])
+
+    def __getitem__(self, key: Union[str, tuple]) -> Array:
+        if isinstance(key, str):
+            return self.reader.read(key, self.step)
+        name, *region = key
+        return self.reader.read(name, self.step, tuple(region))  # type: ignore[arg-type]
+
+    def __repr__(self) -> str:
+        return f"Snapshot(step={self.step}, iteration={self.iteration}, time={self.time})"
+
+
+class SnapshotReader:
+    """
+    Accès paresseux à toutes les sorties d'un dossier.
+
+    Parameters:
+    dirname (str | Path): Dossier des sorties.
+    outname (str): Nom du fichier unique, s'il existe (<outname>.h5 ou <outname>.npy).
+    """
+
+    def __init__(self, dirname: Union[str, Path] = "data", outname: str = "run") -> None:
+        self.dirname = Path(dirname)
+        self._file: Optional["h5py.File"] = None
+        self._data: Optional[np.memmap] = None
+        self._meta: dict[str, Any] = {}
+        unique_h5 = self.dirname / f"{outname}.h5"
+        unique_npy = self.dirname / f"{outname}.npy"
+        if unique_h5.exists():
+            import h5py
+
+            self.backend, self.unique_output = "hdf5", True
+            self.files = [unique_h5]
+            self._file = h5py.File(unique_h5, "r")
+        elif unique_npy.exists():
+            self.backend, self.unique_output = "npy", True
+            self.files = [unique_npy]
+            self._meta = npyio.read_json(unique_npy.with_suffix(".json"))
+            self._data = np.load(unique_npy, mmap_mode="r")
+        else:
+            self.unique_output = False
+            self.files = sorted(self.dirname.glob("ite_*.h5"))
+            self.backend = "hdf5"
+            if not self.files:
+                self.files = sorted(self.dirname.glob("ite_*.npy"))
+                self.backend = "npy"
+            if not self.files:
+                raise FileNotFoundError(f"Aucune sortie dans {self.dirname}.")
+            if self.backend == "npy":
+                self._meta = npyio.read_json(self.files[0].with_suffix(".json"))
+        # Disposition mémoire des datasets contigus, par (step, champ)
+        self._layouts: dict[tuple[int, str], Optional[tuple[int, np.dtype, tuple[int, ...]]]] = {}
+
+    def __len__(self) -> int:
+        if self.backend == "npy" and self.unique_output:
+            return self._meta["nsnap"]
+        if self.unique_output:
+            return self._h5["time"].shape[0]
+        return len(self.files)
+
+    def __getitem__(self, step: int) -> Snapshot:
+        if not -len(self) <= step < len(self):
+            raise IndexError(f"Sortie {step} hors de [0, {len(self)}[")
+        return Snapshot(self, step % len(self))
+
+    def __iter__(self) -> Iterator[Snapshot]:
+        """Parcourt les sorties dans l'ordre, sans en lire les champs."""
+        for step in range(len(self)):
+            yield Snapshot(self, step)
+
+    @cached_property
+    def times(self) -> Array:
+        if self.backend == "npy":
+            if self.unique_output:
+                return np.array(self._meta["time"])
+            return np.array([npyio.read_json(filename.with_suffix(".json"))["time"] for filename in self.files])
+        if self.unique_output:
+            return self._h5["time"][...]
+        import h5py
+
+        times = []
+        for filename in self.files:
+            with h5py.File(filename, "r") as f:
+                times.append(f.attrs["time"])
+        return np.array(times)
+
+    @cached_property
+    def iterations(self) -> Array:
+        if self.backend == "npy" and self.unique_output:
+            return np.array(self._meta["iteration"])
+        if self.unique_output:
+            return self._h5["iteration"][...]
+        return np.array([int(filename.stem.removeprefix("ite_")) for filename in self.files])
+
+    @cached_property
+    def fields(self) -> list[str]:
+        """Noms des champs présents dans les sorties."""
+        if self.backend == "npy":
+            return list(self._meta["fields"])
+        if self.unique_output:
+            return [name for name in self._h5 if name not in _not_fields]
+        import h5py
+
+        with h5py.File(self.files[0], "r") as f:
+            return [name for name in f if name not in _not_fields]
+
+    def coordinates(self) -> tuple[Array, Array]:
+        """Coordonnées x et y des sommets, de forme (fNy+1, fNx+1)."""
+        if self.backend == "npy":
+            # Mêmes formules qu'IOManager, à partir des attributs de la grille
+            m = self._meta
+            c = m.get("coarsen", 1)
+            xv = (np.arange(m["i0"], m["i0"] + c * m["fNx"] + 1, c) - m["ibeg"]) * m["dx"] + m["xmin"]
+            yv = (np.arange(m["j0"], m["j0"] + c * m["fNy"] + 1, c) - m["jbeg"]) * m["dy"] + m["ymin"]
+            x, y = np.meshgrid(xv, yv)
+            return x, y
+        if self.unique_output:
+            return self._h5["x"][...], self._h5["y"][...]
+        import h5py
+
+        with h5py.File(self.files[0], "r") as f:
+            return f["x"][...], f["y"][...]
+
+    def read(self, name: str, step: int, region: Region = ALL) -> Array:
+        """
+        Lit le champ name de la sortie step, restreint à region.
+
+        En fichier unique, c'est un hyperslab de la série temporelle. Sinon, un
+        dataset contigu est renvoyé comme une vue np.memmap (lue à l'accès), un
+        dataset compressé est lu par hyperslab. Au format npy, c'est toujours une vue
+        np.memmap du fichier.
+        """
+        if name not in self.fields:
+            raise KeyError(f"Champ inconnu : {name}")
+        if self.backend == "npy":
+            k = self.fields.index(name)
+            if self.unique_output:
+                return self._npy[step, k][region]
+            return np.load(self.files[step], mmap_mode="r")[k][region]
+        if self.unique_output:
+            return self._h5[name][(step, *region)]
+
+        import h5py
+
+        filename = self.files[step]
+        if (step, name) not in self._layouts:
+            with h5py.File(filename, "r") as f:
+                self._layouts[step, name] = _memmap_layout(f[name])
+        layout = self._layouts[step, name]
+        if layout is not None:
+            offset, dtype, shape = layout
+            return np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)[region]
+        with h5py.File(filename, "r") as f:
+            return f[name][region]
+
+    def series(self, name: str, region: Region = ALL, steps: slice = slice(None)) -> Array:
+        """
+        Série temporelle (nt, ny, nx) du champ name sur region.
+
+        En fichier unique, c'est une seule lecture par hyperslab.
+        """
+        if self.backend == "npy" and self.unique_output:
+            if name not in self.fields:
+                raise KeyError(f"Champ inconnu : {name}")
+            return np.array(self._npy[: len(self)][steps, self.fields.index(name)][(slice(None), *region)])
+        if self.unique_output:
+            if name not in self.fields:
+                raise KeyError(f"Champ inconnu : {name}")
+            return self._h5[name][(steps, *region)]
+        return np.stack([self.read(name, step, region) for step in range(len(self))[steps]])
+
+    @property
+    def _h5(self) -> "h5py.File":
+        """Fichier unique, ouvert jusqu'à close()."""
+        if self._file is None:
+            raise ValueError("SnapshotReader is closed")
+        return self._file
+
+    @property
+    def _npy(self) -> np.memmap:
+        """Tableau (capacité, nfields, fNy, fNx) du fichier unique npy, jusqu'à close()."""
+        if self._data is None:
+            raise ValueError("SnapshotReader is closed")
+        return self._data
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = None
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_run(dirname: Union[str, Path] = "data", outname: str = "run") -> Iterator[Snapshot]:
+    """Générateur sur toutes les sorties d'un dossier ; le lecteur est fermé à la fin."""
+    with SnapshotReader(dirname, outname) as reader:
+        yield from reader
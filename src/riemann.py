@@ -1,11 +1,12 @@
 """Module containing all Riemann solvers."""
 
+from typing import Optional
 import numpy as np
 from src.pycfd_types import real_t, Array, IDir
-from src.states import State, primToCons
-from src.physics import speed_of_sound
-import src.params as params
-from src.varindexes import IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ
+from src.states import State, primToCons, array_primToCons
+from src.physics import speed_of_sound, sound_speed, fast_magnetosonic_speed
+from src.params import Params
+from src.varindexes import IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI, IVEL, IMAG
 
 # IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI = VarIndex.__members__
 
@@ -63,7 +64,7 @@ def logMean(a: float, b: float) -> float:
 #     return flux
 
 
-def computeFlux(q: State) -> State:
+def computeFlux(q: State, params: Params) -> State:
     Ek: real_t = 0.5 * q[IR] * (q[IU] * q[IU] + q[IV] * q[IV])
     E: real_t = q[IP] / (params.gamma - 1.0) + Ek
 
@@ -76,9 +77,9 @@ def computeFlux(q: State) -> State:
     return fout
 
 
-def hll(qL: State, qR: State) -> State:
-    aL: float = speed_of_sound(qL)
-    aR: float = speed_of_sound(qR)
+def hll(qL: State, qR: State, params: Params) -> State:
+    aL: float = speed_of_sound(qL, params)
+    aR: float = speed_of_sound(qR, params)
 
     # Davis' estimates for the signal speed
     sminL: float = qL[IU] - aL
@@ -89,8 +90,8 @@ def hll(qL: State, qR: State) -> State:
     SL: real_t = min(sminL, sminR)
     SR: real_t = max(smaxL, smaxR)
 
-    FL: State = computeFlux(qL)
-    FR: State = computeFlux(qR)
+    FL: State = computeFlux(qL, params)
+    FR: State = computeFlux(qR, params)
     flux: State = State()
     if SL >= 0.0:
         flux = FL
@@ -99,14 +100,56 @@ def hll(qL: State, qR: State) -> State:
         flux = FR
     # pout = qR[IP]
     else:
-        uL: State = primToCons(qL)  # type: ignore
-        uR: State = primToCons(qR)  # type: ignore
+        uL: State = primToCons(qL, params)  # type: ignore
+        uR: State = primToCons(qR, params)  # type: ignore
         # pout: real_t = 0.5 * (qL[IP] + qR[IP]);
         flux = (SR * FL - SL * FR + SL * SR * (uR - uL)) / (SR - SL)
     return flux
 
 
-def fivewaves(qL: State, qR: State) -> State:
+def array_computeFlux(q: Array, params: Params) -> Array:
+    Ek: Array = 0.5 * q[..., IR] * (q[..., IU] * q[..., IU] + q[..., IV] * q[..., IV])
+    E: Array = q[..., IP] / (params.gamma - 1.0) + Ek
+
+    fout: Array = np.zeros_like(q)
+
+    fout[..., IR] = q[..., IR] * q[..., IU]
+    fout[..., IU] = q[..., IR] * q[..., IU] * q[..., IU] + q[..., IP]
+    fout[..., IV] = q[..., IR] * q[..., IU] * q[..., IV]
+    fout[..., IE] = (q[..., IP] + E) * q[..., IU]
+    return fout
+
+
+def array_hll(
+    qL: Array, qR: Array, params: Params, out: Optional[Array] = None, smax: Optional[Array] = None
+) -> Array:
+    """
+    Version vectorisée de hll sur un ensemble d'interfaces de forme (..., Nfields).
+
+    Si smax (de forme (...)) est fourni, il reçoit la vitesse maximale des
+    ondes à chaque interface.
+    """
+    aL: Array = sound_speed(qL[..., IR], qL[..., IP], params)
+    aR: Array = sound_speed(qR[..., IR], qR[..., IP], params)
+
+    # Davis' estimates for the signal speed
+    SL: Array = np.minimum(qL[..., IU] - aL, qR[..., IU] - aR)[..., np.newaxis]
+    SR: Array = np.maximum(qL[..., IU] + aL, qR[..., IU] + aR)[..., np.newaxis]
+
+    FL: Array = array_computeFlux(qL, params)
+    FR: Array = array_computeFlux(qR, params)
+    uL: Array = array_primToCons(qL, params)
+    uR: Array = array_primToCons(qR, params)
+    fstar: Array = (SR * FL - SL * FR + SL * SR * (uR - uL)) / (SR - SL)
+
+    flux: Array = np.empty_like(qL) if out is None else out
+    flux[...] = np.where(SL >= 0.0, FL, np.where(SR <= 0.0, FR, fstar))
+    if smax is not None:
+        np.maximum(np.abs(SL[..., 0]), np.abs(SR[..., 0]), out=smax)
+    return flux
+
+
+def fivewaves(qL: State, qR: State, params: Params) -> State:
     B2L: real_t = qL[IBX] * qL[IBX] + qL[IBY] * qL[IBY] + qL[IBZ] * qL[IBZ]
     B2R: real_t = qR[IBX] * qR[IBX] + qR[IBY] * qR[IBY] + qR[IBZ] * qR[IBZ]
     pL: Array = np.array(
@@ -118,8 +161,8 @@ def fivewaves(qL: State, qR: State) -> State:
     )
 
     # 1. Compute speeds
-    csL: real_t = speed_of_sound(qL)
-    csR: real_t = speed_of_sound(qR)
+    csL: real_t = speed_of_sound(qL, params)
+    csR: real_t = speed_of_sound(qR, params)
     caL: real_t = np.sqrt(qL[IR] * (qL[IBX] * qL[IBX] + B2L / 2)) + params.epsilon
     caR: real_t = np.sqrt(qR[IR] * (qR[IBX] * qR[IBX] + B2R / 2)) + params.epsilon
     cbL: real_t = np.sqrt(
@@ -129,23 +172,14 @@ def fivewaves(qL: State, qR: State) -> State:
         qR[IR] * (qR[IR] * csR * csR + qR[IBY] * qR[IBY] + qR[IBZ] * qR[IBZ] + B2R / 2)
     )
 
-    def computeFastMagnetoAcousticSpeed(q: State, B2: real_t, cs: real_t) -> real_t:
-        c02: real_t = cs * cs
-        ca2: real_t = B2 / q[IR]
-        cap2: real_t = q[IBX] * q[IBX] / q[IR]
-        return np.sqrt(
-            0.5 * (c02 + ca2)
-            + 0.5 * np.sqrt((c02 + ca2) * (c02 + ca2) - 4.0 * c02 * cap2)
-        )
-
     # Using 3-wave if hyperbolicity is lost (from Dyablo)
     if (
         qL[IBX] * qR[IBX] < -params.epsilon
         or qL[IBY] * qR[IBY] < -params.epsilon
         or qL[IBZ] * qR[IBZ] < -params.epsilon
     ):
-        clocL = qL[IR] * computeFastMagnetoAcousticSpeed(qL, B2L, csL)
-        clocR = qR[IR] * computeFastMagnetoAcousticSpeed(qR, B2R, csR)
+        clocL = qL[IR] * fast_magnetosonic_speed(qL[IR], B2L, qL[IBX], csL)
+        clocR = qR[IR] * fast_magnetosonic_speed(qR[IR], B2R, qR[IBX], csR)
         c = max(clocL, clocR)
 
         caL = c
@@ -185,7 +219,7 @@ def fivewaves(qL: State, qR: State) -> State:
         q[IR] * q[IU] / (q[IBX] * q[IBX] + q[IBY] * q[IBY] + q[IBZ] * q[IBZ])
     )
     is_low_beta = beta < beta_min
-    u: State = primToCons(q)  # type: ignore
+    u: State = primToCons(q, params)  # type: ignore
     # 3. Commpute flux
     flux = State()
     uS = Ustar[IDir.IX]
@@ -212,15 +246,141 @@ def fivewaves(qL: State, qR: State) -> State:
     return flux
 
 
+def _array_total_pressure(q: Array, B2: Array) -> Array:
+    """Pression totale et tension magnétique normale à l'interface, de forme (..., 3)."""
+    p: Array = np.empty(q.shape[:-1] + (3,), dtype=q.dtype)
+    p[..., IDir.IX] = -q[..., IBX] * q[..., IBX] + q[..., IP] + B2 / 2
+    p[..., IDir.IY] = -q[..., IBX] * q[..., IBY]
+    p[..., IDir.IZ] = -q[..., IBX] * q[..., IBZ]
+    return p
+
+
+def array_fivewaves(
+    qL: Array, qR: Array, params: Params, out: Optional[Array] = None, smax: Optional[Array] = None
+) -> Array:
+    """
+    Version vectorisée de fivewaves sur un ensemble d'interfaces.
+
+    Les branches du solveur scalaire (repli sur 3 ondes, choix de l'état
+    amont, cas bas-beta / Alfvénique) sont remplacées par des sélections
+    masquées, de sorte que toutes les interfaces sont traitées en une fois.
+
+    Parameters:
+    qL (Array): États primitifs à gauche des interfaces, de forme (..., Nfields),
+        exprimés dans le repère de l'interface (composante normale selon x).
+    qR (Array): États primitifs à droite des interfaces, même forme que qL.
+    params (Params): Paramètres de la simulation.
+    out (Array, optional): Tableau de même forme recevant les flux.
+    smax (Array, optional): Tableau de forme (...) recevant la vitesse maximale
+        des ondes à chaque interface, estimée à partir des impédances cL, cR et
+        de la vitesse de l'état étoile.
+
+    Returns:
+    Array: Les flux à chaque interface (out s'il est fourni).
+    """
+    B2L: Array = qL[..., IBX] * qL[..., IBX] + qL[..., IBY] * qL[..., IBY] + qL[..., IBZ] * qL[..., IBZ]
+    B2R: Array = qR[..., IBX] * qR[..., IBX] + qR[..., IBY] * qR[..., IBY] + qR[..., IBZ] * qR[..., IBZ]
+    pL: Array = _array_total_pressure(qL, B2L)
+    pR: Array = _array_total_pressure(qR, B2R)
+
+    # 1. Compute speeds
+    csL: Array = sound_speed(qL[..., IR], qL[..., IP], params)
+    csR: Array = sound_speed(qR[..., IR], qR[..., IP], params)
+    caL: Array = np.sqrt(qL[..., IR] * (qL[..., IBX] * qL[..., IBX] + B2L / 2)) + params.epsilon
+    caR: Array = np.sqrt(qR[..., IR] * (qR[..., IBX] * qR[..., IBX] + B2R / 2)) + params.epsilon
+    cbL: Array = np.sqrt(
+        qL[..., IR]
+        * (qL[..., IR] * csL * csL + qL[..., IBY] * qL[..., IBY] + qL[..., IBZ] * qL[..., IBZ] + B2L / 2)
+    )
+    cbR: Array = np.sqrt(
+        qR[..., IR]
+        * (qR[..., IR] * csR * csR + qR[..., IBY] * qR[..., IBY] + qR[..., IBZ] * qR[..., IBZ] + B2R / 2)
+    )
+
+    # Using 3-wave if hyperbolicity is lost (from Dyablo)
+    three_waves: Array = (
+        (qL[..., IBX] * qR[..., IBX] < -params.epsilon)
+        | (qL[..., IBY] * qR[..., IBY] < -params.epsilon)
+        | (qL[..., IBZ] * qR[..., IBZ] < -params.epsilon)
+    )
+    if three_waves.any():
+        clocL = qL[..., IR] * fast_magnetosonic_speed(qL[..., IR], B2L, qL[..., IBX], csL)
+        clocR = qR[..., IR] * fast_magnetosonic_speed(qR[..., IR], B2R, qR[..., IBX], csR)
+        c = np.maximum(clocL, clocR)
+        caL = np.where(three_waves, c, caL)
+        caR = np.where(three_waves, c, caR)
+        cbL = np.where(three_waves, c, cbL)
+        cbR = np.where(three_waves, c, cbR)
+
+    cL: Array = np.stack([cbL, caL, caL], axis=-1)
+    cR: Array = np.stack([cbR, caR, caR], axis=-1)
+
+    # 2. Compute star zone
+    vL: Array = qL[..., IVEL]
+    vR: Array = qR[..., IVEL]
+    Ustar: Array = (cL * vL + cR * vR + pL - pR) / (cL + cR)
+    Pstar: Array = (cR * pL + cL * pR + cL * cR * (vL - vR)) / (cL + cR)
+
+    uS: Array = Ustar[..., IDir.IX]
+    upwind_left: Array = uS > 0.0
+    q: Array = np.where(upwind_left[..., np.newaxis], qL, qR)
+    Bstar: Array = np.where(upwind_left, qR[..., IBX], qL[..., IBX])
+
+    beta_min = 1.0e-3
+    alfven_max = 10.0
+    B2: Array = q[..., IBX] * q[..., IBX] + q[..., IBY] * q[..., IBY] + q[..., IBZ] * q[..., IBZ]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = q[..., IP] / (0.5 * B2)
+        alfven_number = np.sqrt(q[..., IR] * q[..., IU] / B2)
+    is_low_beta = beta < beta_min
+    Bn: Array = np.where(is_low_beta | (alfven_number > alfven_max), q[..., IBX], Bstar)
+    u: Array = array_primToCons(q, params)
+
+    # 3. Commpute flux
+    flux: Array = np.empty_like(qL) if out is None else out
+    flux[..., IR] = u[..., IR] * uS
+    flux[..., IVEL] = u[..., IVEL] * uS[..., np.newaxis] + Pstar
+    flux[..., IE] = (
+        u[..., IE] * uS
+        + Pstar[..., IDir.IX] * uS
+        + Pstar[..., IDir.IY] * Ustar[..., IDir.IY]
+        + Pstar[..., IDir.IZ] * Ustar[..., IDir.IZ]
+    )
+    flux[..., IMAG] = u[..., IMAG] * uS[..., np.newaxis] - Bn[..., np.newaxis] * Ustar
+    flux[..., IPSI] = 0.0
+
+    if smax is not None:
+        # Les c sont des impédances (rho * c) : on repasse en vitesses eulériennes
+        sL: Array = np.abs(qL[..., IU] - np.maximum(cbL, caL) / qL[..., IR])
+        sR: Array = np.abs(qR[..., IU] + np.maximum(cbR, caR) / qR[..., IR])
+        np.maximum(np.maximum(sL, sR), np.abs(uS), out=smax)
+    return flux
+
+
 # Calling the right Riemann solver
-def riemann(qL: State, qR: State) -> State:
+def riemann(qL: State, qR: State, params: Params) -> State:
     match (params.riemann_solver.upper()):
         case "HLL":
             assert params.MHD is False, "HLL is not suitable for solving MHD problem."
-            flux = hll(qL, qR)
+            flux = hll(qL, qR, params)
         case "FIVEWAVES":
-            flux = fivewaves(qL, qR)
+            flux = fivewaves(qL, qR, params)
         case _:
             raise ValueError("The selected Riemann solver is not available.")
     # case "HLLC": hllc(qL, qR, flux, pout, params); break;
     return flux
+
+
+def array_riemann(
+    qL: Array, qR: Array, params: Params, out: Optional[Array] = None, smax: Optional[Array] = None
+) -> Array:
+    """Version vectorisée de riemann, pour des interfaces de forme (..., Nfields)."""
+    match (params.riemann_solver.upper()):
+        case "HLL":
+            assert params.MHD is False, "HLL is not suitable for solving MHD problem."
+            flux = array_hll(qL, qR, params, out, smax)
+        case "FIVEWAVES":
+            flux = array_fivewaves(qL, qR, params, out, smax)
+        case _:
+            raise ValueError("The selected Riemann solver is not available.")
+    return flux
@@ -1,9 +1,9 @@
 from typing import Union, Optional
 from functools import singledispatch
 import numpy as np
-import src.params as params
+from src.params import Params
 from src.pycfd_types import real_t, Array, IDir
-from src.varindexes import IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI
+from src.varindexes import IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI, IVEL, NVARS
 
 # IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI = VarIndex.__members__
 
@@ -12,9 +12,9 @@ class State(np.ndarray):
     """Classe de base pour PrimState et ConsState."""
 
     def __new__(cls, data: Union[Array, None] = None) -> "State":
-        arr = np.zeros(params.Nfields) if data is None else np.array(data, dtype=real_t)
-        if arr.shape != (params.Nfields,):
-            raise ValueError(f"Expected {params.Nfields} fields, got {arr.shape}")
+        arr = np.zeros(NVARS) if data is None else np.array(data, dtype=real_t)
+        if arr.shape != (NVARS,):
+            raise ValueError(f"Expected {NVARS} fields, got {arr.shape}")
         # vue ndarray avec type State
         return arr.view(cls)
 
@@ -127,32 +127,18 @@ class State(np.ndarray):
 
 
 def get_state_from_array(Q: Array, i: int, j: int) -> State:
+    """État de la cellule (i, j) ; en hydro (Nfields = 5), les composantes magnétiques sont nulles."""
     s = State()
-    s[IR] = Q[i, j, IR]
-    s[IU] = Q[i, j, IU]
-    s[IV] = Q[i, j, IV]
-    s[IW] = Q[i, j, IW]
-    s[IP] = Q[i, j, IP]
-    s[IBX] = Q[i, j, IBX]
-    s[IBY] = Q[i, j, IBY]
-    s[IBZ] = Q[i, j, IBZ]
-    s[IPSI] = Q[i, j, IPSI]
+    s[: Q.shape[-1]] = Q[i, j]
     return s
 
 
 def set_state_into_array(Q: Array, i: int, j: int, s: State) -> None:
-    Q[i, j, IR] = s[IR]
-    Q[i, j, IU] = s[IU]
-    Q[i, j, IV] = s[IV]
-    Q[i, j, IW] = s[IW]
-    Q[i, j, IP] = s[IP]
-    Q[i, j, IBX] = s[IBX]
-    Q[i, j, IBY] = s[IBY]
-    Q[i, j, IBZ] = s[IBZ]
-    Q[i, j, IPSI] = s[IPSI]
-
-
-def cell_primToCons(q: State) -> State:
+    """Écrit l'état s dans la cellule (i, j), sur les Nfields composantes de Q."""
+    Q[i, j] = s[: Q.shape[-1]]
+
+
+def cell_primToCons(q: State, params: Params) -> State:
     u: State = State()
     u[IR] = q[IR]
     u[IU] = q[IR] * q[IU]
@@ -169,7 +155,7 @@ def cell_primToCons(q: State) -> State:
     return u
 
 
-def cell_consToPrim(u: State) -> State:
+def cell_consToPrim(u: State, params: Params) -> State:
     q: State = State()
     q[IR] = u[IR]
     q[IU] = u[IU] / u[IR]
@@ -186,55 +172,114 @@ def cell_consToPrim(u: State) -> State:
     return q
 
 
-# Note : grid_** function should be vectorized with numpy array arithmetic
-def grid_consToPrim(U: Array, Q: Array) -> None:
-    for i, j in params.range_dom:
-        u_loc = get_state_from_array(U, i, j)
-        q_loc = cell_consToPrim(u_loc)
-        set_state_into_array(Q, i, j, q_loc)
+def _check_out(a: Array, out: Optional[Array]) -> Array:
+    if out is None:
+        return np.empty_like(a)
+    if out.shape != a.shape:
+        raise ValueError(f"Expected an output of shape {a.shape}, got {out.shape}")
+    if np.may_share_memory(a, out):
+        raise ValueError("The output buffer must not overlap the input array.")
+    return out
+
+
+def array_primToCons(q: Array, params: Params, out: Optional[Array] = None) -> Array:
+    """
+    Conversion primitive -> conservative d'un bloc entier de cellules.
+
+    Parameters:
+    q (Array): Variables primitives, de forme (..., Nfields).
+    params (Params): Paramètres de la simulation.
+    out (Array, optional): Tableau de même forme recevant le résultat. Il ne
+        doit pas partager sa mémoire avec q.
+
+    Returns:
+    Array: Les variables conservatives (out s'il est fourni).
+    """
+    u = _check_out(q, out)
+    rho = q[..., IR]
+    u[..., IR] = rho
+    np.multiply(q[..., IVEL], rho[..., np.newaxis], out=u[..., IVEL])
+    u[..., IBX:] = q[..., IBX:]
+    Ek = rho * 0.5 * (q[..., IU] ** 2 + q[..., IV] ** 2 + q[..., IW] ** 2)
+    Emag: real_t | Array = 0.0
+    Epsi: real_t | Array = 0.0
+    if params.MHD:
+        Emag = 0.5 * (q[..., IBX] ** 2 + q[..., IBY] ** 2 + q[..., IBZ] ** 2)
+        Epsi = 0.5 * q[..., IPSI] ** 2
+    u[..., IE] = q[..., IP] / (params.gamma - 1) + Ek + Emag + Epsi
+    return u
+
+
+def array_consToPrim(u: Array, params: Params, out: Optional[Array] = None) -> Array:
+    """
+    Conversion conservative -> primitive d'un bloc entier de cellules.
+
+    Parameters:
+    u (Array): Variables conservatives, de forme (..., Nfields).
+    params (Params): Paramètres de la simulation.
+    out (Array, optional): Tableau de même forme recevant le résultat. Il ne
+        doit pas partager sa mémoire avec u.
+
+    Returns:
+    Array: Les variables primitives (out s'il est fourni).
+    """
+    q = _check_out(u, out)
+    rho = u[..., IR]
+    q[..., IR] = rho
+    np.divide(u[..., IVEL], rho[..., np.newaxis], out=q[..., IVEL])
+    q[..., IBX:] = u[..., IBX:]
+    Ek = rho * 0.5 * (q[..., IU] ** 2 + q[..., IV] ** 2 + q[..., IW] ** 2)
+    Emag: real_t | Array = 0.0
+    Epsi: real_t | Array = 0.0
+    if params.MHD:
+        Emag = 0.5 * (q[..., IBX] ** 2 + q[..., IBY] ** 2 + q[..., IBZ] ** 2)
+        Epsi = 0.5 * q[..., IPSI] ** 2
+    q[..., IP] = (u[..., IE] - Ek - Emag - Epsi) * (params.gamma - 1)
+    return q
+
 
+def grid_consToPrim(U: Array, Q: Array, params: Params) -> None:
+    array_consToPrim(U[params.slice_dom], params, out=Q[params.slice_dom])
 
-def grid_primToCons(Q: Array, U: Array) -> None:
-    for i, j in params.range_dom:
-        q_loc = get_state_from_array(Q, i, j)
-        u_loc = cell_primToCons(q_loc)
-        set_state_into_array(U, i, j, u_loc)
+
+def grid_primToCons(Q: Array, U: Array, params: Params) -> None:
+    array_primToCons(Q[params.slice_dom], params, out=U[params.slice_dom])
 
 
 @singledispatch
-def primToCons(arg1: State | Array, arg2: Optional[Array] = None) -> Union[State, None]:
+def primToCons(arg1: State | Array, *args) -> Union[State, None]:
     """Fonction générique pour primToCons."""
     raise NotImplementedError("Type non supporté.")
 
 
 @primToCons.register
-def _(q: State, _: None = None) -> State:
+def _(q: State, params: Params) -> State:
     """Conversion cellule->cellule (State -> State)."""
-    return cell_primToCons(q)
+    return cell_primToCons(q, params)
 
 
 @primToCons.register
-def _(Q: Array, U: Array) -> None:
+def _(Q: Array, U: Array, params: Params) -> None:
     """Conversion grille->grille (Array -> Array)."""
-    grid_primToCons(Q, U)
+    grid_primToCons(Q, U, params)
 
 
 @singledispatch
-def consToPrim(arg1: State | Array, arg2: Optional[Array] = None) -> Union[State, None]:
+def consToPrim(arg1: State | Array, *args) -> Union[State, None]:
     """Fonction générique pour primToCons."""
     raise NotImplementedError("Type non supporté.")
 
 
 @consToPrim.register
-def _(q: State, _: None = None) -> State:
+def _(q: State, params: Params) -> State:
     """Conversion cellule->cellule (State -> State)."""
-    return cell_consToPrim(q)
+    return cell_consToPrim(q, params)
 
 
 @consToPrim.register
-def _(Q: Array, U: Array) -> None:
+def _(Q: Array, U: Array, params: Params) -> None:
     """Conversion grille->grille (Array -> Array)."""
-    grid_consToPrim(Q, U)
+    grid_consToPrim(Q, U, params)
 
 
 def swap_components(s: State, idir: IDir) -> State:
@@ -254,3 +299,23 @@ def swap_components(s: State, idir: IDir) -> State:
         )
     else:
         raise ValueError("Chosen dir is not recognized.")
+
+
+# Permutations des composantes pour passer dans le repère d'une direction
+swap_indices: dict[IDir, list[int]] = {
+    IDir.IX: [IR, IU, IV, IW, IP, IBX, IBY, IBZ, IPSI],
+    IDir.IY: [IR, IV, IU, IW, IP, IBY, IBX, IBZ, IPSI],
+    IDir.IZ: [IR, IW, IV, IU, IP, IBZ, IBY, IBX, IPSI],
+}
+
+
+def array_swap_components(A: Array, idir: IDir, out: Optional[Array] = None) -> Array:
+    """
+    Version tableau de swap_components : permute l'axe des variables de A.
+
+    La permutation est son propre inverse, la même fonction sert donc à passer
+    dans le repère de la direction idir et à en revenir.
+    """
+    if idir == IDir.IX and out is None:
+        return A
+    return np.take(A, swap_indices[idir][: A.shape[-1]], axis=-1, out=out)
@@ -0,0 +1,91 @@
+"""
+Flux de sortie d'une simulation.
+
+Chaque flux (params.output_streams) a son propre IOManager, sa propre
+cadence et sa propre numérotation des sorties : on peut par exemple écrire
+souvent une coupe 1D ou une version moyennée par blocs, et rarement le
+domaine entier. Chaque flux écrit dans data/<nom>/. Sans flux déclaré, un
+flux par défaut écrit tout le domaine dans data/ tous les params.save_freq,
+comme auparavant.
+"""
+
+from pathlib import Path
+from typing import Iterator
+from src.iomanager import IOManager, RestartInfo, StreamState
+from src.params import OutputStream, Params
+from src.pycfd_types import Array
+
+
+class OutputStreams:
+    """
+    Ensemble des flux de sortie, avec leur prochaine date de sortie.
+
+    Parameters:
+    params (Params): Paramètres de la simulation (output_streams, save_freq...).
+    dirname (str | Path): Dossier des sorties ; les flux nommés écrivent dans un sous-dossier.
+    outname (str): Nom du fichier unique de chaque flux (params.unique_output).
+    """
+
+    def __init__(self, params: Params, dirname: str | Path = "data", outname: str = "run") -> None:
+        self.params = params
+        self.dirname = Path(dirname)
+        streams = params.output_streams or (OutputStream("", save_freq=params.save_freq),)
+        self.managers: dict[str, IOManager] = {
+            stream.name: IOManager(params, outname, self.dirname / stream.name, stream) for stream in streams
+        }
+        self.state: dict[str, StreamState] = {name: StreamState(0, 0.0) for name in self.managers}
+        # Points de reprise dans dirname, avec le flux par défaut s'il existe
+        self.checkpoints = self.managers.get("") or IOManager(params, outname, self.dirname)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.managers)
+
+    def restore(self, info: RestartInfo) -> None:
+        """Reprend la numérotation et les dates de sortie enregistrées dans un point de reprise."""
+        missing = [name for name in self.managers if name not in info.streams]
+        if missing:
+            raise ValueError(f"Output streams missing from checkpoint: {', '.join(missing)}")
+        self.state = {name: info.streams[name] for name in self.managers}
+        # Les fichiers uniques gardent les sorties écrites avant le point de reprise
+        for name, manager in self.managers.items():
+            manager.resume(self.state[name].iteration)
+
+    def save_due(self, Q: Array, t: float) -> list[str]:
+        """
+        Écrit les flux dont la date de sortie est atteinte.
+
+        Returns:
+        list[str]: Les noms des flux écrits.
+        """
+        saved = []
+        for name, state in self.state.items():
+            if t + self.params.epsilon > state.next_save:
+                self._save(name, Q, t, state.next_save + self.managers[name].save_freq)
+                saved.append(name)
+        return saved
+
+    def save_all(self, Q: Array, t: float) -> None:
+        """Écrit tous les flux (sortie finale)."""
+        for name, state in self.state.items():
+            self._save(name, Q, t, state.next_save)
+
+    def _save(self, name: str, Q: Array, t: float, next_save: float) -> None:
+        iteration = self.state[name].iteration + 1
+        self.managers[name].save_solution(Q, iteration, t)
+        self.state[name] = StreamState(iteration, next_save)
+
+    def save_checkpoint(self, Q: Array, U: Array, t: float, step: int, dt_next: float | None) -> Path:
+        """Écrit un point de reprise avec l'état de tous les flux."""
+        return self.checkpoints.save_checkpoint(Q, U, t, step, self.state, dt_next)
+
+    def close(self) -> None:
+        """Termine les écritures de tous les flux (écritures asynchrones, fichiers uniques)."""
+        for manager in self.managers.values():
+            manager.close()
+        self.checkpoints.close()
+
+    def __enter__(self) -> "OutputStreams":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
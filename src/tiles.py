@@ -0,0 +1,92 @@
+"""
+Découpage du domaine en tuiles rectangulaires.
+
+Une tuile est calculée comme une petite grille (TileParams) : le domaine de
+la tuile entouré de Nghosts cellules fantômes. Les tuiles servent à la
+décomposition sur plusieurs processus (parallel.py) et au calcul par blocs
+de taille adaptée aux caches, réparti sur des threads (workspace.ThreadTiles).
+"""
+
+from dataclasses import dataclass, fields
+from typing import Any
+import numpy as np
+from src.params import Params
+
+# Côté des tuiles (en cellules) si params.tile_size vaut 0
+DEFAULT_TILE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Tuile [i0, i1[ x [j0, j1[ du domaine, en indices de Q (cellules fantômes comprises)."""
+
+    rank: int
+    i0: int
+    i1: int
+    j0: int
+    j1: int
+
+    @property
+    def region(self) -> tuple[slice, slice]:
+        return (slice(self.i0, self.i1), slice(self.j0, self.j1))
+
+    def with_ghosts(self, ng: int) -> tuple[slice, slice]:
+        """Région de la tuile et de ses ng couches de cellules fantômes."""
+        return (slice(self.i0 - ng, self.i1 + ng), slice(self.j0 - ng, self.j1 + ng))
+
+
+@dataclass(frozen=True)
+class TileParams(Params):
+    """
+    Paramètres d'une tuile : grille de la tuile, pas d'espace du domaine entier.
+
+    dx et dy sont ceux du domaine, au bit près, et non recalculés à partir des
+    bornes de la tuile : le résultat est ainsi identique au calcul séquentiel.
+    """
+
+    tile_dx: float = 0.0
+    tile_dy: float = 0.0
+
+    @property
+    def dx(self) -> float:
+        return self.tile_dx
+
+    @property
+    def dy(self) -> float:
+        return self.tile_dy
+
+
+def split(n: int, parts: int) -> list[int]:
+    """Tailles de parts morceaux consécutifs de n cellules, à une cellule près."""
+    return [n // parts + (k < n % parts) for k in range(parts)]
+
+
+def tile_params(params: Params, tile: Tile) -> TileParams:
+    """Paramètres de la grille locale d'une tuile (Nx, Ny et bornes de la tuile)."""
+    values: dict[str, Any] = {f.name: getattr(params, f.name) for f in fields(Params)}
+    values.update(
+        Nx=tile.i1 - tile.i0,
+        Ny=tile.j1 - tile.j0,
+        xmin=params.xmin + (tile.i0 - params.ibeg) * params.dx,
+        xmax=params.xmin + (tile.i1 - params.ibeg) * params.dx,
+        ymin=params.ymin + (tile.j0 - params.jbeg) * params.dy,
+        ymax=params.ymin + (tile.j1 - params.jbeg) * params.dy,
+    )
+    return TileParams(**values, tile_dx=params.dx, tile_dy=params.dy)
+
+
+def grid_tiles(params: Params, nx: list[int], ny: list[int]) -> list[Tile]:
+    """Tuiles de tailles nx selon x et ny selon y, numérotées selon x puis y."""
+    px, py = len(nx), len(ny)
+    xs = np.cumsum([params.ibeg] + nx)
+    ys = np.cumsum([params.jbeg] + ny)
+    return [
+        Tile(rank=a + px * b, i0=int(xs[a]), i1=int(xs[a + 1]), j0=int(ys[b]), j1=int(ys[b + 1]))
+        for b in range(py)
+        for a in range(px)
+    ]
+
+
+def block_tiles(params: Params, size: int) -> list[Tile]:
+    """Découpe le domaine en tuiles d'au plus size x size cellules, de tailles égales à une cellule près."""
+    return grid_tiles(params, split(params.Nx, -(-params.Nx // size)), split(params.Ny, -(-params.Ny // size)))
@@ -0,0 +1,149 @@
+"""
+Chronomètres par phase du calcul (params.timers).
+
+Chaque phase est mesurée par un bloc `with timers("nom"):`. Les phases ne
+s'emboîtent pas : leurs durées s'additionnent, et le reste du temps écoulé
+est compté dans "other". Désactivés, les chronomètres ne coûtent qu'un appel
+de fonction par bloc, qui rend un contexte vide partagé.
+
+Phases mesurées :
+- main.py : "dt" (pas de temps CFL), "io" (sorties et points de reprise),
+  "diagnostics", "parallel update" (mise à jour par ParallelSolver) ;
+- update.py : "boundaries", "slopes", "reconstruction", "riemann", "fluxes"
+  (mise à jour de U et combinaison des étapes Runge-Kutta), "conversion"
+  (consToPrim). Avec des tuiles (ThreadTiles), pentes, reconstruction,
+  solveur de Riemann et mise à jour sont mesurés ensemble dans "fluxes".
+"""
+
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import ContextManager
+
+# Contexte rendu par des chronomètres désactivés
+_DISABLED: ContextManager[None] = nullcontext()
+
+
+class _Phase:
+    """Bloc `with` mesurant une phase."""
+
+    __slots__ = ("timers", "name", "t0")
+
+    def __init__(self, timers: "Timers", name: str) -> None:
+        self.timers = timers
+        self.name = name
+        self.t0 = 0.0
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.timers.add(self.name, time.perf_counter() - self.t0)
+
+
+@dataclass(frozen=True)
+class TimerReport:
+    """
+    Durées des phases sur un intervalle de temps.
+
+    Parameters:
+    elapsed (dict[str, float]): Durée totale de chaque phase, en secondes.
+    calls (dict[str, int]): Nombre de mesures de chaque phase.
+    wall (float): Temps écoulé sur l'intervalle, en secondes.
+    steps (int): Nombre d'itérations sur l'intervalle.
+    cells (int): Nombre de cellules du domaine (Nx * Ny).
+    """
+
+    elapsed: dict[str, float]
+    calls: dict[str, int]
+    wall: float
+    steps: int
+    cells: int
+
+    @property
+    def other(self) -> float:
+        """Temps écoulé hors des phases mesurées."""
+        return max(0.0, self.wall - sum(self.elapsed.values()))
+
+    @property
+    def mcell_updates(self) -> float:
+        """Millions de mises à jour de cellules par seconde (une par cellule et par itération)."""
+        return self.cells * self.steps / self.wall / 1e6 if self.wall > 0.0 else 0.0
+
+    @property
+    def time_per_iteration(self) -> float:
+        """Temps moyen par itération, en secondes."""
+        return self.wall / self.steps if self.steps > 0 else 0.0
+
+    @property
+    def io_fraction(self) -> float:
+        """Fraction du temps écoulé passée dans les sorties (phase "io")."""
+        return self.elapsed.get("io", 0.0) / self.wall if self.wall > 0.0 else 0.0
+
+    def rates(self) -> str:
+        """Résumé sur une ligne : débit, temps par itération et fraction d'I/O."""
+        return (
+            f"{self.mcell_updates:.2f} Mcell-updates/s, {1e3 * self.time_per_iteration:.3f} ms/iteration, "
+            f"I/O {100 * self.io_fraction:.1f} %"
+        )
+
+    def __str__(self) -> str:
+        lines = [f"Timers: {self.steps} iterations in {self.wall:.3f} s"]
+        for name, seconds in sorted(self.elapsed.items(), key=lambda item: -item[1]):
+            share = 100 * seconds / self.wall if self.wall > 0.0 else 0.0
+            lines.append(f"   {name:<16} {seconds:10.3f} s {share:6.1f} % {self.calls[name]:8d} calls")
+        share = 100 * self.other / self.wall if self.wall > 0.0 else 0.0
+        lines.append(f"   {'other':<16} {self.other:10.3f} s {share:6.1f} %")
+        lines.append(f" - {self.rates()}")
+        return "\n".join(lines)
+
+
+class Timers:
+    """
+    Chronomètres nommés, cumulés depuis leur création (ou reset).
+
+    Parameters:
+    enabled (bool): Si False, aucune mesure n'est faite.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        """Remet les chronomètres à zéro (par exemple au début de la boucle en temps)."""
+        self.elapsed: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.start = time.perf_counter()
+        # Début de l'intervalle courant (voir interval)
+        self._last: tuple[float, int, dict[str, float], dict[str, int]] = (self.start, 0, {}, {})
+
+    def __call__(self, name: str) -> ContextManager[None]:
+        """Bloc `with` mesurant la phase name."""
+        if not self.enabled:
+            return _DISABLED
+        return _Phase(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Ajoute une mesure de durée seconds à la phase name."""
+        self.elapsed[name] = self.elapsed.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def report(self, steps: int, cells: int) -> TimerReport:
+        """Durées des phases depuis la création (ou reset) des chronomètres, pour steps itérations."""
+        return TimerReport(dict(self.elapsed), dict(self.calls), time.perf_counter() - self.start, steps, cells)
+
+    def interval(self, steps: int, cells: int) -> TimerReport:
+        """
+        Durées des phases depuis l'appel précédent (ou reset), pour la journalisation périodique.
+
+        Parameters:
+        steps (int): Nombre total d'itérations depuis la création (ou reset).
+        cells (int): Nombre de cellules du domaine.
+        """
+        now = time.perf_counter()
+        t0, steps0, elapsed0, calls0 = self._last
+        elapsed = {name: s - elapsed0.get(name, 0.0) for name, s in self.elapsed.items()}
+        calls = {name: n - calls0.get(name, 0) for name, n in self.calls.items()}
+        self._last = (now, steps, dict(self.elapsed), dict(self.calls))
+        return TimerReport(elapsed, calls, now - t0, steps - steps0, cells)
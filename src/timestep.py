@@ -1,32 +1,21 @@
 import numpy as np
-from src.states import State, get_state_from_array
-import src.params as params
-from src.physics import speed_of_sound
+from src.states import State
+from src.params import Params
+from src.physics import speed_of_sound, sound_speed, fast_magnetosonic_speed
 from src.pycfd_types import Array, real_t
-from src.varindexes import IR, IU, IV, IBX, IBY, IBZ
+from src.varindexes import IR, IU, IV, IP, IBX, IBY, IBZ
 
 # IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI = VarIndex.__members__
 
 
-def cell_timestep(q: State) -> real_t:
-    cs = speed_of_sound(q)
+def cell_timestep(q: State, params: Params) -> real_t:
+    cs = speed_of_sound(q, params)
     inv_dt_hyp_loc = (cs + abs(q[IU])) / params.dx + (cs + abs(q[IV])) / params.dy
     # ifdef MHD
     if params.MHD:
         B2: real_t = q[IBX] * q[IBX] + q[IBY] * q[IBY] + q[IBZ] * q[IBZ]
-        ca2: real_t = B2 / q[IR]
-        cap2x: real_t = q[IBX] * q[IBX] / q[IR]
-        cap2y: real_t = q[IBY] * q[IBY] / q[IR]
-        # cap2z = q[IBZ]*q[IBZ]/q[IR]
-
-        cf_x: real_t = np.sqrt(
-            0.5 * (cs**2 + ca2)
-            + 0.5 * np.sqrt((cs**2 + ca2) * (cs**2 + ca2) - 4.0 * cs**2 * cap2x)
-        )
-        cf_y: real_t = np.sqrt(
-            0.5 * (cs**2 + ca2)
-            + 0.5 * np.sqrt((cs**2 + ca2) * (cs**2 + ca2) - 4.0 * cs**2 * cap2y)
-        )
+        cf_x = fast_magnetosonic_speed(q[IR], B2, q[IBX], cs)
+        cf_y = fast_magnetosonic_speed(q[IR], B2, q[IBY], cs)
         # real_t c_jz = sqrt(0.5*(c02+ca2)+0.5*sqrt((c02+ca2)*(c02+ca2)-4.*c02*cap2z))
         inv_dt_hyp_loc = max(
             (cf_x + abs(q[IU])) / params.dx + (cf_y + abs(q[IV])) / params.dy,
@@ -35,11 +24,46 @@ def cell_timestep(q: State) -> real_t:
     return inv_dt_hyp_loc
 
 
-def compute_dt(Q: Array, t: real_t, verbose: bool) -> real_t:
-    all_inv_dt = 0.0
-    for i, j in params.range_dom:
-        q_loc = get_state_from_array(Q, i, j)
-        all_inv_dt = max(cell_timestep(q_loc), all_inv_dt)
+def array_timestep(q: Array, params: Params) -> Array:
+    """
+    Version tableau de cell_timestep : inverse du pas de temps CFL de chaque cellule.
+
+    Parameters:
+    q (Array): Variables primitives, de forme (..., Nfields).
+    params (Params): Paramètres de la simulation.
+
+    Returns:
+    Array: 1/dt de chaque cellule, de forme (...).
+    """
+    cs = sound_speed(q[..., IR], q[..., IP], params)
+    abs_u: Array = np.abs(q[..., IU])
+    abs_v: Array = np.abs(q[..., IV])
+    inv_dt: Array = (cs + abs_u) / params.dx + (cs + abs_v) / params.dy
+    if params.MHD:
+        B2: Array = q[..., IBX] * q[..., IBX] + q[..., IBY] * q[..., IBY] + q[..., IBZ] * q[..., IBZ]
+        cf_x = fast_magnetosonic_speed(q[..., IR], B2, q[..., IBX], cs)
+        cf_y = fast_magnetosonic_speed(q[..., IR], B2, q[..., IBY], cs)
+        np.maximum((cf_x + abs_u) / params.dx + (cf_y + abs_v) / params.dy, inv_dt, out=inv_dt)
+    return inv_dt
+
+
+def compute_dt(Q: Array, t: real_t, verbose: bool, params: Params) -> real_t:
+    # Import local : backends utilise les fonctions de ce module
+    from src.backends import get_backend
+
+    all_inv_dt: real_t = get_backend(params.backend).max_inv_dt(Q, params)
     if verbose:
         print(f"Computing dts at ({t=:.2f}): dt_hyp={params.CFL/all_inv_dt}")
-    return params.CFL / np.max(all_inv_dt)
+    return params.CFL / all_inv_dt
+
+
+def riemann_dt(inv_dt: real_t, params: Params) -> real_t:
+    """
+    Pas de temps déduit des vitesses d'ondes collectées par le solveur de Riemann.
+
+    inv_dt est la valeur renvoyée par update.compute_fluxes_and_update. Elle
+    décrit l'état au début du pas qui vient d'être calculé : le pas obtenu a
+    donc une itération de retard sur compute_dt. Le facteur params.dt_safety
+    (< 1) compense ce retard.
+    """
+    return params.CFL * params.dt_safety / inv_dt
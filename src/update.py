@@ -1,27 +1,34 @@
+from typing import Callable, Optional
 import numpy as np
 from src.pycfd_types import Array, IDir, real_t
 from src.states import (
     State,
     get_state_from_array,
     swap_components,
-    set_state_into_array,
-    consToPrim,
+    array_swap_components,
 )
-from src.riemann import riemann
-import src.params as params
+from src.backends import Backend, get_backend
+from src.limiters import Limiter, get_limiter
+from src.params import Params
 from src.varindexes import IR, IU, IV, IW, IBX, IBY, IBZ, IPSI
-from src.boundaries import fillBoundaries
+from src.timestep import riemann_dt
+from src.tiles import Tile
+from src.workspace import ThreadTiles, Workspace
+
+# Remplissage des cellules fantômes de Q avant chaque étape (celui du backend, ou
+# échange des halos entre tuiles, voir parallel.py)
+BoundaryFill = Callable[[Array, Params], None]
 
 
 # IR, IU, IV, IW, IP, IE, IBX, IBY, IBZ, IPSI = VarIndex.__members__
 def reconstruct(
-    Q: Array, slopes: Array, i: int, j: int, sign: real_t, idir: IDir
+    Q: Array, slopes: Array, i: int, j: int, sign: real_t, idir: IDir, params: Params
 ) -> State:
     q: State = get_state_from_array(Q, i, j)
     slope: State = get_state_from_array(slopes, i, j)
     res: State = State()
     match (params.reconstruction):
-        case "PLM":
+        case str(scheme) if scheme.startswith("PLM"):
             res = q + slope * sign * 0.5  # Piecewise Linear
         case "PCM_WB":  # Piecewise constant + Well-balancing
             raise NotImplementedError("Well Balanced Schemes are not available yet.")
@@ -51,84 +58,260 @@ def minmod(dL: real_t, dR: real_t) -> real_t:
         return dR
 
 
-slopesX: Array = np.zeros((params.Ntx, params.Nty, params.Nfields))
-slopesY: Array = np.zeros((params.Ntx, params.Nty, params.Nfields))
+def compute_slopes(Q: Array, params: Params, ws: Workspace) -> None:
+    """
+    Pentes limitées selon x et y sur tout le domaine plus une couche de fantômes.
+
+    Le limiteur est choisi par params.reconstruction (voir limiters.get_limiter) ;
+    les pentes sont écrites dans ws.slopes.
+    """
+    limiter: Limiter = get_limiter(params.reconstruction)
+    ib, ie = params.ibeg - 1, params.iend + 1
+    jb, je = params.jbeg - 1, params.jend + 1
+    q: Array = Q[ib:ie, jb:je]
+
+    ws.slopes[IDir.IX][ib:ie, jb:je] = limiter(q - Q[ib - 1 : ie - 1, jb:je], Q[ib + 1 : ie + 1, jb:je] - q)
+    ws.slopes[IDir.IY][ib:ie, jb:je] = limiter(q - Q[ib:ie, jb - 1 : je - 1], Q[ib:ie, jb + 1 : je + 1] - q)
+
+
+def array_reconstruct(
+    q: Array, slope: Array, sign: real_t, params: Params, out: Optional[Array] = None
+) -> Array:
+    """
+    Version tableau de reconstruct, sans changement de repère.
+
+    En PCM, q est renvoyé tel quel (out n'est pas utilisé).
+    """
+    match (params.reconstruction):
+        case str(scheme) if scheme.startswith("PLM"):
+            res: Array = np.multiply(slope, sign * 0.5, out=out)  # Piecewise Linear
+            res += q
+            return res
+        case "PCM_WB":  # Piecewise constant + Well-balancing
+            raise NotImplementedError("Well Balanced Schemes are not available yet.")
+        case _:
+            return q  # // Piecewise Constant
+
+
+def compute_face_states(
+    Q: Array,
+    slopes: Array,
+    idir: IDir,
+    params: Params,
+    outL: Optional[Array] = None,
+    outR: Optional[Array] = None,
+) -> tuple[Array, Array]:
+    """
+    États reconstruits de part et d'autre de chaque interface du domaine.
 
+    Selon x, l'interface fi sépare les cellules ibeg+fi-1 et ibeg+fi, ce qui
+    donne Nx+1 interfaces par ligne ; de même selon y. Les états sont obtenus
+    à partir de vues décalées de Q et des pentes, puis exprimés dans le repère
+    de la direction idir par une permutation de l'axe des variables.
 
-def compute_slopes(Q: Array) -> None:
-    # res.device_params.ibeg-1, res.device_params.jbeg-1}, {res.device_params.iend+1, res.device_params.jend+1});
-    for i, j in params.range_slopes:
-        for ivar in range(params.Nfields):
-            dL: real_t = Q[i, j, ivar] - Q[i - 1, j, ivar]
-            dR: real_t = Q[i + 1, j, ivar] - Q[i, j, ivar]
-            dU: real_t = Q[i, j, ivar] - Q[i, j - 1, ivar]
-            dD: real_t = Q[i, j + 1, ivar] - Q[i, j, ivar]
+    Returns:
+    tuple[Array, Array]: États gauche et droit, de forme (Nx+1, Ny, Nfields)
+        selon x et (Nx, Ny+1, Nfields) selon y (outL et outR s'ils sont fournis).
+        En PCM selon x, ce sont des vues de Q.
+    """
+    di: int = 1 if idir == IDir.IX else 0
+    dj: int = 1 if idir == IDir.IY else 0
+    left = (slice(params.ibeg - di, params.iend), slice(params.jbeg - dj, params.jend))
+    right = (slice(params.ibeg, params.iend + di), slice(params.jbeg, params.jend + dj))
 
-            slopesX[i, j, ivar] = minmod(dL, dR)
-            slopesY[i, j, ivar] = minmod(dU, dD)
+    if idir == IDir.IX:
+        return (
+            array_reconstruct(Q[left], slopes[left], 1.0, params, outL),
+            array_reconstruct(Q[right], slopes[right], -1.0, params, outR),
+        )
+    qL: Array = array_reconstruct(Q[left], slopes[left], 1.0, params)
+    qR: Array = array_reconstruct(Q[right], slopes[right], -1.0, params)
+    return array_swap_components(qL, idir, outL), array_swap_components(qR, idir, outR)
 
 
-def compute_fluxes_and_update(Q: Array, Unew: Array, dt: real_t) -> None:
+def compute_fluxes_and_update(Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace) -> real_t:
+    """
+    Calcule les flux aux interfaces et met à jour Unew sur le domaine.
+
+    Returns:
+    real_t: Si params.dt_from_riemann, la somme sur x et y de la vitesse
+        maximale des ondes aux interfaces divisée par le pas d'espace, à
+        utiliser pour estimer le pas de temps suivant ; 0 sinon.
+    """
     # const real_t ch_derigs = params.GLM_scale * GLM_ch1/dt;
     # const real_t ch_dedner = 0.5 * params.CFL * fmin(params.dx, params.dy)/dt;
-    def updateAlongDir(i: int, j: int, idir: IDir):
-        slopes: Array = slopesX if idir == IDir.IX else slopesY
-        dxm: int = -1 if idir == IDir.IX else 0
-        dxp: int = 1 if idir == IDir.IX else 0
-        dym: int = -1 if idir == IDir.IY else 0
-        dyp: int = 1 if idir == IDir.IY else 0
+    backend: Backend = get_backend(params.backend)
+    Udom: Array = Unew[params.slice_dom]
+    inv_dt: real_t = 0.0
+    for idir in (IDir.IX, IDir.IY):
+        with ws.timers("reconstruction"):
+            qL, qR = compute_face_states(Q, ws.slopes[idir], idir, params, ws.qL[idir], ws.qR[idir])
+        smax: Optional[Array] = ws.smax[idir] if params.dt_from_riemann else None
+
+        # Un seul appel au solveur de Riemann par interface
+        with ws.timers("riemann"):
+            backend.riemann(qL, qR, params, ws.flux_dir[idir], smax)
+        with ws.timers("fluxes"):
+            flux: Array = ws.flux[idir]
+            if idir != IDir.IX:
+                array_swap_components(ws.flux_dir[idir], idir, out=flux)
 
-        qCL: State = reconstruct(Q, slopes, i, j, -1.0, idir)
-        qCR: State = reconstruct(Q, slopes, i, j, 1.0, idir)
-        qL: State = reconstruct(Q, slopes, i + dxm, j + dym, 1.0, idir)
-        qR: State = reconstruct(Q, slopes, i + dxp, j + dyp, -1.0, idir)
+            dl: real_t = params.dx if idir == IDir.IX else params.dy
+            if idir == IDir.IX:
+                np.subtract(flux[:-1], flux[1:], out=ws.dU)
+            else:
+                np.subtract(flux[:, :-1], flux[:, 1:], out=ws.dU)
+            ws.dU *= dt
+            ws.dU /= dl
+            Udom += ws.dU
+            if smax is not None:
+                inv_dt += float(np.max(smax)) / dl
 
-        # Calculating flux left and right of the cell
-        fluxL = riemann(qL, qCL)
-        fluxR = riemann(qCR, qR)
+    with ws.timers("fluxes"):
+        np.maximum(params.smallr, Udom[..., IR], out=Udom[..., IR])
+    return inv_dt
 
-        fluxL = swap_components(fluxL, idir)
-        fluxR = swap_components(fluxR, idir)
 
-        un_loc: State = get_state_from_array(Unew, i, j)
-        dl: real_t = params.dx if idir == IDir.IX else params.dy
-        un_loc = un_loc + dt * (fluxL - fluxR) / dl
+def tiled_fluxes_and_update(Q: Array, Unew: Array, dt: real_t, params: Params, tiles: ThreadTiles) -> real_t:
+    """
+    Pentes, flux et mise à jour de Unew, tuile par tuile (voir workspace.ThreadTiles).
 
-        set_state_into_array(Unew, i, j, un_loc)
+    Chaque tuile lit Q sur son domaine et ses cellules fantômes, et n'écrit
+    Unew que sur son domaine : les tuiles sont indépendantes, et le résultat
+    est identique au calcul sur tout le domaine.
+
+    Returns:
+    real_t: Comme compute_fluxes_and_update.
+    """
+    ng: int = params.Nghosts
+    plm: bool = params.reconstruction.startswith("PLM")
+
+    def kernel(tile: Tile, tp: Params, tws: Workspace) -> tuple[real_t, real_t]:
+        region = tile.with_ghosts(ng)
+        Qt: Array = Q[region]
+        if plm:
+            compute_slopes(Qt, tp, tws)
+        compute_fluxes_and_update(Qt, Unew[region], dt, tp, tws)
+        if not params.dt_from_riemann:
+            return 0.0, 0.0
+        return float(np.max(tws.smax[IDir.IX])), float(np.max(tws.smax[IDir.IY]))
+
+    smax = tiles.map(kernel)
+    if not params.dt_from_riemann:
+        return 0.0
+    # Maximum par direction sur tout le domaine, comme compute_fluxes_and_update
+    inv_dt: real_t = 0.0
+    inv_dt += max(s[0] for s in smax) / params.dx
+    inv_dt += max(s[1] for s in smax) / params.dy
+    return inv_dt
 
-    for i, j in params.range_dom:
-        updateAlongDir(i, j, IDir.IX)
-        updateAlongDir(i, j, IDir.IY)
 
-        Unew[i, j, IR] = max(params.smallr, Unew[i, j, IR])
+def cons_to_prim(U: Array, Q: Array, params: Params, ws: Workspace) -> None:
+    """consToPrim sur le domaine par le backend de params, tuile par tuile si ws.tiles."""
+    backend: Backend = get_backend(params.backend)
+    tiles: Optional[ThreadTiles] = ws.tiles
+    with ws.timers("conversion"):
+        if tiles is None:
+            backend.cons_to_prim(U, Q, params)
+            return
+        ng: int = params.Nghosts
 
+        def kernel(tile: Tile, tp: Params, tws: Workspace) -> None:
+            region = tile.with_ghosts(ng)
+            backend.cons_to_prim(U[region], Q[region], tp)
 
-def euler_step(Q: Array, Unew: Array, dt: real_t) -> None:
+        tiles.map(kernel)
+
+
+def euler_step(
+    Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace, fill: Optional[BoundaryFill] = None
+) -> real_t:
     # // First filling up boundaries for ghosts terms
-    fillBoundaries(Q)
+    if fill is None:
+        fill = get_backend(params.backend).fill_boundaries
+    with ws.timers("boundaries"):
+        fill(Q, params)
+    if ws.tiles is not None:
+        with ws.timers("fluxes"):
+            return tiled_fluxes_and_update(Q, Unew, dt, params, ws.tiles)
     # // Hyperbolic update
-    if params.reconstruction == "PLM":
-        compute_slopes(Q)
-
-    compute_fluxes_and_update(Q, Unew, dt)
-
-
-def update(Q: Array, Unew: Array, dt: real_t) -> None:
-    if params.time_stepping == "euler":
-        euler_step(Q, Unew, dt)
-    elif params.time_stepping == "RK2":
-        # U0: Array = np.zeros((params.Ntx, params.Nty, params.Nfields))
-        # Ustar: Array = np.zeros((params.Ntx, params.Nty, params.Nfields))
-
-        # Step 1
-        U0 = np.copy(Unew)
-        Ustar = np.copy(Unew)
-        euler_step(Q, Ustar, dt)
-        # Step 2
-        Unew = np.copy(Ustar)
-        consToPrim(Ustar, Q)
-        euler_step(Q, Unew, dt)
-        # SSP-RK2
-        for i, j in params.range_dom:
-            for ivar in range(params.Nfields):
-                Unew[i, j, ivar] = 0.5 * (U0[i, j, ivar] + Unew[i, j, ivar])
+    if params.reconstruction.startswith("PLM"):
+        with ws.timers("slopes"):
+            compute_slopes(Q, params, ws)
+
+    return compute_fluxes_and_update(Q, Unew, dt, params, ws)
+
+
+def combine_stages(U: Array, a: real_t, b: real_t, params: Params, ws: Workspace) -> None:
+    """U <- a * U0 + b * U sur le domaine, sans allocation (U0 = ws.U0)."""
+    dom = params.slice_dom
+    with ws.timers("fluxes"):
+        np.multiply(ws.U0[dom], a, out=ws.Utmp[dom])
+        U[dom] *= b
+        U[dom] += ws.Utmp[dom]
+
+
+def ssp_rk2(
+    Q: Array, U: Array, dt: real_t, params: Params, ws: Workspace, fill: Optional[BoundaryFill] = None
+) -> real_t:
+    """
+    SSP-RK2 (Shu-Osher) : U1 = U0 + dt L(U0) ; U = 1/2 U0 + 1/2 (U1 + dt L(U1)).
+
+    Q doit contenir les variables primitives de U ; U est mis à jour sur place.
+    """
+    np.copyto(ws.U0[params.slice_dom], U[params.slice_dom])
+    inv_dt: real_t = euler_step(Q, U, dt, params, ws, fill)
+    cons_to_prim(U, Q, params, ws)
+    inv_dt = max(inv_dt, euler_step(Q, U, dt, params, ws, fill))
+    combine_stages(U, 0.5, 0.5, params, ws)
+    return inv_dt
+
+
+def ssp_rk3(
+    Q: Array, U: Array, dt: real_t, params: Params, ws: Workspace, fill: Optional[BoundaryFill] = None
+) -> real_t:
+    """
+    SSP-RK3 (Shu-Osher) :
+        U1 = U0 + dt L(U0)
+        U2 = 3/4 U0 + 1/4 (U1 + dt L(U1))
+        U  = 1/3 U0 + 2/3 (U2 + dt L(U2))
+
+    Q doit contenir les variables primitives de U ; U est mis à jour sur place.
+    """
+    np.copyto(ws.U0[params.slice_dom], U[params.slice_dom])
+    inv_dt: real_t = euler_step(Q, U, dt, params, ws, fill)
+    cons_to_prim(U, Q, params, ws)
+    inv_dt = max(inv_dt, euler_step(Q, U, dt, params, ws, fill))
+    combine_stages(U, 0.75, 0.25, params, ws)
+    cons_to_prim(U, Q, params, ws)
+    inv_dt = max(inv_dt, euler_step(Q, U, dt, params, ws, fill))
+    combine_stages(U, 1.0 / 3.0, 2.0 / 3.0, params, ws)
+    return inv_dt
+
+
+def update(
+    Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace, fill: Optional[BoundaryFill] = None
+) -> Optional[real_t]:
+    """
+    Avance Unew d'un pas de temps dt à partir des variables primitives Q.
+
+    Tous les tableaux temporaires sont pris dans ws, créé une fois pour la grille
+    décrite par params. fill remplit les cellules fantômes de Q avant chaque
+    étape (par défaut, fill_boundaries du backend de params).
+
+    Returns:
+    Optional[real_t]: Si params.dt_from_riemann, le pas de temps à utiliser à
+        l'itération suivante, déduit des vitesses d'ondes vues par le solveur de
+        Riemann pendant ce pas (voir timestep.riemann_dt) ; None sinon.
+    """
+    match (params.time_stepping):
+        case "euler":
+            inv_dt = euler_step(Q, Unew, dt, params, ws, fill)
+        case "RK2":
+            inv_dt = ssp_rk2(Q, Unew, dt, params, ws, fill)
+        case "RK3":
+            inv_dt = ssp_rk3(Q, Unew, dt, params, ws, fill)
+        case _:
+            raise ValueError("The selected time stepping is not available.")
+
+    return riemann_dt(inv_dt, params) if params.dt_from_riemann else None
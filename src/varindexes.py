@@ -15,3 +15,10 @@ IBX = 5
 IBY = 6
 IBZ = 7
 IPSI = 8
+
+# Nombre de variables d'un State (cas MHD)
+NVARS = 9
+
+# Blocs contigus de composantes, pour les opérations sur tableaux entiers
+IVEL = slice(IU, IW + 1)
+IMAG = slice(IBX, IBZ + 1)
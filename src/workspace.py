@@ -0,0 +1,163 @@
+"""Espace de travail du solveur : tous les tableaux temporaires d'une grille."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from typing import Callable, Optional, TypeVar
+import numpy as np
+from src.params import Params
+from src.pycfd_types import Array, IDir
+from src.tiles import DEFAULT_TILE_SIZE, Tile, block_tiles, tile_params
+from src.timers import Timers
+
+T = TypeVar("T")
+
+
+class Workspace:
+    """
+    Tampons réutilisés à chaque pas de temps pour une grille donnée.
+
+    Un Workspace est créé une fois par grille (params) en début de simulation,
+    puis passé à chaque étape de la mise à jour (pentes, états aux interfaces, flux, vitesses
+    d'ondes, étapes Runge-Kutta). Aucun de ces tableaux n'est donc réalloué
+    pendant la boucle en temps, et nbytes donne la mémoire qu'ils occupent.
+
+    Les tableaux aux interfaces sont indexés par direction : selon x ils ont
+    la forme (Nx+1, Ny, ...), selon y (Nx, Ny+1, ...).
+
+    Si params.nthreads > 1 ou params.tile_size > 0, tiles découpe la mise à
+    jour en tuiles (voir ThreadTiles) ; None sinon.
+
+    timers mesure les phases de la mise à jour (actifs si params.timers).
+
+    close (ou un bloc with) arrête les threads des tuiles.
+    """
+
+    def __init__(self, params: Params) -> None:
+        if params.backend == "python" and params.dt_from_riemann:
+            # Le backend de référence n'estime pas les vitesses d'ondes
+            raise ValueError("dt_from_riemann is not supported by the python backend")
+        self.Ntx = params.Ntx
+        self.Nty = params.Nty
+        self.Nfields = params.Nfields
+        cells = (params.Ntx, params.Nty, params.Nfields)
+        faces: dict[IDir, tuple[int, int]] = {
+            IDir.IX: (params.Nx + 1, params.Ny),
+            IDir.IY: (params.Nx, params.Ny + 1),
+        }
+
+        # Pentes limitées (PLM)
+        self.slopes: dict[IDir, Array] = {idir: np.zeros(cells) for idir in faces}
+        # États reconstruits, dans le repère de chaque direction
+        self.qL: dict[IDir, Array] = {idir: np.zeros(shape + (params.Nfields,)) for idir, shape in faces.items()}
+        self.qR: dict[IDir, Array] = {idir: np.zeros(shape + (params.Nfields,)) for idir, shape in faces.items()}
+        # Flux dans le repère de la direction, puis dans le repère du domaine
+        self.flux_dir: dict[IDir, Array] = {idir: np.zeros(shape + (params.Nfields,)) for idir, shape in faces.items()}
+        self.flux: dict[IDir, Array] = {IDir.IY: np.zeros(faces[IDir.IY] + (params.Nfields,))}
+        self.flux[IDir.IX] = self.flux_dir[IDir.IX]
+        # Vitesse maximale des ondes à chaque interface (params.dt_from_riemann)
+        self.smax: dict[IDir, Array] = {idir: np.zeros(shape) for idir, shape in faces.items()}
+        # Incrément de U sur le domaine
+        self.dU: Array = np.zeros((params.Nx, params.Ny, params.Nfields))
+        # Étapes des schémas Runge-Kutta
+        self.U0: Array = np.zeros(cells)
+        self.Utmp: Array = np.zeros(cells)
+        # Mise à jour par tuiles
+        self.tiles: Optional[ThreadTiles] = (
+            ThreadTiles(params) if params.nthreads != 1 or params.tile_size != 0 else None
+        )
+        # Chronomètres par phase
+        self.timers = Timers(params.timers)
+
+    def buffers(self) -> list[Array]:
+        """Liste des tableaux distincts du Workspace."""
+        arrays: list[Array] = [self.dU, self.U0, self.Utmp]
+        for group in (self.slopes, self.qL, self.qR, self.flux_dir, self.smax):
+            arrays.extend(group.values())
+        arrays.append(self.flux[IDir.IY])
+        return arrays
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les tampons, en octets."""
+        return sum(a.nbytes for a in self.buffers())
+
+    def close(self) -> None:
+        """Arrête les threads de la mise à jour par tuiles, s'il y en a."""
+        if self.tiles is not None:
+            self.tiles.close()
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ThreadTiles:
+    """
+    Tuiles de la mise à jour, calculées par un ThreadPoolExecutor.
+
+    Le domaine est découpé en tuiles d'au plus tile_size x tile_size cellules,
+    calculées chacune comme une petite grille (tiles.TileParams). Les noyaux
+    NumPy relâchent le GIL : nthreads threads calculent les tuiles en
+    parallèle. Chaque thread a ses propres tampons (un Workspace par taille de
+    tuile), assez petits pour rester en cache d'une tuile à l'autre.
+
+    Les threads vivent jusqu'à close (appelé par Workspace.close).
+    """
+
+    def __init__(self, params: Params) -> None:
+        if params.nthreads < 1:
+            raise ValueError(f"nthreads must be at least 1, got {params.nthreads}")
+        if params.tile_size < 0:
+            raise ValueError(f"tile_size must be positive, got {params.tile_size}")
+        if params.backend == "numba" and params.nthreads > 1:
+            # Les noyaux numba sont déjà parallèles (prange), et pas réentrants
+            raise ValueError("The numba backend cannot be used with nthreads > 1")
+        self.tiles: list[Tile] = block_tiles(params, params.tile_size or DEFAULT_TILE_SIZE)
+        # Une tuile est calculée d'un seul tenant, par le thread qui la prend ; elle
+        # est chronométrée en bloc par le Workspace de la grille
+        self.params: list[Params] = [
+            replace(tile_params(params, tile), nthreads=1, tile_size=0, timers=False) for tile in self.tiles
+        ]
+        self.nthreads = params.nthreads
+        self.executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(params.nthreads, thread_name_prefix="pycfd-tile") if params.nthreads > 1 else None
+        )
+        self._local = threading.local()
+
+    def workspace(self, params: Params) -> Workspace:
+        """Workspace du thread courant pour une tuile de la taille de params."""
+        workspaces: dict[tuple[int, int], Workspace] = self._local.__dict__.setdefault("workspaces", {})
+        key = (params.Nx, params.Ny)
+        if key not in workspaces:
+            workspaces[key] = Workspace(params)
+        return workspaces[key]
+
+    def map(self, kernel: Callable[[Tile, Params, Workspace], T]) -> list[T]:
+        """
+        Applique kernel(tuile, paramètres de la tuile, Workspace du thread) à toutes les tuiles.
+
+        Returns:
+        list: Les résultats, dans l'ordre des tuiles.
+        """
+
+        def run(k: int) -> T:
+            return kernel(self.tiles[k], self.params[k], self.workspace(self.params[k]))
+
+        if self.executor is None:
+            return [run(k) for k in range(len(self.tiles))]
+        return list(self.executor.map(run, range(len(self.tiles))))
+
+    def close(self) -> None:
+        """Arrête les threads de l'executor ; map calcule ensuite les tuiles dans le thread appelant."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> "ThreadTiles":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -5,3 +5,20 @@ import sys
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from src.boundaries import fillBoundaries  # noqa: E402
+from src.params import Params  # noqa: E402
+from src.problems import init_problem  # noqa: E402
+from src.states import primToCons  # noqa: E402
+
+
+def initial_state(p: Params) -> tuple[np.ndarray, np.ndarray]:
+    """Variables primitives et conservatives initiales du problème de p, cellules fantômes remplies."""
+    Q = np.zeros((p.Ntx, p.Nty, p.Nfields))
+    U = np.zeros_like(Q)
+    init_problem(Q, p)
+    fillBoundaries(Q, p)
+    primToCons(Q, U, p)
+    return Q, U
@@ -0,0 +1,140 @@
+from dataclasses import replace
+from importlib.util import find_spec
+
+import numpy as np
+import pytest
+
+from conftest import initial_state
+from src.backends import Backend, NumpyBackend, get_backend
+from src.params import Params
+from src.update import cons_to_prim, update
+from src.varindexes import IR, IP, IBX, IBZ
+from src.workspace import Workspace
+
+# Tous les backends doivent donner les résultats du backend numpy, à l'arrondi près
+backends = [
+    "python",
+    "numpy",
+    pytest.param("numba", marks=pytest.mark.skipif(find_spec("numba") is None, reason="numba is not installed")),
+]
+
+orszag_tang = Params(Nx=14, Ny=10, reconstruction="PLM", time_stepping="RK2")
+sod = Params(
+    Nx=20,
+    Ny=4,
+    MHD=False,
+    problem_name="sod_x",
+    gamma=1.4,
+    riemann_solver="hll",
+    boundary_xmin="BC_ABSORBING",
+    boundary_xmax="BC_REFLECTING",
+    reconstruction="PLM_MC",
+    time_stepping="RK3",
+)
+setups = pytest.mark.parametrize("p", [orszag_tang, sod], ids=["orszag_tang", "sod"])
+
+
+def random_states(p, shape, seed=0):
+    """États primitifs physiques aléatoires, dont le champ magnétique change de signe (3 ondes en fivewaves)."""
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(-1.0, 1.0, shape + (p.Nfields,))
+    q[..., IR] = rng.uniform(0.5, 2.0, shape)
+    q[..., IP] = rng.uniform(0.1, 1.0, shape)
+    return q
+
+
+@pytest.mark.parametrize("backend", backends)
+@setups
+def test_conversions(backend, p):
+    kernels, reference = get_backend(backend), get_backend("numpy")
+    Q = random_states(p, (p.Ntx, p.Nty))
+    U, Uref = np.zeros_like(Q), np.zeros_like(Q)
+    kernels.prim_to_cons(Q, U, p)
+    reference.prim_to_cons(Q, Uref, p)
+    np.testing.assert_allclose(U, Uref, rtol=1e-14, atol=1e-15)
+    # seul le domaine est converti
+    assert np.all(U[: p.ibeg] == 0.0)
+
+    Q2 = np.zeros_like(Q)
+    kernels.cons_to_prim(U, Q2, p)
+    np.testing.assert_allclose(Q2[p.slice_dom], Q[p.slice_dom], rtol=1e-12, atol=1e-13)
+
+
+@pytest.mark.parametrize("backend", backends)
+@setups
+def test_time_step(backend, p):
+    Q = random_states(p, (p.Ntx, p.Nty), seed=1)
+    expected = get_backend("numpy").max_inv_dt(Q, p)
+    assert get_backend(backend).max_inv_dt(Q, p) == pytest.approx(expected, rel=1e-14)
+
+
+@pytest.mark.parametrize("backend", backends)
+@setups
+def test_riemann(backend, p):
+    qL = random_states(p, (9, 7), seed=2)
+    qR = random_states(p, (9, 7), seed=3)
+    if p.MHD:
+        # interfaces sans changement de signe de B : solveur 5 ondes complet
+        qR[:4, ..., IBX:IBZ + 1] = np.abs(qR[:4, ..., IBX:IBZ + 1]) * np.sign(qL[:4, ..., IBX:IBZ + 1])
+    flux, expected = np.zeros_like(qL), np.zeros_like(qL)
+    smax, expected_smax = np.zeros((9, 7)), np.zeros((9, 7))
+    get_backend("numpy").riemann(qL, qR, p, expected, expected_smax)
+
+    if backend == "python":
+        get_backend(backend).riemann(qL, qR, p, flux)
+        with pytest.raises(NotImplementedError):
+            get_backend(backend).riemann(qL, qR, p, flux, smax)
+    else:
+        get_backend(backend).riemann(qL, qR, p, flux, smax)
+        np.testing.assert_allclose(smax, expected_smax, rtol=1e-13)
+    np.testing.assert_allclose(flux, expected, rtol=1e-12, atol=1e-13)
+
+
+@pytest.mark.parametrize("backend", backends)
+@pytest.mark.parametrize("bc", ["BC_PERIODIC", "BC_REFLECTING", "BC_ABSORBING"])
+@setups
+def test_fill_boundaries(backend, bc, p):
+    p = replace(p, boundary_ymin=bc, boundary_xmax=bc)
+    Q = random_states(p, (p.Ntx, p.Nty), seed=4)
+    expected = Q.copy()
+    get_backend("numpy").fill_boundaries(expected, p)
+    get_backend(backend).fill_boundaries(Q, p)
+    assert np.array_equal(Q, expected)
+
+
+@pytest.mark.parametrize("backend", backends)
+@setups
+def test_update(backend, p):
+    Q, U = initial_state(p)
+    Qb, Ub = Q.copy(), U.copy()
+    pb = replace(p, backend=backend)
+    ws, wsb = Workspace(p), Workspace(pb)
+    for _ in range(3):
+        dt = 0.5 * get_backend("numpy").max_inv_dt(Q, p) ** -1
+        update(Q, U, dt, p, ws)
+        cons_to_prim(U, Q, p, ws)
+        update(Qb, Ub, dt, pb, wsb)
+        cons_to_prim(Ub, Qb, pb, wsb)
+    np.testing.assert_allclose(Ub[p.slice_dom], U[p.slice_dom], rtol=1e-12, atol=1e-13)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("fortran")
+    assert get_backend("numpy") is get_backend("numpy")
+    with pytest.raises(ValueError):
+        Workspace(replace(orszag_tang, backend="numba", nthreads=2))
+    with pytest.raises(ValueError):
+        Workspace(replace(orszag_tang, backend="python", dt_from_riemann=True))
+
+
+def test_incomplete_backend_cannot_be_created():
+    class Incomplete(Backend):
+        name = "incomplete"
+
+        def prim_to_cons(self, Q, U, params):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert isinstance(NumpyBackend(), Backend)
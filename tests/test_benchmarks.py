@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.suite import cases, compare, run_suite
+
+
+def test_cases_cover_problems_sizes_and_schemes():
+    suite = cases(sizes=(64, 128))
+    assert len(suite) == 2 * 2 * 2 * 3
+    names = {case.name for case in suite}
+    assert len(names) == len(suite)
+    assert "orszag-tang/64x64/fivewaves/PLM/RK2" in names
+    assert "sod_x/128x128/hll/PCM/euler" in names
+    with pytest.raises(ValueError):
+        cases(problems=["kelvin-helmholtz"])
+
+
+def test_run_suite_writes_json_results():
+    suite = cases(sizes=(8,), time_steppings=("RK3",))
+    results = run_suite(suite, nsteps=2, backend="numpy")
+    assert json.loads(json.dumps(results)) == results
+    assert results["config"] == {"nsteps": 2, "backend": "numpy"}
+    assert {"platform", "python", "numpy", "cpu_count"} <= set(results["machine"])
+    assert [r["name"] for r in results["results"]] == [case.name for case in suite]
+    for r in results["results"]:
+        assert r["time_per_step"] > 0.0 and r["mcups"] > 0.0
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    baseline = {"results": [{"name": "a", "time_per_step": 1.0}, {"name": "b", "time_per_step": 1.0}]}
+    results = {"results": [{"name": "a", "time_per_step": 1.05}, {"name": "b", "time_per_step": 1.2},
+                           {"name": "c", "time_per_step": 9.0}]}
+    comparison = compare(results, baseline, threshold=0.1)
+    assert [c["name"] for c in comparison] == ["a", "b"]
+    assert [c["regression"] for c in comparison] == [False, True]
+    assert comparison[1]["ratio"] == pytest.approx(1.2)
+
+
+def test_command_line_returns_1_on_regression(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = ["--problems", "sod_x", "--sizes", "8", "--time-steppings", "euler", "--steps", "1"]
+    assert main(args + ["--output", str(output)]) == 0
+
+    baseline = json.loads(output.read_text())
+    for r in baseline["results"]:
+        r["time_per_step"] *= 1e-6
+    (tmp_path / "fast.json").write_text(json.dumps(baseline))
+    assert main(args + ["--baseline", str(tmp_path / "fast.json")]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
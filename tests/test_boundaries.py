@@ -1,11 +1,15 @@
+from dataclasses import replace
+
 import numpy as np
 import pytest
 
-import src.params as params
+from src.params import Params
 from src.pycfd_types import IDir
 from src import boundaries
 from src.states import State, set_state_into_array, get_state_from_array
 
+params = Params()
+
 
 def make_zero_grid():
     shape = (params.Ntx, params.Nty, params.Nfields)
@@ -33,7 +37,7 @@ def test_fill_reflecting_x():
     # create a ghost cell left of ibeg
     i_ghost = params.ibeg - 1
     j = params.jbeg
-    q = boundaries.fillReflecting(Q, i_ghost, j, params.ibeg, params.jbeg, IDir.IX)
+    q = boundaries.fillReflecting(Q, i_ghost, j, params.ibeg, params.jbeg, IDir.IX, params)
     # velocity in x and bx should flip sign
     assert q[1] == pytest.approx(-interior[1])
     assert q[5] == pytest.approx(-interior[5])
@@ -48,7 +52,7 @@ def test_fill_periodic_x():
 
     # ghost cell to the right (i == params.iend) should map to leftmost domain cell when periodic
     i_ghost = params.iend
-    q = boundaries.fillPeriodic(Q, i_ghost, params.jbeg, IDir.IX)
+    q = boundaries.fillPeriodic(Q, i_ghost, params.jbeg, IDir.IX, params)
     assert np.allclose(q, state_left)
 
 
@@ -61,7 +65,7 @@ def test_fill_reflecting_y():
     # ghost cell below jbeg
     i = params.ibeg
     j_ghost = params.jbeg - 1
-    q = boundaries.fillReflecting(Q, i, j_ghost, i, params.jbeg, IDir.IY)
+    q = boundaries.fillReflecting(Q, i, j_ghost, i, params.jbeg, IDir.IY, params)
     # velocity in y and by should flip sign
     assert q[2] == pytest.approx(-interior[2])
     assert q[6] == pytest.approx(-interior[6])
@@ -76,7 +80,7 @@ def test_fill_periodic_y():
 
     # ghost cell below (j == params.jbeg - 1) should map to top when periodic
     j_ghost = params.jend
-    q = boundaries.fillPeriodic(Q, params.ibeg, j_ghost, IDir.IY)
+    q = boundaries.fillPeriodic(Q, params.ibeg, j_ghost, IDir.IY, params)
     assert np.allclose(q, state_bottom)
 
 
@@ -88,20 +92,61 @@ def test_fill_boundaries_periodic_applies_to_ghosts():
     set_state_into_array(Q, params.ibeg, params.jbeg, sample)
 
     # ensure boundary types are periodic for the test
-    old_x = params.boundary_x
-    old_y = params.boundary_y
-    params.boundary_x = "BC_PERIODIC"
-    params.boundary_y = "BC_PERIODIC"
-    try:
-        boundaries.fillBoundaries(Q)
-        # check left ghost at ibeg-1 equals interior at ibeg+Nx-1 (periodic wrap)
-        left_ghost = get_state_from_array(Q, params.ibeg - 1, params.jbeg)
-        wrapped = get_state_from_array(Q, params.iend - 1, params.jbeg)
-        assert np.allclose(left_ghost, wrapped)
-        # check bottom ghost at jbeg-1 equals interior at jend-1 (periodic wrap in y)
-        bottom_ghost = get_state_from_array(Q, params.ibeg, params.jbeg - 1)
-        wrapped_y = get_state_from_array(Q, params.ibeg, params.jend - 1)
-        assert np.allclose(bottom_ghost, wrapped_y)
-    finally:
-        params.boundary_x = old_x
-        params.boundary_y = old_y
+    periodic = replace(
+        params,
+        boundary_xmin="BC_PERIODIC",
+        boundary_xmax="BC_PERIODIC",
+        boundary_ymin="BC_PERIODIC",
+        boundary_ymax="BC_PERIODIC",
+    )
+    boundaries.fillBoundaries(Q, periodic)
+    # check left ghost at ibeg-1 equals interior at ibeg+Nx-1 (periodic wrap)
+    left_ghost = get_state_from_array(Q, params.ibeg - 1, params.jbeg)
+    wrapped = get_state_from_array(Q, params.iend - 1, params.jbeg)
+    assert np.allclose(left_ghost, wrapped)
+    # check bottom ghost at jbeg-1 equals interior at jend-1 (periodic wrap in y)
+    bottom_ghost = get_state_from_array(Q, params.ibeg, params.jbeg - 1)
+    wrapped_y = get_state_from_array(Q, params.ibeg, params.jend - 1)
+    assert np.allclose(bottom_ghost, wrapped_y)
+
+
+def fill_boundaries_per_cell(Q, bc_xmin, bc_xmax, bc_ymin, bc_ymax):
+    """Reference implementation built on the per-cell fill functions."""
+
+    def fill(bc, i, j, iref, jref, idir):
+        match bc:
+            case "BC_ABSORBING":
+                return boundaries.fillAbsorbing(Q, iref, jref, idir)
+            case "BC_REFLECTING":
+                return boundaries.fillReflecting(Q, i, j, iref, jref, idir, params)
+            case _:
+                return boundaries.fillPeriodic(Q, i, j, idir, params)
+
+    for i, j in params.range_xbound:
+        iright = params.iend + i
+        set_state_into_array(Q, i, j, fill(bc_xmin, i, j, params.ibeg, j, IDir.IX))
+        set_state_into_array(Q, iright, j, fill(bc_xmax, iright, j, params.iend - 1, j, IDir.IX))
+    for i, j in params.range_ybound:
+        jtop = params.jend + j
+        set_state_into_array(Q, i, j, fill(bc_ymin, i, j, i, params.jbeg, IDir.IY))
+        set_state_into_array(Q, i, jtop, fill(bc_ymax, i, jtop, i, params.jend - 1, IDir.IY))
+
+
+@pytest.mark.parametrize(
+    "bcs",
+    [
+        ("BC_PERIODIC", "BC_PERIODIC", "BC_PERIODIC", "BC_PERIODIC"),
+        ("BC_REFLECTING", "BC_REFLECTING", "BC_ABSORBING", "BC_ABSORBING"),
+        ("BC_ABSORBING", "BC_REFLECTING", "BC_PERIODIC", "BC_REFLECTING"),
+        ("BC_PERIODIC", "BC_PERIODIC", "BC_REFLECTING", "BC_ABSORBING"),
+    ],
+)
+def test_fill_boundaries_matches_per_cell_fill(bcs):
+    rng = np.random.default_rng(0)
+    Q = rng.normal(size=(params.Ntx, params.Nty, params.Nfields))
+    expected = Q.copy()
+    fill_boundaries_per_cell(expected, *bcs)
+
+    sides = dict(zip(["boundary_xmin", "boundary_xmax", "boundary_ymin", "boundary_ymax"], bcs))
+    boundaries.fillBoundaries(Q, replace(params, **sides))
+    assert np.array_equal(Q, expected)
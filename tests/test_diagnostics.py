@@ -0,0 +1,71 @@
+import sys
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from conftest import initial_state
+import main
+from src.diagnostics import Diagnostics, read_diagnostics
+from src.params import Params
+from src.varindexes import IR, IE, IP
+
+params = Params(Nx=16, Ny=12, diagnostics_frequency=2)
+
+
+def test_reductions_match_direct_sums():
+    Q, U = initial_state(params)
+    values = Diagnostics(params).compute(Q, U)
+    dom, dV = params.slice_dom, params.dx * params.dy
+    assert values["mass"] == pytest.approx(U[dom][..., IR].sum() * dV)
+    assert values["energy"] == pytest.approx(U[dom][..., IE].sum() * dV)
+    assert values["min_prs"] == Q[dom][..., IP].min()
+    # les énergies cinétique, magnétique et interne redonnent l'énergie totale
+    internal = Q[dom][..., IP].sum() * dV / (params.gamma - 1)
+    assert values["kinetic_energy"] + values["magnetic_energy"] + internal == pytest.approx(values["energy"])
+    # Orszag-Tang : bx ne dépend que de y, by que de x
+    assert values["max_divB"] == 0.0
+
+
+def test_selection_and_hydro_runs():
+    hydro = replace(params, MHD=False, problem_name="sod_x")
+    assert "magnetic_energy" not in Diagnostics(hydro).names
+    with pytest.raises(ValueError):
+        Diagnostics(replace(hydro, diagnostics="mass,max_divB"))
+    with pytest.raises(ValueError):
+        Diagnostics(replace(params, diagnostics_format="parquet"))
+    assert Diagnostics(replace(params, diagnostics="min_rho, mass")).names == ["min_rho", "mass"]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "hdf5"])
+def test_series_are_appended_and_truncated_on_restart(tmp_path, fmt):
+    p = replace(params, diagnostics_format=fmt, diagnostics="mass,min_rho")
+    Q, U = initial_state(p)
+    with Diagnostics(p, dirname=tmp_path) as diags:
+        for step in range(0, 8, 2):
+            diags.write(Q, U, 0.1 * step, step)
+    data = read_diagnostics(diags.filename)
+    assert list(data["step"]) == [0, 2, 4, 6]
+    assert np.allclose(data["time"], [0.0, 0.2, 0.4, 0.6])
+    assert np.all(data["min_rho"] == data["min_rho"][0])
+
+    # reprise au pas 4 : les lignes des pas 4 et 6 sont réécrites
+    with Diagnostics(p, dirname=tmp_path, start_step=4) as diags:
+        diags.write(Q, U, 0.4, 4)
+    assert list(read_diagnostics(diags.filename)["step"]) == [0, 2, 4]
+
+
+def test_main_writes_diagnostics_at_their_own_cadence(tmp_path, monkeypatch):
+    (tmp_path / "run.ini").write_text(
+        "[mesh]\nNx = 12\nNy = 10\n[run]\ntend = 0.05\n[output]\nsave_freq = 1.0\ndiagnostics_frequency = 3\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "run.ini"])
+    assert main.main() == 0
+
+    data = read_diagnostics(tmp_path / "data" / "diagnostics.csv")
+    assert data["step"][0] == 0 and np.all(np.diff(data["step"]) == 3)
+    # périodique : masse et énergie totale conservées
+    assert np.allclose(data["mass"], data["mass"][0], rtol=1e-13)
+    assert np.allclose(data["energy"], data["energy"][0], rtol=1e-13)
+    assert len(list((tmp_path / "data").glob("ite_*.h5"))) == 2
@@ -0,0 +1,168 @@
+from dataclasses import replace
+
+import h5py
+import numpy as np
+import pytest
+
+from src.iomanager import IOManager
+from src.params import Params
+
+params = Params(Nx=6, Ny=4)
+
+
+def random_grid(p):
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(p.Ntx, p.Nty, p.Nfields))
+
+
+def flat_reference(Q, i0, iN, j0, jN, ivar):
+    """Ordre des anciennes sorties à plat : j en boucle externe, i en boucle interne."""
+    return np.array([Q[i, j, ivar] for j in range(j0, jN) for i in range(i0, iN)])
+
+
+@pytest.mark.parametrize("ghosts", [False, True])
+def test_snapshot_fields_are_2d_and_match_flat_layout(tmp_path, ghosts):
+    p = replace(params, write_ghost_cells=ghosts)
+    io = IOManager(p, dirname=str(tmp_path))
+    Q = random_grid(p)
+    io.save_solution(Q, 3, 0.25)
+
+    with h5py.File(tmp_path / "ite_0003.h5", "r") as f:
+        assert f["rho"].shape == (io.fNy, io.fNx)
+        assert f["x"].shape == (io.gNy, io.gNx)
+        for name, ivar in io.fields.items():
+            ref = flat_reference(Q, io.i0, io.iN, io.j0, io.jN, ivar)
+            assert np.array_equal(f[name][...].ravel(), ref)
+        # sommets : x varie le long des colonnes, y le long des lignes
+        assert f["x"][0, 1] - f["x"][0, 0] == pytest.approx(p.dx)
+        assert f["y"][1, 0] - f["y"][0, 0] == pytest.approx(p.dy)
+        x0 = p.xmin - (p.Nghosts * p.dx if ghosts else 0.0)
+        assert f["x"][0, 0] == pytest.approx(x0)
+
+
+def test_hydro_runs_only_write_existing_fields(tmp_path):
+    p = replace(params, MHD=False)
+    io = IOManager(p, dirname=str(tmp_path))
+    io.save_solution(random_grid(p), 1, 0.0)
+    with h5py.File(tmp_path / "ite_0001.h5", "r") as f:
+        assert set(f.keys()) == {"x", "y", "rho", "u", "v", "w", "prs"}
+
+
+def test_async_output_matches_synchronous_output(tmp_path):
+    Q = random_grid(params)
+    IOManager(params, dirname=str(tmp_path / "sync")).save_solution(Q, 1, 0.1)
+
+    with IOManager(replace(params, async_output=True), dirname=str(tmp_path / "async")) as io:
+        io.save_solution(Q, 1, 0.1)
+        # le tampon est une copie : Q peut être modifié dès le retour de l'appel
+        Q[...] = -1.0
+        io.save_solution(Q, 2, 0.2)
+        io.save_solution(Q, 3, 0.3)
+
+    with h5py.File(tmp_path / "sync" / "ite_0001.h5", "r") as ref, h5py.File(tmp_path / "async" / "ite_0001.h5") as f:
+        for name in io.fields:
+            assert np.array_equal(f[name][...], ref[name][...])
+    with h5py.File(tmp_path / "async" / "ite_0003.h5", "r") as f:
+        assert f.attrs["time"] == 0.3
+        assert np.all(f["rho"][...] == -1.0)
+
+
+def test_async_write_errors_are_raised_on_flush(tmp_path):
+    io = IOManager(replace(params, async_output=True), dirname=str(tmp_path))
+    io.save_solution(np.zeros((params.Ntx, params.Nty, params.Nfields)), 1, 0.0)
+    io.flush()
+    (tmp_path / "ite_0002.h5").mkdir()  # impossible d'y créer un fichier
+    io.save_solution(np.zeros((params.Ntx, params.Nty, params.Nfields)), 2, 0.0)
+    with pytest.raises(OSError):
+        io.close()
+    io.close()
+
+
+def test_compressed_float32_output(tmp_path):
+    p = replace(params, output_precision=4, output_compression="gzip", output_chunks=4)
+    io = IOManager(p, dirname=str(tmp_path))
+    Q = random_grid(p)
+    io.save_solution(Q, 1, 0.0)
+    with h5py.File(tmp_path / "ite_0001.h5", "r") as f:
+        rho = f["rho"]
+        assert rho.dtype == np.float32
+        assert rho.compression == "gzip" and rho.shuffle
+        assert rho.chunks == (4, 4)
+        assert np.allclose(rho[...], io.field_views(Q)["rho"], rtol=1e-6)
+        assert f["x"].dtype == np.float64
+    xmf = (tmp_path / "ite_0001.xmf").read_text()
+    assert '&file;/rho</DataItem>' in xmf
+    assert 'Precision="4" Format="HDF">&file;/rho' in xmf
+    assert 'Precision="8" Format="HDF">&file;/x' in xmf
+
+
+def test_field_selection_restricts_datasets_and_xmf(tmp_path):
+    p = replace(params, output_fields="rho, prs,bx,by,bz", output_compression="lzf")
+    io = IOManager(p, dirname=str(tmp_path))
+    io.save_solution(random_grid(p), 1, 0.0)
+    with h5py.File(tmp_path / "ite_0001.h5", "r") as f:
+        assert set(f.keys()) == {"x", "y", "rho", "prs", "bx", "by", "bz"}
+        assert f["bx"].compression == "lzf"
+    xmf = (tmp_path / "ite_0001.xmf").read_text()
+    assert 'Name="magnetic"' in xmf
+    assert 'Name="velocity"' not in xmf and "/psi" not in xmf
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"output_fields": "rho,temperature"},
+        {"output_precision": 2},
+        {"output_compression": "zstd"},
+        {"output_backend": "netcdf"},
+    ],
+)
+def test_invalid_output_options_are_rejected(tmp_path, options):
+    with pytest.raises(ValueError):
+        IOManager(replace(params, **options), dirname=str(tmp_path))
+
+
+def test_hydro_field_selection_cannot_request_magnetic_fields(tmp_path):
+    with pytest.raises(ValueError):
+        IOManager(replace(params, MHD=False, output_fields="rho,bx"), dirname=str(tmp_path))
+
+
+@pytest.mark.parametrize("async_output", [False, True])
+def test_unique_output_appends_time_steps(tmp_path, async_output):
+    p = replace(params, unique_output=True, async_output=async_output, output_compression="gzip")
+    grids = [random_grid(p) + n for n in range(3)]
+    with IOManager(p, outname="run", dirname=str(tmp_path)) as io:
+        for n, Q in enumerate(grids):
+            io.save_solution(Q, 10 * n, 0.1 * n)
+        assert not (tmp_path / "run.xmf").exists()
+
+    with h5py.File(tmp_path / "run.h5", "r") as f:
+        assert f["rho"].shape == (3, io.fNy, io.fNx)
+        assert f["rho"].maxshape[0] is None
+        assert list(f["iteration"][...]) == [0, 10, 20]
+        assert np.allclose(f["time"][...], [0.0, 0.1, 0.2])
+        # une tranche temporelle en un seul hyperslab
+        assert np.array_equal(f["prs"][:, 1, 2], [io.field_views(Q)["prs"][1, 2] for Q in grids])
+
+    data = io.load_solution(20)
+    assert data["time"] == pytest.approx(0.2)
+    assert np.array_equal(data["rho"], io.field_views(grids[2])["rho"])
+
+
+def test_unique_output_xmf_is_valid_and_lists_every_step(tmp_path):
+    import xml.etree.ElementTree as ET
+
+    p = replace(params, unique_output=True)
+    io = IOManager(p, outname="run", dirname=str(tmp_path))
+    for n in range(4):
+        io.save_solution(random_grid(p), n, 0.5 * n)
+    io.close()
+    io.close()
+
+    root = ET.fromstring((tmp_path / "run.xmf").read_text())
+    grids = [g for g in root.iter("Grid") if g.get("GridType") == "Uniform"]
+    assert [g.find("Time").get("Value") for g in grids] == ["0.0", "0.5", "1.0", "1.5"]
+    slabs = [d for d in grids[3].iter("DataItem") if d.get("ItemType") == "HyperSlab"]
+    assert len(slabs) == len(io.fields)
+    assert slabs[0][0].text.split()[:3] == ["3", "0", "0"]
+    assert slabs[0][1].get("Dimensions") == f"4 {io.fNy} {io.fNx}"
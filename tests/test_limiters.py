@@ -0,0 +1,73 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src.params import Params
+from src import limiters, update
+from src.problems import init_problem
+from src.boundaries import fillBoundaries
+from src.pycfd_types import IDir
+from src.workspace import Workspace
+
+
+@pytest.mark.parametrize("name", list(limiters.limiters))
+def test_limiters_vanish_at_extrema_and_are_symmetric(name):
+    limiter = limiters.limiters[name]
+    dL = np.array([1.0, -2.0, 0.0, 0.5, -0.3])
+    dR = np.array([-1.0, 3.0, 1.0, 0.5, -0.6])
+    res = limiter(dL, dR)
+    assert np.all(res[:3] == 0.0)
+    assert np.allclose(limiter(dR, dL), res)
+    assert np.allclose(limiter(-dL, -dR), -res)
+    # smooth data: the limiter returns the common slope
+    assert res[3] == pytest.approx(0.5)
+
+
+def test_limiter_values():
+    dL = np.array([1.0])
+    dR = np.array([3.0])
+    assert limiters.minmod(dL, dR)[0] == pytest.approx(1.0)
+    assert limiters.monotonized_central(dL, dR)[0] == pytest.approx(2.0)
+    assert limiters.van_leer(dL, dR)[0] == pytest.approx(1.5)
+    assert limiters.superbee(dL, dR)[0] == pytest.approx(2.0)
+
+
+def test_minmod_matches_scalar_version():
+    rng = np.random.default_rng(0)
+    dL = rng.normal(size=50)
+    dR = rng.normal(size=50)
+    expected = [update.minmod(a, b) for a, b in zip(dL, dR)]
+    assert np.allclose(limiters.minmod(dL, dR), expected)
+
+
+def test_get_limiter_from_reconstruction():
+    assert limiters.get_limiter("PLM") is limiters.minmod
+    assert limiters.get_limiter("PLM_MC") is limiters.monotonized_central
+    assert limiters.get_limiter("plm_vanleer") is limiters.van_leer
+    with pytest.raises(AssertionError):
+        limiters.get_limiter("PLM_UNKNOWN")
+
+
+def test_compute_slopes_covers_domain_and_first_ghost_layer():
+    params = replace(Params(), problem_name="orszag-tang", reconstruction="PLM")
+    Q = np.zeros((params.Ntx, params.Nty, params.Nfields))
+    init_problem(Q, params)
+    fillBoundaries(Q, params)
+    ws = Workspace(params)
+    update.compute_slopes(Q, params, ws)
+    slopesX, slopesY = ws.slopes[IDir.IX], ws.slopes[IDir.IY]
+
+    cells = [
+        (params.ibeg - 1, params.jbeg - 1),
+        (params.ibeg + 3, params.jbeg + 5),
+        (params.iend, params.jend),
+    ]
+    for i, j in cells:
+        for ivar in range(params.Nfields):
+            dL = Q[i, j, ivar] - Q[i - 1, j, ivar]
+            dR = Q[i + 1, j, ivar] - Q[i, j, ivar]
+            dU = Q[i, j, ivar] - Q[i, j - 1, ivar]
+            dD = Q[i, j + 1, ivar] - Q[i, j, ivar]
+            assert slopesX[i, j, ivar] == pytest.approx(update.minmod(dL, dR))
+            assert slopesY[i, j, ivar] == pytest.approx(update.minmod(dU, dD))
@@ -0,0 +1,94 @@
+import sys
+from dataclasses import replace
+
+import h5py
+import numpy as np
+import pytest
+
+import main
+from conftest import initial_state
+from src.parallel import ParallelSolver, decompose, process_grid, tile_params
+from src.params import Params
+from src.states import consToPrim
+from src.timestep import compute_dt
+from src.update import update
+from src.workspace import Workspace
+
+orszag_tang = Params(Nx=24, Ny=20, reconstruction="PLM", time_stepping="RK2")
+sod = Params(
+    Nx=32,
+    Ny=6,
+    MHD=False,
+    problem_name="sod_x",
+    gamma=1.4,
+    boundary_xmin="BC_ABSORBING",
+    boundary_xmax="BC_REFLECTING",
+    riemann_solver="hll",
+    reconstruction="PLM_MC",
+    time_stepping="RK3",
+)
+
+
+def test_tiles_cover_the_domain():
+    p = Params(Nx=30, Ny=12)
+    assert process_grid(p, 4) == (4, 1)
+    assert process_grid(replace(p, Nx=12), 4) == (2, 2)
+    tiles = decompose(p, 6)
+    covered = np.zeros((p.Ntx, p.Nty), dtype=int)
+    for tile in tiles:
+        covered[tile.region] += 1
+    assert np.all(covered[p.slice_dom] == 1) and covered.sum() == p.Nx * p.Ny
+    assert [t.rank for t in tiles] == list(range(6))
+
+    tp = tile_params(p, tiles[-1])
+    assert (tp.dx, tp.dy) == (p.dx, p.dy)
+    assert tp.xmax == pytest.approx(p.xmax)
+    with pytest.raises(ValueError):
+        decompose(replace(p, Nx=6, Ny=6), 16)
+
+
+@pytest.mark.parametrize("p, nprocs", [(orszag_tang, 3), (sod, 4)])
+def test_parallel_run_reproduces_the_serial_run(p, nprocs):
+    Q, U = initial_state(p)
+    ws = Workspace(p)
+    Qp, Up = Q.copy(), U.copy()
+    with ParallelSolver(p, nprocs) as solver:
+        solver.load(Qp, Up)
+        for _ in range(4):
+            dt = compute_dt(Q, 0.0, False, p)
+            assert solver.compute_dt(0.0, False) == dt
+            update(Q, U, dt, p, ws)
+            consToPrim(U, Q, p)
+            solver.update(Qp, Up, dt)
+    dom = p.slice_dom
+    assert np.array_equal(Up[dom], U[dom])
+    assert np.array_equal(Qp[dom], Q[dom])
+
+
+def test_failures_do_not_hang():
+    with pytest.raises(ValueError):
+        ParallelSolver(replace(orszag_tang, dt_from_riemann=True), 2)
+
+    solver = ParallelSolver(orszag_tang, 2)
+    Q, U = initial_state(orszag_tang)
+    solver.load(Q, U)
+    solver._procs[1].kill()
+    with pytest.raises(RuntimeError):
+        solver.update(Q, U, 1e-3)
+    solver.close()
+
+
+def test_main_with_several_processes(tmp_path, monkeypatch):
+    setup = "[mesh]\nNx = 16\nNy = 12\n[run]\ntend = 0.02\ntime_stepping = RK2\n[output]\nsave_freq = 1.0\n"
+    for nprocs in (1, 2):
+        rundir = tmp_path / str(nprocs)
+        rundir.mkdir()
+        (rundir / "run.ini").write_text(setup + f"[parallel]\nnprocs = {nprocs}\n")
+        monkeypatch.chdir(rundir)
+        monkeypatch.setattr(sys, "argv", ["main.py", "run.ini"])
+        assert main.main() == 0
+
+    with h5py.File(tmp_path / "1/data/ite_0002.h5") as ref, h5py.File(tmp_path / "2/data/ite_0002.h5") as f:
+        assert f.attrs["time"] == ref.attrs["time"]
+        for name in ["rho", "prs", "bx"]:
+            assert np.array_equal(f[name][...], ref[name][...])
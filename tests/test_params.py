@@ -0,0 +1,60 @@
+from dataclasses import FrozenInstanceError, replace
+from pathlib import Path
+
+import pytest
+
+from src.params import Params, params_from_dict, readInifile
+
+SETUPS = Path(__file__).resolve().parents[1] / "setups"
+
+
+def test_params_are_immutable_and_derived_quantities_follow():
+    params = Params()
+    with pytest.raises(FrozenInstanceError):
+        params.Nx = 64  # type: ignore[misc]
+
+    small = replace(params, Nx=16, Ny=8, MHD=False)
+    assert (small.Ntx, small.Nty, small.Nfields) == (20, 12, 5)
+    assert small.dx == pytest.approx(1 / 16)
+    assert small.slice_dom == (slice(2, 18), slice(2, 10))
+    assert params.Nx == 128
+
+
+def test_ranges_are_lazy():
+    params = Params(Nx=3, Ny=2)
+    rng = params.range_dom
+    assert not isinstance(rng, (list, tuple))
+    assert list(rng) == [(i, j) for i in range(2, 5) for j in range(2, 4)]
+
+
+def test_read_ini_file(tmp_path):
+    path = tmp_path / "run.ini"
+    path.write_text("[physics]\nproblem_name = sod_x\nMHD = false\n\n[mesh]\nNx = 64\nxmax = 2.0\n")
+    params = readInifile(path)
+    assert params.problem_name == "sod_x"
+    assert params.MHD is False
+    assert params.Nx == 64 and isinstance(params.Nx, int)
+    assert params.xmax == 2.0 and isinstance(params.xmax, float)
+    # missing values keep their default
+    assert params.Ny == Params().Ny
+
+
+def test_read_toml_file(tmp_path):
+    path = tmp_path / "run.toml"
+    path.write_text('[run]\ntime_stepping = "RK3"\nCFL = 0.4\n\n[mesh]\nNy = 32\n')
+    params = readInifile(path)
+    assert (params.time_stepping, params.CFL, params.Ny) == ("RK3", 0.4, 32)
+
+
+def test_bundled_setups_can_be_read():
+    assert readInifile(SETUPS / "orszag_tang.ini") == Params()
+    assert readInifile(SETUPS / "sod_x.toml").problem_name == "sod_x"
+
+
+def test_unknown_or_invalid_values_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        params_from_dict({"mesh": {"Nz": 4}})
+    with pytest.raises(ValueError):
+        params_from_dict({"MHD": "maybe"})
+    with pytest.raises(FileNotFoundError):
+        readInifile(tmp_path / "missing.ini")
@@ -0,0 +1,121 @@
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.iomanager import IOManager
+from src.params import Params
+from src.reader import SnapshotReader, iter_run
+
+params = Params(Nx=8, Ny=6)
+
+
+def write_run(dirname, p, nsnap=4):
+    rng = np.random.default_rng(1)
+    grids = [rng.normal(size=(p.Ntx, p.Nty, p.Nfields)) for _ in range(nsnap)]
+    with IOManager(p, outname="run", dirname=str(dirname)) as io:
+        for n, Q in enumerate(grids):
+            io.save_solution(Q, n + 1, 0.1 * n)
+    return io, grids
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"output_compression": "gzip"},
+        {"unique_output": True},
+        {"unique_output": True, "output_precision": 4},
+        {"output_backend": "npy"},
+        {"output_backend": "npy", "unique_output": True, "output_precision": 4},
+    ],
+)
+def test_reader_matches_written_fields(tmp_path, options):
+    p = replace(params, **options)
+    io, grids = write_run(tmp_path, p)
+    tol = 1e-6 if p.output_precision == 4 else 0.0
+
+    with SnapshotReader(tmp_path) as run:
+        assert len(run) == 4
+        assert run.unique_output == p.unique_output
+        assert set(run.fields) == set(io.fields)
+        assert list(run.iterations) == [1, 2, 3, 4]
+        assert np.allclose(run.times, [0.0, 0.1, 0.2, 0.3])
+
+        snap = run[2]
+        expected = io.field_views(grids[2])
+        assert np.allclose(snap["rho"], expected["rho"], rtol=tol, atol=0)
+        assert np.allclose(snap["prs", 1:3, 2:7], expected["prs"][1:3, 2:7], rtol=tol, atol=0)
+
+        series = run.series("u", region=(slice(2, 3), slice(None)), steps=slice(1, None))
+        assert series.shape == (3, 1, io.fNx)
+        assert np.allclose(series[:, 0], [io.field_views(Q)["u"][2] for Q in grids[1:]], rtol=tol, atol=0)
+
+        x, y = run.coordinates()
+        assert np.array_equal(x, io.x_coords) and np.array_equal(y, io.y_coords)
+
+
+def test_uncompressed_snapshots_are_memory_mapped(tmp_path):
+    write_run(tmp_path / "raw", params, nsnap=2)
+    assert isinstance(SnapshotReader(tmp_path / "raw").read("rho", 1), np.memmap)
+    write_run(tmp_path / "gzip", replace(params, output_compression="gzip"), nsnap=2)
+    assert not isinstance(SnapshotReader(tmp_path / "gzip").read("rho", 1), np.memmap)
+    write_run(tmp_path / "npy", replace(params, output_backend="npy"), nsnap=2)
+    assert isinstance(SnapshotReader(tmp_path / "npy").read("rho", 1), np.memmap)
+
+
+def test_unique_npy_file_grows_beyond_its_capacity(tmp_path):
+    # tend / save_freq = 1 : place pour 3 sorties seulement
+    p = replace(params, output_backend="npy", unique_output=True, tend=0.01)
+    io, grids = write_run(tmp_path, p, nsnap=5)
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["run.json", "run.npy"]
+    with SnapshotReader(tmp_path) as run:
+        assert len(run) == 5
+        assert np.array_equal(run.read("by", 4), io.field_views(grids[4])["by"])
+
+
+def test_npy_backend_does_not_import_h5py(tmp_path):
+    script = f"""
+import sys
+import numpy as np
+from src.iomanager import IOManager
+from src.params import Params
+from src.reader import SnapshotReader
+p = Params(Nx=8, Ny=6, output_backend="npy")
+with IOManager(p, dirname={str(tmp_path)!r}) as io:
+    io.save_solution(np.ones((p.Ntx, p.Nty, p.Nfields)), 1, 0.0)
+assert SnapshotReader({str(tmp_path)!r}).read("rho", 0).sum() == p.Nx * p.Ny
+assert "h5py" not in sys.modules
+"""
+    root = Path(__file__).resolve().parents[1]
+    subprocess.run([sys.executable, "-c", script], cwd=root, check=True)
+
+
+def test_iter_run_is_lazy_generator(tmp_path):
+    write_run(tmp_path, replace(params, unique_output=True))
+    snapshots = iter_run(tmp_path)
+    first = next(snapshots)
+    assert (first.step, first.iteration) == (0, 1)
+    assert [snap.time for snap in snapshots] == pytest.approx([0.1, 0.2, 0.3])
+
+
+def test_reader_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SnapshotReader(tmp_path)
+    write_run(tmp_path, params, nsnap=1)
+    run = SnapshotReader(tmp_path)
+    with pytest.raises(KeyError):
+        run.read("temperature", 0)
+    with pytest.raises(IndexError):
+        run[1]
+
+
+def test_load_solution_follows_the_output_mode(tmp_path):
+    for n, p in enumerate([params, replace(params, unique_output=True), replace(params, output_backend="npy")]):
+        io, grids = write_run(tmp_path / str(n), p, nsnap=2)
+        data = io.load_solution(2)
+        assert data["time"] == pytest.approx(0.1)
+        assert np.array_equal(data["rho"], io.field_views(grids[1])["rho"])
@@ -0,0 +1,89 @@
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+import main
+from src.iomanager import IOManager, StreamState
+from src.params import Params
+from src.reader import SnapshotReader
+
+SETUP = """
+[mesh]
+Nx = 12
+Ny = 10
+[run]
+tend = 0.1
+reconstruction = PLM
+time_stepping = RK2
+dt_from_riemann = true
+[output]
+save_freq = 0.02
+checkpoint_frequency = 4
+"""
+
+
+def run_main(monkeypatch, rundir, setup):
+    rundir.mkdir()
+    (rundir / "run.ini").write_text(setup)
+    monkeypatch.chdir(rundir)
+    monkeypatch.setattr(sys, "argv", ["main.py", "run.ini"])
+    assert main.main() == 0
+    return rundir / "data"
+
+
+def test_checkpoint_roundtrip_reads_into_preallocated_arrays(tmp_path):
+    params = Params(Nx=6, Ny=4)
+    io = IOManager(params, dirname=str(tmp_path))
+    rng = np.random.default_rng(0)
+    Q, U = rng.normal(size=(2, params.Ntx, params.Nty, params.Nfields))
+    streams = {"": StreamState(3, 0.13), "cut": StreamState(7, 0.1 + 0.2)}
+    filename = io.save_checkpoint(Q, U, 0.125, 42, streams, None)
+    assert filename.name == "checkpoint_0042.h5"
+    assert not list(tmp_path.glob("*.tmp"))
+
+    Q2, U2 = np.zeros_like(Q), np.zeros_like(U)
+    info = io.load_checkpoint(filename, Q2, U2)
+    assert np.array_equal(Q2, Q) and np.array_equal(U2, U)
+    assert (info.time, info.step, info.dt_next) == (0.125, 42, None)
+    assert info.streams == streams
+
+    with pytest.raises(ValueError):
+        io.load_checkpoint(filename, np.zeros((4, 4, params.Nfields)), U2)
+
+
+def test_restart_continues_bit_for_bit(tmp_path, monkeypatch, capsys):
+    full = run_main(monkeypatch, tmp_path / "full", SETUP)
+    checkpoint = full / "checkpoint_0004.h5"
+    with h5py.File(checkpoint, "r") as f:
+        assert f["Q"].shape == (16, 14, 9)
+        assert not np.isnan(f.attrs["dt_next"])
+
+    restart = run_main(monkeypatch, tmp_path / "restart", SETUP + f"restart_file = {checkpoint}\n")
+    assert "Restart at step 4" in capsys.readouterr().out
+
+    last = sorted(full.glob("ite_*.h5"))[-1]
+    assert (restart / last.name).exists()
+    with h5py.File(last, "r") as ref, h5py.File(restart / last.name, "r") as f:
+        assert f.attrs["time"] == ref.attrs["time"]
+        for name in ["rho", "u", "v", "prs", "bx", "by"]:
+            assert np.array_equal(f[name][...], ref[name][...])
+
+
+@pytest.mark.parametrize("backend", ["hdf5", "npy"])
+def test_restart_keeps_unique_output_written_before_checkpoint(tmp_path, monkeypatch, backend):
+    setup = SETUP + f"unique_output = true\noutput_backend = {backend}\n"
+    data = run_main(monkeypatch, tmp_path / "run", setup)
+    with SnapshotReader(data) as run:
+        iterations, times = run.iterations.copy(), run.times.copy()
+        rho = run.series("rho")
+    assert len(iterations) > 4
+
+    # Reprise dans le même dossier : le fichier unique est complété, pas réécrit
+    (tmp_path / "run" / "run.ini").write_text(setup + f"restart_file = {data / 'checkpoint_0004.h5'}\n")
+    assert main.main() == 0
+    with SnapshotReader(data) as run:
+        assert np.array_equal(run.iterations, iterations)
+        assert np.array_equal(run.times, times)
+        assert np.array_equal(run.series("rho"), rho)
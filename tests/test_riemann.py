@@ -0,0 +1,62 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from src import riemann
+from src.params import Params
+from src.states import State
+from src.varindexes import IR, IP, IBX, IBZ
+
+params = Params()
+
+
+def random_prim_states(n, seed):
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(-1.0, 1.0, size=(n, params.Nfields))
+    q[:, IR] = rng.uniform(0.2, 2.0, size=n)
+    q[:, IP] = rng.uniform(0.05, 2.0, size=n)
+    return q
+
+
+def scalar_fluxes(qL, qR):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.array([riemann.fivewaves(State(a), State(b), params) for a, b in zip(qL, qR)])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_array_fivewaves_matches_scalar_solver(seed):
+    qL = random_prim_states(200, seed)
+    qR = random_prim_states(200, seed + 100)
+    # Some interfaces with aligned fields (five waves), the others fall back on three waves
+    qR[:100, IBX:IBZ + 1] = np.abs(qR[:100, IBX:IBZ + 1]) * np.sign(qL[:100, IBX:IBZ + 1])
+    # Weak fields to trigger the low-beta / Alfven branch selection
+    qL[150:, IBX:IBZ + 1] *= 1e-3
+    qL[130:150, IP] = 1e-6
+    qR[130:150, IP] = 1e-6
+
+    flux = riemann.array_fivewaves(qL, qR, params)
+    assert np.allclose(flux, scalar_fluxes(qL, qR), rtol=1e-12, atol=1e-14)
+
+
+def test_array_fivewaves_accepts_grid_shaped_input():
+    qL = random_prim_states(12, 3).reshape(3, 4, params.Nfields)
+    qR = random_prim_states(12, 4).reshape(3, 4, params.Nfields)
+    out = np.zeros_like(qL)
+
+    res = riemann.array_fivewaves(qL, qR, params, out=out)
+    assert res is out
+    assert np.allclose(out.reshape(12, -1), scalar_fluxes(qL.reshape(12, -1), qR.reshape(12, -1)))
+
+
+def test_array_fivewaves_without_magnetic_field():
+    qL = random_prim_states(10, 5)
+    qR = random_prim_states(10, 6)
+    qL[:, IBX:IBZ + 1] = 0.0
+    qR[:, IBX:IBZ + 1] = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        flux = riemann.array_fivewaves(qL, qR, params)
+    assert np.all(np.isfinite(flux))
+    assert np.allclose(flux, scalar_fluxes(qL, qR))
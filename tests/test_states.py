@@ -2,8 +2,10 @@ import numpy as np
 import pytest
 
 from src import states
-import src.params as params
-from src.varindexes import IR, IBX, IBY, IBZ
+from src.params import Params
+from src.varindexes import IR, IP, IBX, IBY, IBZ
+
+params = Params()
 
 
 def make_zero_grid():
@@ -57,13 +59,13 @@ def test_cell_prim_cons_roundtrip():
     # build a primitive state q (rho, u, v, w, p, bx, by, bz, psi)
     q = states.State(np.array([1.2, 0.3, -0.1, 0.0, 2.5, 0.01, -0.02, 0.0, 0.0]))
 
-    u = states.cell_primToCons(q)
+    u = states.cell_primToCons(q, params)
     assert isinstance(u, states.State)
     # mass conserved
     assert pytest.approx(u[IR]) == q[IR]
 
     # convert back
-    q2 = states.cell_consToPrim(u)
+    q2 = states.cell_consToPrim(u, params)
     assert isinstance(q2, states.State)
     # density and magnetic field components should match within tolerance
     assert pytest.approx(q2[IR], rel=1e-12) == q[IR]
@@ -101,13 +103,53 @@ def test_grid_conversion_helpers():
         )
 
     # Convert prim->cons into U
-    states.primToCons(Q, U)
+    states.primToCons(Q, U, params)
     # Convert cons->prim back into Q2
     Q2 = make_zero_grid()
-    states.consToPrim(U, Q2)
+    states.consToPrim(U, Q2, params)
 
     # check a sample domain cell
     sample_i, sample_j = params.ibeg, params.jbeg
     q_orig = states.get_state_from_array(Q, sample_i, sample_j)
     q_round = states.get_state_from_array(Q2, sample_i, sample_j)
     assert np.allclose(q_orig, q_round)
+
+
+def random_prim_block(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    q = rng.uniform(-1.0, 1.0, size=shape + (params.Nfields,))
+    q[..., IR] = rng.uniform(0.5, 2.0, size=shape)
+    q[..., IP] = rng.uniform(0.5, 2.0, size=shape)
+    return q
+
+
+def test_array_conversions_match_cell_versions():
+    q = random_prim_block((4, 3))
+    u = states.array_primToCons(q, params)
+    q2 = states.array_consToPrim(u, params)
+    for idx in np.ndindex(4, 3):
+        assert np.allclose(u[idx], states.cell_primToCons(states.State(q[idx]), params), rtol=1e-14)
+    assert np.allclose(q2, q, rtol=1e-12)
+
+
+def test_array_conversions_write_into_out_buffer():
+    q = random_prim_block((5, 2))
+    u = np.zeros_like(q)
+    res = states.array_primToCons(q, params, out=u)
+    assert res is u
+    assert np.allclose(u, states.array_primToCons(q, params))
+
+    with pytest.raises(ValueError):
+        states.array_primToCons(q, params, out=q)
+    with pytest.raises(ValueError):
+        states.array_consToPrim(u, params, out=np.zeros((5, 3, params.Nfields)))
+
+
+def test_grid_conversion_leaves_ghosts_untouched():
+    Q = make_zero_grid()
+    Q[params.slice_dom] = random_prim_block((params.Nx, params.Ny))
+    U = np.full_like(Q, -1.0)
+    states.primToCons(Q, U, params)
+    assert np.all(U[: params.ibeg] == -1.0)
+    assert np.all(U[:, params.jend :] == -1.0)
+    assert np.allclose(U[params.slice_dom], states.array_primToCons(Q[params.slice_dom], params))
@@ -0,0 +1,124 @@
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import main
+from src.iomanager import IOManager
+from src.params import OutputStream, Params, params_from_dict, readInifile
+from src.reader import SnapshotReader
+from src.streams import OutputStreams
+from src.varindexes import IR, IP
+
+SETUPS = Path(__file__).resolve().parents[1] / "setups"
+
+params = Params(Nx=16, Ny=8, MHD=False, problem_name="sod_x")
+
+
+def random_grid(p=params):
+    return np.random.default_rng(3).normal(size=(p.Ntx, p.Nty, p.Nfields))
+
+
+def test_streams_are_read_from_sections(tmp_path):
+    path = tmp_path / "run.ini"
+    path.write_text("[mesh]\nNx = 32\n[stream.cut]\nsave_freq = 0.002\nymin = 0.5\nymax = 0.5\n[stream.full]\n")
+    p = readInifile(path)
+    assert p.output_streams == (OutputStream("cut", 0.002, ymin=0.5, ymax=0.5), OutputStream("full"))
+    assert [s.name for s in readInifile(SETUPS / "sod_x.toml").output_streams] == ["full", "cut_y"]
+
+    with pytest.raises(ValueError):
+        params_from_dict({"stream": {"cut": {"zmin": 0.5}}})
+    with pytest.raises(ValueError):
+        params_from_dict({"stream": {"cut": {"coarsen": 0}}})
+    with pytest.raises(ValueError):
+        params_from_dict({"stream.a": {}, "stream": {"a": {}}})
+
+
+def test_cut_writes_the_row_containing_the_coordinate(tmp_path):
+    io = IOManager(params, dirname=tmp_path, stream=OutputStream("cut", ymin=0.5, ymax=0.5))
+    assert (io.fNy, io.fNx) == (1, params.Nx)
+    Q = random_grid()
+    j = params.jbeg + 4  # y dans [0.5, 0.625[
+    assert np.array_equal(io.field_views(Q)["rho"], Q[params.ibeg : params.iend, j, IR][None, :])
+    assert io.y_coords[0, 0] == 0.5 and io.y_coords[1, 0] == 0.625
+
+
+@pytest.mark.parametrize("backend", ["hdf5", "npy"])
+def test_async_cut_buffers_hold_only_the_cut(tmp_path, backend):
+    p = replace(params, output_backend=backend, async_output=True)
+    stream = OutputStream("cut", ymin=0.5, ymax=0.5)
+    Q = random_grid(p)
+    with IOManager(p, dirname=tmp_path / "async", stream=stream) as io:
+        assert [b.shape for b in io._buffers] == [(params.Nx, 1, p.Nfields)] * 2
+        io.save_solution(Q, 1, 0.0)
+        Q2 = Q.copy()
+        io.save_solution(Q2, 2, 0.1)
+        Q2[:] = 0.0  # déjà copié : sans effet sur la sortie
+        expected = io.field_views(Q)["rho"]
+    with SnapshotReader(tmp_path / "async") as run:
+        assert np.array_equal(run.read("rho", 0), expected)
+        assert np.array_equal(run.read("rho", 1), expected)
+
+
+def test_coarsen_larger_than_the_region_is_rejected(tmp_path):
+    # une coupe n'a qu'une cellule d'épaisseur : un bloc 2x2 prendrait la ligne voisine
+    with pytest.raises(ValueError):
+        IOManager(params, dirname=tmp_path, stream=OutputStream("cut", ymin=0.5, ymax=0.5, coarsen=2))
+    with pytest.raises(ValueError):
+        IOManager(params, dirname=tmp_path, stream=OutputStream("coarse", coarsen=params.Ny + 1))
+    io = IOManager(params, dirname=tmp_path, stream=OutputStream("coarse", xmin=0.0, xmax=0.3, coarsen=3))
+    assert (io.iN - io.i0, io.jN - io.j0) == (3, 6) and (io.fNx, io.fNy) == (1, 2)
+
+
+def test_region_keeps_every_cell_it_touches(tmp_path):
+    stream = OutputStream("zoom", xmin=0.25, xmax=0.4, ymin=-1.0, ymax=0.3)
+    io = IOManager(params, dirname=tmp_path, stream=stream)
+    assert (io.i0, io.iN, io.j0, io.jN) == (6, 9, 2, 5)
+    assert io.x_coords[0, 0] == 0.25 and io.x_coords[0, -1] == 0.4375
+
+
+@pytest.mark.parametrize("backend", ["hdf5", "npy"])
+def test_coarsened_stream_is_block_averaged(tmp_path, backend):
+    p = replace(params, output_backend=backend)
+    io = IOManager(p, dirname=tmp_path, stream=OutputStream("coarse", coarsen=4))
+    assert (io.fNy, io.fNx) == (2, 4)
+    Q = random_grid(p)
+    prs = Q[p.slice_dom][..., IP]
+    expected = np.array([[prs[4 * i : 4 * i + 4, 4 * j : 4 * j + 4].mean() for i in range(4)] for j in range(2)])
+    assert np.allclose(io.field_views(Q)["prs"], expected, rtol=1e-14)
+
+    io.save_solution(Q, 1, 0.0)
+    io.close()
+    with SnapshotReader(tmp_path) as run:
+        assert np.allclose(run.read("prs", 0), expected, rtol=1e-14)
+        x, y = run.coordinates()
+        assert np.allclose(x[0], np.linspace(0.0, 1.0, 5)) and np.allclose(y[:, 0], [0.0, 0.5, 1.0])
+
+
+def test_each_stream_follows_its_own_cadence(tmp_path):
+    p = replace(params, output_streams=(OutputStream("full", 0.5), OutputStream("cut", 0.1, ymin=0.5, ymax=0.5)))
+    Q = random_grid()
+    with OutputStreams(p, dirname=tmp_path) as outputs:
+        saved = [outputs.save_due(Q, t) for t in np.arange(0.0, 1.0, 0.05)]
+        outputs.save_all(Q, 1.0)
+    assert sum("full" in names for names in saved) == 2
+    assert sum("cut" in names for names in saved) == 10
+    assert outputs.state["cut"].iteration == 11
+    assert len(list((tmp_path / "cut").glob("ite_*.h5"))) == 11
+    assert len(list((tmp_path / "full").glob("ite_*.h5"))) == 3
+
+
+def test_sod_setup_writes_full_and_cut_streams(tmp_path, monkeypatch):
+    setup = (SETUPS / "sod_x.toml").read_text().replace("Nx = 256", "Nx = 32").replace("tend = 0.2", "tend = 0.04")
+    (tmp_path / "run.toml").write_text(setup)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "run.toml"])
+    assert main.main() == 0
+
+    with SnapshotReader(tmp_path / "data" / "cut_y") as cut, SnapshotReader(tmp_path / "data" / "full") as full:
+        assert len(full) == 2 and len(cut) > 3
+        assert cut[0]["rho"].shape == (1, 32)
+        # tous les flux voient la même solution
+        assert np.array_equal(cut[-1]["rho"][0], full[-1]["rho"][2])
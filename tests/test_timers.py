@@ -0,0 +1,81 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from conftest import initial_state
+from src.params import Params
+from src.timers import TimerReport, Timers
+from src.update import cons_to_prim, update
+from src.workspace import Workspace
+
+params = Params(Nx=16, Ny=12, reconstruction="PLM", time_stepping="RK2")
+
+
+def test_disabled_timers_record_nothing():
+    timers = Timers(enabled=False)
+    with timers("riemann"):
+        pass
+    assert timers.elapsed == {} and timers.calls == {}
+    assert Workspace(params).timers.enabled is False
+
+
+def test_timers_accumulate_phases():
+    timers = Timers()
+    for _ in range(3):
+        with timers("riemann"):
+            pass
+    timers.add("io", 0.5)
+    assert timers.calls == {"riemann": 3, "io": 1}
+    assert timers.elapsed["io"] == 0.5
+
+    report = timers.report(steps=2, cells=100)
+    assert report.steps == 2 and report.calls["riemann"] == 3
+    assert "riemann" in str(report) and "Mcell-updates/s" in report.rates()
+
+
+def test_report_rates():
+    report = TimerReport({"io": 1.0, "riemann": 2.0}, {"io": 1, "riemann": 4}, wall=4.0, steps=10, cells=10**6)
+    assert report.mcell_updates == pytest.approx(2.5)
+    assert report.time_per_iteration == pytest.approx(0.4)
+    assert report.io_fraction == pytest.approx(0.25)
+    assert report.other == pytest.approx(1.0)
+
+
+def test_interval_reports_the_phases_since_the_previous_call():
+    timers = Timers()
+    timers.add("io", 1.0)
+    first = timers.interval(steps=5, cells=10)
+    timers.add("io", 2.0)
+    timers.add("dt", 0.5)
+    second = timers.interval(steps=8, cells=10)
+    assert first.steps == 5 and first.elapsed == {"io": 1.0}
+    assert second.steps == 3 and second.elapsed == {"io": 2.0, "dt": 0.5}
+    assert second.calls == {"io": 1, "dt": 1}
+
+    timers.reset()
+    assert timers.elapsed == {} and timers.interval(steps=1, cells=10).steps == 1
+
+
+@pytest.mark.parametrize("changes", [{}, {"tile_size": 8}], ids=["whole", "tiled"])
+def test_timed_update_matches_untimed_update(changes):
+    p = replace(params, **changes)
+    pt = replace(p, timers=True)
+    Q, U = initial_state(p)
+    Qt, Ut = Q.copy(), U.copy()
+    ws, wst = Workspace(p), Workspace(pt)
+    for _ in range(2):
+        update(Q, U, 1e-3, p, ws)
+        cons_to_prim(U, Q, p, ws)
+        update(Qt, Ut, 1e-3, pt, wst)
+        cons_to_prim(Ut, Qt, pt, wst)
+
+    assert np.array_equal(Ut, U)
+    assert ws.timers.elapsed == {}
+    # deux étapes RK2 par pas, et une conversion entre les étapes
+    assert wst.timers.calls["boundaries"] == 4
+    assert wst.timers.calls["conversion"] == 4
+    phases = {"boundaries", "fluxes", "conversion"}
+    if not changes:
+        phases |= {"slopes", "reconstruction", "riemann"}
+    assert set(wst.timers.elapsed) == phases
@@ -0,0 +1,28 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src import timestep
+from src.params import Params
+from src.problems import init_problem
+from src.states import State, get_state_from_array
+
+params = Params()
+
+
+def test_array_timestep_matches_cell_timestep():
+    rng = np.random.default_rng(1)
+    q = rng.uniform(-1.0, 1.0, size=(30, params.Nfields))
+    q[:, 0] = rng.uniform(0.2, 2.0, size=30)
+    q[:, 4] = rng.uniform(0.1, 2.0, size=30)
+    expected = [timestep.cell_timestep(State(s), params) for s in q]
+    assert np.allclose(timestep.array_timestep(q, params), expected, rtol=1e-14)
+
+
+def test_compute_dt_uses_the_most_restrictive_cell():
+    ot = replace(params, problem_name="orszag-tang")
+    Q = np.zeros((ot.Ntx, ot.Nty, ot.Nfields))
+    init_problem(Q, ot)
+    expected = max(timestep.cell_timestep(get_state_from_array(Q, i, j), ot) for i, j in ot.range_dom)
+    assert timestep.compute_dt(Q, 0.0, False, ot) == pytest.approx(ot.CFL / expected, rel=1e-14)
@@ -0,0 +1,201 @@
+import threading
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from conftest import initial_state
+from src import update
+from src.params import Params
+from src.states import consToPrim
+from src.pycfd_types import IDir
+from src.workspace import Workspace
+from src.varindexes import IR, IU, IV, IE
+
+params = Params(problem_name="orszag-tang")
+
+
+def test_flux_update_is_conservative_with_periodic_boundaries():
+    Q, U = initial_state(params)
+    mass = U[params.slice_dom][..., IR].sum()
+    energy = U[params.slice_dom][..., IE].sum()
+
+    update.compute_fluxes_and_update(Q, U, 1e-3, params, Workspace(params))
+
+    assert np.isclose(U[params.slice_dom][..., IR].sum(), mass, rtol=1e-13)
+    assert np.isclose(U[params.slice_dom][..., IE].sum(), energy, rtol=1e-13)
+    # ghost cells of the conservative array are never touched
+    assert np.all(U[: params.ibeg] == 0.0)
+
+
+def test_face_states_shapes_and_orientation():
+    Q, _ = initial_state(params)
+    qLx, qRx = update.compute_face_states(Q, np.zeros_like(Q), IDir.IX, params)
+    qLy, qRy = update.compute_face_states(Q, np.zeros_like(Q), IDir.IY, params)
+    assert qLx.shape == (params.Nx + 1, params.Ny, params.Nfields)
+    assert qLy.shape == (params.Nx, params.Ny + 1, params.Nfields)
+    # the right state of the first x face is the first domain cell
+    assert np.allclose(qRx[0, 0], Q[params.ibeg, params.jbeg])
+    # along y the normal velocity is stored in the u slot
+    assert np.allclose(qLy[0, 1, IU], Q[params.ibeg, params.jbeg, IV])
+
+
+def test_face_states_match_cell_reconstruction():
+    plm = replace(params, reconstruction="PLM_MC")
+    Q, _ = initial_state(plm)
+    ws = Workspace(plm)
+    update.compute_slopes(Q, plm, ws)
+    for idir, slopes in ws.slopes.items():
+        di, dj = (1, 0) if idir == IDir.IX else (0, 1)
+        qL, qR = update.compute_face_states(Q, slopes, idir, plm)
+        for fi, fj in [(0, 0), (3, 7), (plm.Nx - 1 + di, plm.Ny - 1 + dj)]:
+            i, j = plm.ibeg + fi, plm.jbeg + fj
+            assert np.allclose(qL[fi, fj], update.reconstruct(Q, slopes, i - di, j - dj, 1.0, idir, plm))
+            assert np.allclose(qR[fi, fj], update.reconstruct(Q, slopes, i, j, -1.0, idir, plm))
+
+
+def test_riemann_dt_is_close_to_cfl_dt():
+    from src.timestep import compute_dt
+
+    Q, U = initial_state(params)
+    ws = Workspace(params)
+    assert update.update(Q, U.copy(), 1e-4, params, ws) is None
+
+    riemann = replace(params, dt_from_riemann=True)
+    dt_riemann = update.update(Q, U, 1e-4, riemann, ws)
+    dt_cfl = compute_dt(Q, 0.0, False, riemann)
+    # the Riemann estimate is more conservative, within the safety factor
+    assert 0.5 * riemann.dt_safety * dt_cfl < dt_riemann <= riemann.dt_safety * dt_cfl
+
+
+def manual_euler(Q, U, dt):
+    """One forward Euler stage on copies, returning (U + dt L(U), prim(U + dt L(U)))."""
+    Qs, Us = Q.copy(), U.copy()
+    update.euler_step(Qs, Us, dt, params, Workspace(params))
+    consToPrim(Us, Qs, params)
+    return Us, Qs
+
+
+def test_ssp_rk2_updates_the_caller_array():
+    rk2 = replace(params, time_stepping="RK2")
+    Q, U = initial_state(params)
+    dt = 1e-3
+    U1, Q1 = manual_euler(Q, U, dt)
+    U2, _ = manual_euler(Q1, U1, dt)
+    expected = 0.5 * U[params.slice_dom] + 0.5 * U2[params.slice_dom]
+
+    ws = Workspace(rk2)
+    update.update(Q, U, dt, rk2, ws)
+    assert np.allclose(U[params.slice_dom], expected, rtol=1e-14, atol=1e-15)
+
+
+def test_ssp_rk3_matches_shu_osher_stages():
+    rk3 = replace(params, time_stepping="RK3")
+    Q, U = initial_state(params)
+    dt = 1e-3
+    dom = params.slice_dom
+    U1, Q1 = manual_euler(Q, U, dt)
+    U2, Q2 = manual_euler(Q1, U1, dt)
+    U2[dom] = 0.75 * U[dom] + 0.25 * U2[dom]
+    consToPrim(U2, Q2, params)
+    U3, _ = manual_euler(Q2, U2, dt)
+    expected = U[dom] / 3.0 + 2.0 / 3.0 * U3[dom]
+
+    mass = U[dom][..., IR].sum()
+    update.update(Q, U, dt, rk3, Workspace(rk3))
+    assert np.allclose(U[dom], expected, rtol=1e-13, atol=1e-14)
+    assert np.isclose(U[dom][..., IR].sum(), mass, rtol=1e-13)
+
+
+def test_unknown_time_stepping_is_rejected():
+    rk4 = replace(params, time_stepping="RK4")
+    Q, U = initial_state(params)
+    with pytest.raises(ValueError):
+        update.update(Q, U, 1e-3, rk4, Workspace(rk4))
+
+
+def test_workspace_buffers_are_reused_between_steps():
+    rk3 = replace(params, time_stepping="RK3", reconstruction="PLM")
+    Q, U = initial_state(rk3)
+    ws = Workspace(rk3)
+    buffers = [id(a) for a in ws.buffers()]
+    nbytes = ws.nbytes
+
+    update.update(Q, U, 1e-3, rk3, ws)
+    consToPrim(U, Q, rk3)
+    update.update(Q, U, 1e-3, rk3, ws)
+
+    assert [id(a) for a in ws.buffers()] == buffers
+    assert ws.nbytes == nbytes
+    assert np.any(ws.slopes[IDir.IX] != 0.0)
+    assert np.any(ws.flux[IDir.IY] != 0.0)
+
+
+def test_grids_with_different_params_coexist():
+    small = replace(params, Nx=16, Ny=8)
+    Q, U = initial_state(small)
+    Qref, Uref = initial_state(params)
+    update.update(Q, U, 1e-3, small, Workspace(small))
+    update.update(Qref, Uref, 1e-3, params, Workspace(params))
+    assert U.shape == (small.Ntx, small.Nty, small.Nfields)
+    assert np.all(np.isfinite(U[small.slice_dom]))
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        dict(nthreads=3, tile_size=24, time_stepping="RK2", reconstruction="PLM"),
+        dict(nthreads=1, tile_size=7, time_stepping="RK3", reconstruction="PLM_MC", dt_from_riemann=True),
+        dict(nthreads=4, tile_size=20, MHD=False, problem_name="sod_x", riemann_solver="hll"),
+    ],
+)
+def test_tiled_update_matches_the_whole_domain_update(changes):
+    tiled = replace(params, Nx=50, Ny=37, **changes)
+    serial = replace(tiled, nthreads=1, tile_size=0)
+    Q, U = initial_state(serial)
+    Qt, Ut = Q.copy(), U.copy()
+    with Workspace(serial) as ws, Workspace(tiled) as wst:
+        assert ws.tiles is None and wst.tiles is not None and len(wst.tiles.tiles) > 1
+
+        for _ in range(3):
+            dt = update.update(Q, U, 1e-4, serial, ws)
+            update.cons_to_prim(U, Q, serial, ws)
+            assert update.update(Qt, Ut, 1e-4, tiled, wst) == dt
+            update.cons_to_prim(Ut, Qt, tiled, wst)
+    dom = serial.slice_dom
+    assert np.array_equal(Ut[dom], U[dom])
+    assert np.array_equal(Qt[dom], Q[dom])
+
+
+def test_closing_the_workspace_stops_the_tile_threads():
+    p = replace(params, Nx=50, Ny=37, nthreads=3, tile_size=24)
+    Q, U = initial_state(p)
+    before = set(threading.enumerate())
+    with Workspace(p) as ws:
+        update.update(Q, U, 1e-4, p, ws)
+        threads = set(threading.enumerate()) - before
+        assert threads and all(t.name.startswith("pycfd-tile") for t in threads)
+    assert ws.tiles is not None and ws.tiles.executor is None
+    assert not any(t.is_alive() for t in threads)
+    # Après close, les tuiles sont calculées dans le thread appelant
+    serial = replace(p, nthreads=1)
+    Qs, Us = Q.copy(), U.copy()
+    update.update(Q, U, 1e-4, p, ws)
+    update.update(Qs, Us, 1e-4, serial, Workspace(serial))
+    assert np.array_equal(U[p.slice_dom], Us[p.slice_dom])
+
+
+def test_tiles_cover_the_domain_once():
+    from src.tiles import block_tiles
+
+    p = replace(params, Nx=50, Ny=37)
+    tiles = block_tiles(p, 16)
+    covered = np.zeros((p.Ntx, p.Nty), dtype=int)
+    for tile in tiles:
+        assert tile.i1 - tile.i0 <= 16 and tile.j1 - tile.j0 <= 16
+        covered[tile.region] += 1
+    assert np.all(covered[p.slice_dom] == 1) and covered.sum() == p.Nx * p.Ny
+    assert len(tiles) == 4 * 3
+
+    with pytest.raises(ValueError):
+        Workspace(replace(p, nthreads=0))
@@ -0,0 +1,48 @@
+from src.boundaries import fillAbsorbing as fillAbsorbing, fillBoundaries as fillBoundaries, fillPeriodic as fillPeriodic, fillReflecting as fillReflecting
+from src.params import Params as Params
+from src.pycfd_types import Array as Array, IDir as IDir, real_t as real_t
+from src.riemann import array_riemann as array_riemann, riemann as riemann
+from src.states import State as State, cell_consToPrim as cell_consToPrim, cell_primToCons as cell_primToCons, consToPrim as consToPrim, get_state_from_array as get_state_from_array, primToCons as primToCons, set_state_into_array as set_state_into_array
+from src.timestep import array_timestep as array_timestep, cell_timestep as cell_timestep
+from abc import ABC, abstractmethod
+from types import ModuleType
+
+class Backend(ABC):
+    name: str
+    @abstractmethod
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None: ...
+    @abstractmethod
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None: ...
+    @abstractmethod
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t: ...
+    @abstractmethod
+    def riemann(self, qL: Array, qR: Array, params: Params, out: Array, smax: Array | None = ...) -> Array: ...
+    @abstractmethod
+    def fill_boundaries(self, Q: Array, params: Params) -> None: ...
+
+class NumpyBackend(Backend):
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None: ...
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None: ...
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t: ...
+    def riemann(self, qL: Array, qR: Array, params: Params, out: Array, smax: Array | None = ...) -> Array: ...
+    def fill_boundaries(self, Q: Array, params: Params) -> None: ...
+
+class PythonBackend(Backend):
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None: ...
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None: ...
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t: ...
+    def riemann(self, qL: Array, qR: Array, params: Params, out: Array, smax: Array | None = ...) -> Array: ...
+    def fill_boundaries(self, Q: Array, params: Params) -> None: ...
+
+class NumbaBackend(Backend):
+    kernels: ModuleType
+    def __init__(self) -> None: ...
+    def prim_to_cons(self, Q: Array, U: Array, params: Params) -> None: ...
+    def cons_to_prim(self, U: Array, Q: Array, params: Params) -> None: ...
+    def max_inv_dt(self, Q: Array, params: Params) -> real_t: ...
+    def riemann(self, qL: Array, qR: Array, params: Params, out: Array, smax: Array | None = ...) -> Array: ...
+    def fill_boundaries(self, Q: Array, params: Params) -> None: ...
+
+backends: dict[str, type[Backend]]
+
+def get_backend(name: str) -> Backend: ...
@@ -1,8 +1,11 @@
+from src.params import Params as Params
 from src.pycfd_types import Array as Array, IDir as IDir
-from src.states import State as State, get_state_from_array as get_state_from_array, set_state_into_array as set_state_into_array
+from src.states import State as State, get_state_from_array as get_state_from_array
 from src.varindexes import IBX as IBX, IBY as IBY, IU as IU, IV as IV
 
-def fillAbsorbing(Q: Array, iref: int, jref: int, idir: IDir) -> State: ...
-def fillReflecting(Q: Array, i: int, j: int, iref: int, jref: int, idir: IDir) -> State: ...
-def fillPeriodic(Q: Array, i: int, j: int, idir: IDir) -> State: ...
-def fillBoundaries(Q: Array) -> None: ...
+def fillAbsorbing(Q: Array, iref: int, jref: int, idir: IDir, params: Params) -> State: ...
+def fillReflecting(Q: Array, i: int, j: int, iref: int, jref: int, idir: IDir, params: Params) -> State: ...
+def fillPeriodic(Q: Array, i: int, j: int, idir: IDir, params: Params) -> State: ...
+def reflect_signs(idir: IDir, params: Params) -> Array: ...
+def fill_ghost_layer(V: Array, beg: int, end: int, lower: bool, bc: str, idir: IDir, params: Params) -> None: ...
+def fillBoundaries(Q: Array, params: Params) -> None: ...
@@ -0,0 +1,42 @@
+import h5py
+from pathlib import Path
+from src.params import Params as Params
+from src.pycfd_types import Array as Array
+from src.varindexes import IBX as IBX, IBY as IBY, IE as IE, IMAG as IMAG, IP as IP, IR as IR, IVEL as IVEL
+from typing import Callable, TextIO
+
+Reduction = Callable[[Array, Array, Params], float]
+
+def total_mass(Q: Array, U: Array, params: Params) -> float: ...
+def total_energy(Q: Array, U: Array, params: Params) -> float: ...
+def kinetic_energy(Q: Array, U: Array, params: Params) -> float: ...
+def magnetic_energy(Q: Array, U: Array, params: Params) -> float: ...
+def max_divB(Q: Array, U: Array, params: Params) -> float: ...
+def min_density(Q: Array, U: Array, params: Params) -> float: ...
+def min_pressure(Q: Array, U: Array, params: Params) -> float: ...
+
+reductions: dict[str, Reduction]
+mhd_reductions: set[str]
+
+class Diagnostics:
+    params: Params
+    frequency: int
+    names: list[str]
+    format: str
+    filename: Path
+    start_step: int
+    _csv: TextIO | None
+    _h5: h5py.File | None
+    def __init__(self, params: Params, dirname: str | Path = 'data', outname: str = 'diagnostics', start_step: int = 0) -> None: ...
+    def due(self, step: int) -> bool: ...
+    def compute(self, Q: Array, U: Array) -> dict[str, float]: ...
+    def write(self, Q: Array, U: Array, t: float, step: int) -> dict[str, float]: ...
+    def _write_csv(self, values: dict[str, float], t: float, step: int) -> None: ...
+    def _open_csv(self) -> TextIO: ...
+    def _write_hdf5(self, values: dict[str, float], t: float, step: int) -> None: ...
+    def _open_hdf5(self) -> h5py.File: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> Diagnostics: ...
+    def __exit__(self, *exc) -> None: ...
+
+def read_diagnostics(filename: str | Path) -> dict[str, Array]: ...
@@ -1,9 +1,34 @@
+import h5py
 import numpy as np
+from src import npyio as npyio
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from src.params import OutputStream as OutputStream, Params as Params
+from src.pycfd_types import Array as Array
 from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IP as IP, IPSI as IPSI, IR as IR, IU as IU, IV as IV, IW as IW
 
+fields: dict[str, int]
+
+@dataclass(frozen=True)
+class StreamState:
+    iteration: int
+    next_save: float
+
+@dataclass(frozen=True)
+class RestartInfo:
+    time: float
+    step: int
+    dt_next: float | None
+    streams: dict[str, StreamState]
+
+def _cell_range(lo: float, hi: float, origin: float, delta: float, beg: int, first: int, last: int) -> tuple[int, int]: ...
+
 class IOManager:
+    params: Params
     outname: str
-    dirname: str
+    dirname: Path
     ite_nzeros: int
     Nx: int
     Ny: int
@@ -19,7 +44,58 @@ class IOManager:
     ymin: float
     MHD: bool
     write_ghost_cells: bool
-    def __init__(self, outname: str = 'run', dirname: str = 'data') -> None: ...
+    i0: int
+    iN: int
+    j0: int
+    jN: int
+    save_freq: float
+    coarsen: int
+    fNy: int
+    fNx: int
+    gNy: int
+    gNx: int
+    x_coords: Array
+    y_coords: Array
+    fields: dict[str, int]
+    precision: int
+    dtype: type
+    dataset_options: dict
+    backend: str
+    async_output: bool
+    _executor: ThreadPoolExecutor | None
+    _buffers: list[np.ndarray]
+    _pending: list[Future | None]
+    _ibuf: int
+    unique_output: bool
+    _h5: h5py.File | None
+    _npy: npyio.NpySeries | None
+    resume_iteration: int
+    def __init__(self, params: Params, outname: str = 'run', dirname: str | Path = 'data', stream: OutputStream | None = None) -> None: ...
     def setup_dirdata(self) -> None: ...
-    def save_solution(self, Q: np.ndarray, iteration: int, t: float, unique_output: bool = False) -> None: ...
+    def resume(self, iteration: int) -> None: ...
+    def save_solution(self, Q: np.ndarray, iteration: int, t: float, unique_output: bool | None = None) -> None: ...
+    def _wait(self, ibuf: int) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> IOManager: ...
+    def __exit__(self, *exc) -> None: ...
+    def _write_solution(self, block: Array, iteration: int, t: float, unique_output: bool) -> None: ...
+    def _save_solution_multiple(self, block: Array, iteration: int, t: float) -> None: ...
+    def grid_attrs(self) -> dict[str, Any]: ...
+    def _write_grid(self, f: h5py.File) -> None: ...
+    def _generate_xmf(self, h5_filename: Path, xmf_filename: Path, t: float, fNy: int, fNx: int, gNy: int, gNx: int, iteration_str: str) -> None: ...
+    def _open_unique(self) -> h5py.File: ...
+    def _save_solution_unique(self, block: Array, iteration: int, t: float) -> None: ...
+    def _close_unique(self) -> None: ...
+    def _generate_unique_xmf(self, times: Array, iterations: Array) -> None: ...
+    def _npy_meta(self) -> dict[str, Any]: ...
+    def _save_npy_multiple(self, block: Array, iteration: int, t: float) -> None: ...
+    def _save_npy_unique(self, block: Array, iteration: int, t: float) -> None: ...
+    def _dataset_options(self, params: Params) -> dict: ...
+    def _xmf_attributes(self, path: str, step: int | None = None) -> str: ...
+    def field_views(self, Q: Array) -> dict[str, Array]: ...
+    def region_views(self, block: Array) -> dict[str, Array]: ...
+    def _write_fields(self, group: h5py.Group, block: Array) -> None: ...
+    def save_checkpoint(self, Q: Array, U: Array, t: float, step: int, streams: dict[str, StreamState], dt_next: float | None = None) -> Path: ...
+    def load_checkpoint(self, filename: str | Path, Q: Array, U: Array) -> RestartInfo: ...
     def load_solution(self, iteration: int) -> dict[str, np.ndarray]: ...
@@ -0,0 +1,13 @@
+from src.pycfd_types import Array as Array
+from typing import Callable
+
+Limiter = Callable[[Array, Array], Array]
+
+def minmod(dL: Array, dR: Array) -> Array: ...
+def monotonized_central(dL: Array, dR: Array) -> Array: ...
+def van_leer(dL: Array, dR: Array) -> Array: ...
+def superbee(dL: Array, dR: Array) -> Array: ...
+
+limiters: dict[str, Limiter]
+
+def get_limiter(reconstruction: str) -> Limiter: ...
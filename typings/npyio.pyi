@@ -0,0 +1,21 @@
+import numpy as np
+from pathlib import Path
+from src.pycfd_types import Array as Array
+from typing import Any, Iterable
+
+def write_json(filename: Path, meta: dict[str, Any]) -> None: ...
+def read_json(filename: Path) -> dict[str, Any]: ...
+def write_snapshot(filename: Path, views: Iterable[Array], shape: tuple[int, ...], dtype: type) -> None: ...
+
+class NpySeries:
+    filename: Path
+    json_filename: Path
+    meta: dict[str, Any]
+    dtype: type
+    frame: tuple[int, int, int]
+    data: np.memmap
+    def __init__(self, filename: Path, meta: dict[str, Any], capacity: int, dtype: type, resume: int = 0) -> None: ...
+    def _reopen(self, resume: int) -> bool: ...
+    def append(self, views: Iterable[Array], t: float, iteration: int) -> None: ...
+    def _grow(self) -> None: ...
+    def close(self) -> None: ...
@@ -0,0 +1,17 @@
+from src.pycfd_types import Array as Array
+from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IE as IE, IP as IP, IPSI as IPSI, IR as IR, IU as IU, IV as IV, IW as IW
+
+HLL: int
+FIVEWAVES: int
+
+def cell_primToCons(q: Array, u: Array, gamma: float, mhd: bool) -> None: ...
+def cell_consToPrim(u: Array, q: Array, gamma: float, mhd: bool) -> None: ...
+def fast_magnetosonic_speed(rho: float, B2: float, Bn: float, cs: float) -> float: ...
+def cell_timestep(q: Array, gamma: float, dx: float, dy: float, mhd: bool) -> float: ...
+def computeFlux(q: Array, f: Array, gamma: float) -> None: ...
+def hll(qL: Array, qR: Array, flux: Array, FL: Array, FR: Array, uL: Array, uR: Array, gamma: float, mhd: bool) -> float: ...
+def fivewaves(qL: Array, qR: Array, flux: Array, u: Array, gamma: float, epsilon: float) -> float: ...
+def primToCons(Q: Array, U: Array, ibeg: int, iend: int, jbeg: int, jend: int, gamma: float, mhd: bool) -> None: ...
+def consToPrim(U: Array, Q: Array, ibeg: int, iend: int, jbeg: int, jend: int, gamma: float, mhd: bool) -> None: ...
+def max_inv_dt(Q: Array, ibeg: int, iend: int, jbeg: int, jend: int, gamma: float, dx: float, dy: float, mhd: bool) -> float: ...
+def riemann(qL: Array, qR: Array, flux: Array, smax: Array, solver: int, gamma: float, epsilon: float, mhd: bool) -> None: ...
@@ -0,0 +1,43 @@
+from multiprocessing.connection import Connection
+from src.params import Params as Params
+from src.pycfd_types import Array as Array, IDir as IDir, real_t as real_t
+from src.tiles import Tile as Tile, split as split, tile_params as tile_params
+from typing import Any
+
+CMD_STOP: int
+CMD_LOAD: int
+CMD_DT: int
+CMD_STEP: int
+
+def process_grid(params: Params, nprocs: int) -> tuple[int, int]: ...
+def decompose(params: Params, nprocs: int) -> list[Tile]: ...
+
+class HaloExchange:
+    params: Params
+    tile: Tile
+    Qs: Array
+    barrier: Any
+    strips: list[tuple[tuple[slice, slice], tuple[Array, Array]]]
+    edges: list[tuple[bool, str, IDir]]
+    def __init__(self, params: Params, tile: Tile, Qs: Array, barrier: Any) -> None: ...
+    def publish(self, Qt: Array, tp: Params) -> None: ...
+    def __call__(self, Qt: Array, tp: Params) -> None: ...
+
+def _worker(params: Params, tile: Tile, names: dict[str, str], conn: Connection, halo: Any) -> None: ...
+
+class ParallelSolver:
+    params: Params
+    nprocs: int
+    px: int
+    py: int
+    tiles: list[Tile]
+    def __init__(self, params: Params, nprocs: int | None = None) -> None: ...
+    def load(self, Q: Array, U: Array) -> None: ...
+    def compute_dt(self, t: real_t, verbose: bool) -> real_t: ...
+    def update(self, Q: Array, U: Array, dt: real_t) -> None: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> ParallelSolver: ...
+    def __exit__(self, *exc) -> None: ...
+
+def strong_scaling(params: Params, nprocs_list: list[int], nsteps: int = 20) -> list[dict[str, float]]: ...
+def main() -> int: ...
@@ -1,38 +1,92 @@
-from typing import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
 
-problem_name: str
-MHD: bool
-gamma: float
-Nfields: int
-Nx: int
-Ny: int
-Nghosts: int
-Ntx: int
-Nty: int
-ibeg: int
-iend: int
-jbeg: int
-jend: int
-ParallelRange: Iterable[int]
-range_tot: Iterable[int]
-range_dom: Iterable[int]
-range_xbound: Iterable[int]
-range_ybound: Iterable[int]
-range_slopes: Iterable[int]
-xmax: float
-xmin: float
-ymax: float
-ymin: float
-dx: float
-dy: float
-boundary_x: str
-boundary_y: str
-tend: float
-CFL: float
-reconstruction: str
-time_stepping: str
-riemann_solver: str
-epsilon: float
-smallr: float
-log_frequency: int
-save_freq: float
+@dataclass(frozen=True)
+class OutputStream:
+    name: str
+    save_freq: float = ...
+    xmin: float = ...
+    xmax: float = ...
+    ymin: float = ...
+    ymax: float = ...
+    coarsen: int = ...
+
+@dataclass(frozen=True)
+class Params:
+    problem_name: str = ...
+    MHD: bool = ...
+    gamma: float = ...
+    Nx: int = ...
+    Ny: int = ...
+    Nghosts: int = ...
+    xmin: float = ...
+    xmax: float = ...
+    ymin: float = ...
+    ymax: float = ...
+    boundary_xmin: str = ...
+    boundary_xmax: str = ...
+    boundary_ymin: str = ...
+    boundary_ymax: str = ...
+    tend: float = ...
+    CFL: float = ...
+    reconstruction: str = ...
+    time_stepping: str = ...
+    riemann_solver: str = ...
+    dt_from_riemann: bool = ...
+    dt_safety: float = ...
+    nprocs: int = ...
+    backend: str = ...
+    nthreads: int = ...
+    tile_size: int = ...
+    epsilon: float = ...
+    smallr: float = ...
+    log_frequency: int = ...
+    timers: bool = ...
+    checkpoint_frequency: int = ...
+    restart_file: str = ...
+    save_freq: float = ...
+    write_ghost_cells: bool = ...
+    output_backend: str = ...
+    unique_output: bool = ...
+    async_output: bool = ...
+    output_fields: str = ...
+    output_precision: int = ...
+    output_compression: str = ...
+    output_compression_level: int = ...
+    output_shuffle: bool = ...
+    output_chunks: int = ...
+    output_streams: tuple[OutputStream, ...] = ...
+    diagnostics_frequency: int = ...
+    diagnostics: str = ...
+    diagnostics_format: str = ...
+    @property
+    def Nfields(self) -> int: ...
+    @property
+    def Ntx(self) -> int: ...
+    @property
+    def Nty(self) -> int: ...
+    @property
+    def ibeg(self) -> int: ...
+    @property
+    def iend(self) -> int: ...
+    @property
+    def jbeg(self) -> int: ...
+    @property
+    def jend(self) -> int: ...
+    @property
+    def dx(self) -> float: ...
+    @property
+    def dy(self) -> float: ...
+    @property
+    def slice_dom(self) -> tuple[slice, slice]: ...
+    @property
+    def range_dom(self) -> Iterator[tuple[int, int]]: ...
+    @property
+    def range_xbound(self) -> Iterator[tuple[int, int]]: ...
+    @property
+    def range_ybound(self) -> Iterator[tuple[int, int]]: ...
+
+def stream_from_dict(name: str, values: dict[str, Any]) -> OutputStream: ...
+def params_from_dict(values: dict[str, Any]) -> Params: ...
+def readInifile(filename: str | Path) -> Params: ...
@@ -1,4 +1,15 @@
+from src.params import Params as Params
+from src.pycfd_types import Array as Array, real_t as real_t
 from src.states import State as State
 from src.varindexes import IP as IP, IR as IR
+from typing import overload
 
-def speed_of_sound(q: State) -> float: ...
+@overload
+def sound_speed(rho: real_t, p: real_t, params: Params) -> real_t: ...
+@overload
+def sound_speed(rho: Array, p: Array, params: Params) -> Array: ...
+@overload
+def fast_magnetosonic_speed(rho: real_t, B2: real_t, Bn: real_t, cs: real_t) -> real_t: ...
+@overload
+def fast_magnetosonic_speed(rho: Array, B2: Array, Bn: Array, cs: Array) -> Array: ...
+def speed_of_sound(q: State, params: Params) -> float: ...
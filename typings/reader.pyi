@@ -0,0 +1,46 @@
+import h5py
+import numpy as np
+from src import npyio as npyio
+from functools import cached_property
+from pathlib import Path
+from src.pycfd_types import Array as Array
+from typing import Any, Iterator
+
+Region = tuple[slice, slice]
+ALL: Region
+
+class Snapshot:
+    reader: SnapshotReader
+    step: int
+    time: float
+    iteration: int
+    def __init__(self, reader: SnapshotReader, step: int) -> None: ...
+    def __getitem__(self, key: str | tuple) -> Array: ...
+
+class SnapshotReader:
+    dirname: Path
+    backend: str
+    unique_output: bool
+    files: list[Path]
+    def __init__(self, dirname: str | Path = 'data', outname: str = 'run') -> None: ...
+    def __len__(self) -> int: ...
+    def __getitem__(self, step: int) -> Snapshot: ...
+    def __iter__(self) -> Iterator[Snapshot]: ...
+    @cached_property
+    def times(self) -> Array: ...
+    @cached_property
+    def iterations(self) -> Array: ...
+    @cached_property
+    def fields(self) -> list[str]: ...
+    def coordinates(self) -> tuple[Array, Array]: ...
+    def read(self, name: str, step: int, region: Region = ...) -> Array: ...
+    def series(self, name: str, region: Region = ..., steps: slice = ...) -> Array: ...
+    @property
+    def _h5(self) -> h5py.File: ...
+    @property
+    def _npy(self) -> np.memmap: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> SnapshotReader: ...
+    def __exit__(self, *exc) -> None: ...
+
+def iter_run(dirname: str | Path = 'data', outname: str = 'run') -> Iterator[Snapshot]: ...
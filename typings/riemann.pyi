@@ -1,10 +1,15 @@
-from src.physics import speed_of_sound as speed_of_sound
+from src.physics import fast_magnetosonic_speed as fast_magnetosonic_speed, sound_speed as sound_speed, speed_of_sound as speed_of_sound
+from src.params import Params as Params
 from src.pycfd_types import Array as Array, IDir as IDir, real_t as real_t
-from src.states import State as State, primToCons as primToCons
+from src.states import State as State, array_primToCons as array_primToCons, primToCons as primToCons
 from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IE as IE, IP as IP, IR as IR, IU as IU, IV as IV, IW as IW
 
 def logMean(a: float, b: float) -> float: ...
-def computeFlux(q: State) -> State: ...
-def hll(qL: State, qR: State) -> State: ...
-def fivewaves(qL: State, qR: State) -> State: ...
-def riemann(qL: State, qR: State) -> State: ...
+def computeFlux(q: State, params: Params) -> State: ...
+def hll(qL: State, qR: State, params: Params) -> State: ...
+def array_computeFlux(q: Array, params: Params) -> Array: ...
+def array_hll(qL: Array, qR: Array, params: Params, out: Array | None = None, smax: Array | None = None) -> Array: ...
+def fivewaves(qL: State, qR: State, params: Params) -> State: ...
+def array_fivewaves(qL: Array, qR: Array, params: Params, out: Array | None = None, smax: Array | None = None) -> Array: ...
+def riemann(qL: State, qR: State, params: Params) -> State: ...
+def array_riemann(qL: Array, qR: Array, params: Params, out: Array | None = None, smax: Array | None = None) -> Array: ...
@@ -1,6 +1,7 @@
 import numpy as np
+from src.params import Params as Params
 from src.pycfd_types import Array as Array, IDir as IDir, real_t as real_t
-from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IE as IE, IP as IP, IPSI as IPSI, IR as IR, IU as IU, IV as IV, IW as IW
+from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IE as IE, IP as IP, IPSI as IPSI, IR as IR, IU as IU, IV as IV, IVEL as IVEL, IW as IW, NVARS as NVARS
 
 class State(np.ndarray):
     def __new__(cls, data: Array | None = None) -> State: ...
@@ -35,10 +36,16 @@ class State(np.ndarray):
 
 def get_state_from_array(Q: Array, i: int, j: int) -> State: ...
 def set_state_into_array(Q: Array, i: int, j: int, s: State) -> None: ...
-def cell_primToCons(q: State) -> State: ...
-def cell_consToPrim(u: State) -> State: ...
-def grid_consToPrim(U: Array, Q: Array) -> None: ...
-def grid_primToCons(Q: Array, U: Array) -> None: ...
-def primToCons(*args: tuple[Array]|tuple[State]) -> None | State: ...
-def consToPrim(*args: tuple[Array]|tuple[State]) -> None | State: ...
+def cell_primToCons(q: State, params: Params) -> State: ...
+def cell_consToPrim(u: State, params: Params) -> State: ...
+def array_primToCons(q: Array, params: Params, out: Array | None = None) -> Array: ...
+def array_consToPrim(u: Array, params: Params, out: Array | None = None) -> Array: ...
+def grid_consToPrim(U: Array, Q: Array, params: Params) -> None: ...
+def grid_primToCons(Q: Array, U: Array, params: Params) -> None: ...
+def primToCons(arg1: State | Array, *args) -> None | State: ...
+def consToPrim(arg1: State | Array, *args) -> None | State: ...
 def swap_components(s: State, idir: IDir) -> State: ...
+
+swap_indices: dict[IDir, list[int]]
+
+def array_swap_components(A: Array, idir: IDir, out: Array | None = None) -> Array: ...
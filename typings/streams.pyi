@@ -0,0 +1,22 @@
+from pathlib import Path
+from src.iomanager import IOManager as IOManager, RestartInfo as RestartInfo, StreamState as StreamState
+from src.params import OutputStream as OutputStream, Params as Params
+from src.pycfd_types import Array as Array
+from typing import Iterator
+
+class OutputStreams:
+    params: Params
+    dirname: Path
+    managers: dict[str, IOManager]
+    state: dict[str, StreamState]
+    checkpoints: IOManager
+    def __init__(self, params: Params, dirname: str | Path = 'data', outname: str = 'run') -> None: ...
+    def __iter__(self) -> Iterator[str]: ...
+    def restore(self, info: RestartInfo) -> None: ...
+    def save_due(self, Q: Array, t: float) -> list[str]: ...
+    def save_all(self, Q: Array, t: float) -> None: ...
+    def _save(self, name: str, Q: Array, t: float, next_save: float) -> None: ...
+    def save_checkpoint(self, Q: Array, U: Array, t: float, step: int, dt_next: float | None) -> Path: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> OutputStreams: ...
+    def __exit__(self, *exc) -> None: ...
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from src.params import Params as Params
+
+DEFAULT_TILE_SIZE: int
+
+@dataclass(frozen=True)
+class Tile:
+    rank: int
+    i0: int
+    i1: int
+    j0: int
+    j1: int
+    @property
+    def region(self) -> tuple[slice, slice]: ...
+    def with_ghosts(self, ng: int) -> tuple[slice, slice]: ...
+
+@dataclass(frozen=True)
+class TileParams(Params):
+    tile_dx: float = ...
+    tile_dy: float = ...
+    @property
+    def dx(self) -> float: ...
+    @property
+    def dy(self) -> float: ...
+
+def split(n: int, parts: int) -> list[int]: ...
+def tile_params(params: Params, tile: Tile) -> TileParams: ...
+def grid_tiles(params: Params, nx: list[int], ny: list[int]) -> list[Tile]: ...
+def block_tiles(params: Params, size: int) -> list[Tile]: ...
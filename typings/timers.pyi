@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import ContextManager
+
+@dataclass(frozen=True)
+class TimerReport:
+    elapsed: dict[str, float]
+    calls: dict[str, int]
+    wall: float
+    steps: int
+    cells: int
+    @property
+    def other(self) -> float: ...
+    @property
+    def mcell_updates(self) -> float: ...
+    @property
+    def time_per_iteration(self) -> float: ...
+    @property
+    def io_fraction(self) -> float: ...
+    def rates(self) -> str: ...
+
+class Timers:
+    enabled: bool
+    elapsed: dict[str, float]
+    calls: dict[str, int]
+    start: float
+    def __init__(self, enabled: bool = True) -> None: ...
+    def reset(self) -> None: ...
+    def __call__(self, name: str) -> ContextManager[None]: ...
+    def add(self, name: str, seconds: float) -> None: ...
+    def report(self, steps: int, cells: int) -> TimerReport: ...
+    def interval(self, steps: int, cells: int) -> TimerReport: ...
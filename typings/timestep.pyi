@@ -1,7 +1,10 @@
-from src.physics import speed_of_sound as speed_of_sound
+from src.physics import fast_magnetosonic_speed as fast_magnetosonic_speed, sound_speed as sound_speed, speed_of_sound as speed_of_sound
+from src.params import Params as Params
 from src.pycfd_types import Array as Array, real_t as real_t
-from src.states import State as State, get_state_from_array as get_state_from_array
-from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IR as IR, IU as IU, IV as IV
+from src.states import State as State
+from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IP as IP, IR as IR, IU as IU, IV as IV
 
-def cell_timestep(q: State) -> real_t: ...
-def compute_dt(Q: Array, t: real_t, verbose: bool) -> real_t: ...
+def cell_timestep(q: State, params: Params) -> real_t: ...
+def array_timestep(q: Array, params: Params) -> Array: ...
+def compute_dt(Q: Array, t: real_t, verbose: bool, params: Params) -> real_t: ...
+def riemann_dt(inv_dt: real_t, params: Params) -> real_t: ...
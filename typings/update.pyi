@@ -1,16 +1,26 @@
-from src.boundaries import fillBoundaries as fillBoundaries
+from src.backends import Backend as Backend, get_backend as get_backend
+from src.limiters import Limiter as Limiter, get_limiter as get_limiter
+from src.params import Params as Params
 from src.pycfd_types import Array as Array, IDir as IDir, real_t as real_t
-from src.riemann import riemann as riemann
-from src.states import State as State, consToPrim as consToPrim, get_state_from_array as get_state_from_array, set_state_into_array as set_state_into_array, swap_components as swap_components
+from src.states import State as State, array_swap_components as array_swap_components, get_state_from_array as get_state_from_array, swap_components as swap_components
+from src.timestep import riemann_dt as riemann_dt
 from src.varindexes import IBX as IBX, IBY as IBY, IBZ as IBZ, IPSI as IPSI, IR as IR, IU as IU, IV as IV, IW as IW
+from src.tiles import Tile as Tile
+from src.workspace import ThreadTiles as ThreadTiles, Workspace as Workspace
+from typing import Callable
 
-def reconstruct(Q: Array, slopes: Array, i: int, j: int, sign: real_t, idir: IDir) -> State: ...
-def minmod(dL: real_t, dR: real_t) -> real_t: ...
-
-slopesX: Array
-slopesY: Array
+BoundaryFill = Callable[[Array, Params], None]
 
-def compute_slopes(Q: Array) -> None: ...
-def compute_fluxes_and_update(Q: Array, Unew: Array, dt: real_t) -> None: ...
-def euler_step(Q: Array, Unew: Array, dt: real_t) -> None: ...
-def update(Q: Array, Unew: Array, dt: real_t) -> None: ...
+def reconstruct(Q: Array, slopes: Array, i: int, j: int, sign: real_t, idir: IDir, params: Params) -> State: ...
+def minmod(dL: real_t, dR: real_t) -> real_t: ...
+def compute_slopes(Q: Array, params: Params, ws: Workspace) -> None: ...
+def array_reconstruct(q: Array, slope: Array, sign: real_t, params: Params, out: Array | None = None) -> Array: ...
+def compute_face_states(Q: Array, slopes: Array, idir: IDir, params: Params, outL: Array | None = None, outR: Array | None = None) -> tuple[Array, Array]: ...
+def compute_fluxes_and_update(Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace) -> real_t: ...
+def tiled_fluxes_and_update(Q: Array, Unew: Array, dt: real_t, params: Params, tiles: ThreadTiles) -> real_t: ...
+def cons_to_prim(U: Array, Q: Array, params: Params, ws: Workspace) -> None: ...
+def euler_step(Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace, fill: BoundaryFill | None = ...) -> real_t: ...
+def combine_stages(U: Array, a: real_t, b: real_t, params: Params, ws: Workspace) -> None: ...
+def ssp_rk2(Q: Array, U: Array, dt: real_t, params: Params, ws: Workspace, fill: BoundaryFill | None = ...) -> real_t: ...
+def ssp_rk3(Q: Array, U: Array, dt: real_t, params: Params, ws: Workspace, fill: BoundaryFill | None = ...) -> real_t: ...
+def update(Q: Array, Unew: Array, dt: real_t, params: Params, ws: Workspace, fill: BoundaryFill | None = ...) -> real_t | None: ...
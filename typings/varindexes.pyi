@@ -8,3 +8,6 @@ IBX: int
 IBY: int
 IBZ: int
 IPSI: int
+NVARS: int
+IVEL: slice
+IMAG: slice
@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.params import Params as Params
+from src.pycfd_types import Array as Array, IDir as IDir
+from src.timers import Timers as Timers
+from src.tiles import Tile as Tile
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+class Workspace:
+    Ntx: int
+    Nty: int
+    Nfields: int
+    slopes: dict[IDir, Array]
+    qL: dict[IDir, Array]
+    qR: dict[IDir, Array]
+    flux_dir: dict[IDir, Array]
+    flux: dict[IDir, Array]
+    smax: dict[IDir, Array]
+    dU: Array
+    U0: Array
+    Utmp: Array
+    tiles: ThreadTiles | None
+    timers: Timers
+    def __init__(self, params: Params) -> None: ...
+    def buffers(self) -> list[Array]: ...
+    @property
+    def nbytes(self) -> int: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> Workspace: ...
+    def __exit__(self, *exc) -> None: ...
+
+class ThreadTiles:
+    tiles: list[Tile]
+    params: list[Params]
+    nthreads: int
+    executor: ThreadPoolExecutor | None
+    _local: threading.local
+    def __init__(self, params: Params) -> None: ...
+    def workspace(self, params: Params) -> Workspace: ...
+    def map(self, kernel: Callable[[Tile, Params, Workspace], T]) -> list[T]: ...
+    def close(self) -> None: ...
+    def __enter__(self) -> ThreadTiles: ...
+    def __exit__(self, *exc) -> None: ...